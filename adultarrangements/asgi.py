@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'adultarrangements.settings')
 
 application = get_asgi_application()
+
+# Import the URLconf, and every view module with it, now rather than on each
+# worker's first request; with gunicorn's preload_app this happens once, in
+# the master, before the workers are forked
+get_resolver().url_patterns
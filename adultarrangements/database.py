@@ -0,0 +1,91 @@
+# adultarrangements/database.py
+"""
+Single source of truth for the DATABASES setting.
+
+Everything is driven by environment variables so the result only depends on
+what is set, never on the order settings blocks happen to run in:
+
+    DATABASE_URL            primary database (SQLite in BASE_DIR when unset)
+    DATABASE_REPLICA_URLS   comma separated read replicas -> aliases replica_1, replica_2, ...
+    DATABASE_CONN_MAX_AGE   seconds to keep persistent connections open (default 600)
+    DATABASE_SSL_REQUIRE    "0" to allow non-SSL connections (e.g. a local PostgreSQL)
+    DATABASE_POOL           "psycopg" for psycopg3's native pool (Django 5.1+),
+                            "pgbouncer" when connecting through PgBouncer in
+                            transaction mode
+    DATABASE_POOL_MIN_SIZE / DATABASE_POOL_MAX_SIZE   native pool bounds (default 2 / 10)
+"""
+import os
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULT_CONN_MAX_AGE = 600
+
+
+def _apply_pooling(config, environ):
+    """Configure connection reuse for one PostgreSQL alias"""
+    pool = environ.get('DATABASE_POOL', '').lower()
+    if not pool:
+        return config
+    if config['ENGINE'] != 'django.db.backends.postgresql':
+        return config
+
+    if pool == 'psycopg':
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                'DATABASE_POOL=psycopg needs Django 5.1+; use persistent connections '
+                '(DATABASE_CONN_MAX_AGE) or DATABASE_POOL=pgbouncer on this version.'
+            )
+        # The pool owns connection lifetimes, Django must not close them itself
+        config['CONN_MAX_AGE'] = 0
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+            'max_size': int(environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+        }
+    elif pool == 'pgbouncer':
+        # Transaction pooling hands each transaction a different server
+        # connection, which named server-side cursors cannot survive
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    else:
+        raise ImproperlyConfigured(f'Unknown DATABASE_POOL value: {pool!r}')
+    return config
+
+
+def _parse(url, environ, conn_max_age, ssl_require):
+    import dj_database_url  # deployment-only dependency
+
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=conn_max_age,
+        conn_health_checks=conn_max_age > 0,
+        ssl_require=ssl_require,
+    )
+    if config['ENGINE'] != 'django.db.backends.postgresql':
+        config.get('OPTIONS', {}).pop('sslmode', None)  # SQLite etc. reject it
+    return _apply_pooling(config, environ)
+
+
+def database_config(base_dir, environ=os.environ):
+    """Build the DATABASES dict: 'default' is the primary, 'replica_N' are read replicas"""
+    conn_max_age = int(environ.get('DATABASE_CONN_MAX_AGE', DEFAULT_CONN_MAX_AGE))
+    ssl_require = environ.get('DATABASE_SSL_REQUIRE', '1') != '0'
+
+    url = environ.get('DATABASE_URL')
+    if url:
+        databases = {'default': _parse(url, environ, conn_max_age, ssl_require)}
+    else:
+        databases = {
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': base_dir / 'db.sqlite3',
+            }
+        }
+
+    replica_urls = [u.strip() for u in environ.get('DATABASE_REPLICA_URLS', '').split(',') if u.strip()]
+    for index, replica_url in enumerate(replica_urls, start=1):
+        replica = _parse(replica_url, environ, conn_max_age, ssl_require)
+        # Tests run against the primary only; replicas mirror it
+        replica['TEST'] = {'MIRROR': 'default'}
+        databases[f'replica_{index}'] = replica
+
+    return databases
@@ -0,0 +1,16 @@
+# adultarrangements/settings/__init__.py
+"""
+Settings package: base.py plus dev.py or prod.py (test.py for test runs).
+
+DJANGO_SETTINGS_MODULE may name adultarrangements.settings.dev, .prod or
+.test directly. Plain adultarrangements.settings (the default in manage.py,
+wsgi.py and asgi.py) picks prod on Render or when DJANGO_ENV=prod, and dev
+otherwise. DATABASE_URL alone doesn't select prod: a local PostgreSQL
+shouldn't bring the SSL redirect, HSTS and secure-only cookies with it.
+"""
+import os
+
+if os.environ.get('DJANGO_ENV', 'prod' if 'RENDER' in os.environ else 'dev') == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
@@ -0,0 +1,252 @@
+# adultarrangements/settings/base.py
+"""
+Settings shared by every environment; dev.py and prod.py add the rest.
+
+Evaluating settings must stay cheap and free of side effects: every
+worker process runs it at boot. Nothing here touches the filesystem or
+imports deployment-only packages (dj_database_url, redis, whitenoise are
+loaded by the code that uses them).
+"""
+
+import os
+from pathlib import Path
+from django.contrib.messages import constants as messages
+
+from ..database import database_config
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Overridden from the environment in production (prod.py)
+SECRET_KEY = 'django-insecure-your-secret-key-change-in-production'
+DEBUG = False
+ALLOWED_HOSTS = []
+
+# Application definition
+INSTALLED_APPS = [
+    # First, so main's collectstatic (fetches fonts for production builds)
+    # overrides the staticfiles one
+    'main.apps.MainConfig',
+
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'main.middleware.PerformanceMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'main.middleware.PresenceMiddleware',
+    'main.middleware.ReplicaPinningMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'adultarrangements.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'main.template_backends.InstrumentedDjangoTemplates',  # times renders for PerformanceMiddleware
+        'DIRS': [
+            BASE_DIR / 'templates',  # Global templates directory
+        ],
+        'APP_DIRS': True,  # Look for templates in app directories
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'adultarrangements.wsgi.application'
+
+# Database
+# One deterministic configuration built from the environment (see database.py):
+# persistent connections with health checks, optional pooling and replicas.
+DATABASES = database_config(BASE_DIR)
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['main.routers.PrimaryReplicaRouter']
+
+# Read-your-writes: after a write, a client's reads stay on the primary this long
+REPLICA_PIN_SECONDS = 15
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+# Profile views / interest (main/events.py): events are buffered per process
+# and bulk-inserted by a flusher thread, then rolled up into daily rows after
+# a couple of days. The buffer holds at most PROFILE_EVENT_BUFFER_LIMIT events
+# while the database is unreachable.
+PROFILE_EVENT_FLUSHER = True
+PROFILE_EVENT_BUFFER_SIZE = 100
+PROFILE_EVENT_BUFFER_LIMIT = 10000
+PROFILE_EVENT_FLUSH_SECONDS = 5
+PROFILE_EVENT_RAW_DAYS = 2
+
+# Messages (main/partitions.py, main/archive.py): monthly partitions on
+# PostgreSQL are created this many months ahead, and whole months older than
+# MESSAGE_ARCHIVE_AFTER_DAYS move to compressed cold storage
+MESSAGE_PARTITION_MONTHS_AHEAD = 3
+MESSAGE_ARCHIVE_AFTER_DAYS = 365
+
+# Personal data exports (main/exports.py). Accounts with more rows than
+# EXPORT_INLINE_MAX_ROWS are exported by a background job into
+# DATA_EXPORT_ROOT, which must not be served publicly.
+DATA_EXPORT_ROOT = os.environ.get('DATA_EXPORT_ROOT', str(BASE_DIR / 'exports'))
+EXPORT_INLINE_MAX_ROWS = 20000
+EXPORT_CHUNK_SIZE = 2000
+
+# Account deletion (main/accounts.py): rows are purged in short transactions
+# of this many, with a pause between them; each job runs for a bounded time
+# and queues its own continuation
+ACCOUNT_PURGE_BATCH_SIZE = 500
+ACCOUNT_PURGE_PAUSE_SECONDS = 0.05
+ACCOUNT_PURGE_SECONDS = 30
+
+# Password validation
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Internationalization
+LANGUAGE_CODE = 'en-us'
+TIME_ZONE = 'UTC'
+USE_I18N = True
+USE_TZ = True
+
+# Static files (CSS, JavaScript, Images)
+STATIC_URL = '/static/'
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Media files (user uploaded files)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Default primary key field type
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# ===== AUTHENTICATION SETTINGS =====
+LOGIN_URL = '/login/'
+LOGIN_REDIRECT_URL = '/lifestyle-dashboard/'
+LOGOUT_REDIRECT_URL = '/'
+
+# ===== EMAIL CONFIGURATION =====
+# Mail is queued as a background job (main/mail.py); the worker delivers it
+# through JOB_EMAIL_BACKEND
+EMAIL_BACKEND = 'main.mail.QueuedEmailBackend'
+JOB_EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # For development
+
+# ===== BACKGROUND JOBS =====
+# Run with `manage.py runworker` (main/jobs.py)
+JOB_RETRY_BASE_SECONDS = 10
+JOB_RETRY_MAX_SECONDS = 60 * 60
+JOB_LOCK_TIMEOUT_SECONDS = 10 * 60  # a running job older than this is assumed lost
+JOB_RETENTION_DAYS = 7
+
+# ===== MESSAGES FRAMEWORK =====
+MESSAGE_TAGS = {
+    messages.DEBUG: 'debug',
+    messages.INFO: 'info',
+    messages.SUCCESS: 'success',
+    messages.WARNING: 'warning',
+    messages.ERROR: 'danger',
+}
+
+# ===== SERVER MODE =====
+# 'wsgi' (sync gunicorn workers) or 'asgi' (uvicorn workers); see gunicorn.conf.py.
+# Under ASGI the dashboard, search and portfolio pages use main/async_views.py
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+ASYNC_MEMBER_VIEWS = SERVER_MODE == 'asgi'
+
+# ===== CUSTOM SETTINGS =====
+SITE_NAME = "Elite Lifestyle Connections"
+SITE_DOMAIN = "elite-lifestyle-connections.com"
+SUPPORT_EMAIL = "support@elite-lifestyle-connections.com"
+
+# File upload settings
+FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
+
+# Session settings
+SESSION_COOKIE_AGE = 1209600  # 2 weeks
+SESSION_SAVE_EVERY_REQUEST = True
+
+# Cache settings
+CACHES = {
+    'default': {
+        'BACKEND': 'main.cache.InstrumentedLocMemCache',  # counts hits/misses for PerformanceMiddleware
+        'LOCATION': 'unique-snowflake',
+    }
+}
+
+# A shared Redis cache when REDIS_URL is set (requires the `redis` package);
+# otherwise each worker process has its own in-memory cache
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'main.cache.InstrumentedRedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+
+# Per-view rate limits (main/ratelimit.py). Rates are set on each view's
+# decorator; RATELIMIT_RATES overrides them by scope, e.g. {'login': '5/m'}
+RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', '1') != '0'
+RATELIMIT_CACHE_ALIAS = 'default'
+RATELIMIT_RATES = {}
+# Proxies in front of Django that append to X-Forwarded-For (0: use REMOTE_ADDR)
+RATELIMIT_PROXY_COUNT = 0
+
+# Anonymous public pages (main/page_cache.py). Keys include the deploy's
+# commit so a release never serves HTML pointing at old static files.
+PUBLIC_PAGE_CACHE_ALIAS = 'default'
+PUBLIC_PAGE_CACHE_SECONDS = 60 * 60
+PUBLIC_PAGE_CACHE_VERSION = os.environ.get('RENDER_GIT_COMMIT', 'dev')[:12]
+
+# Location autocomplete (main/places.py): suggestions per prefix are cached
+PLACE_SUGGESTION_CACHE_SECONDS = 60 * 60
+
+# Online presence (main/presence.py): members seen within this many minutes
+# show as online. Needs a cache every web process shares in production.
+PRESENCE_CACHE_ALIAS = 'default'
+PRESENCE_WINDOW_MINUTES = 5
+# ===== PERFORMANCE INSTRUMENTATION =====
+# Requests slower than this are counted, and a sample is logged with their SQL
+PERF_SLOW_REQUEST_MS = 500
+PERF_SLOW_SAMPLE_RATE = 0.1
+# Lets a Prometheus scraper read /metrics/ without a staff session
+METRICS_BEARER_TOKEN = os.environ.get('METRICS_BEARER_TOKEN')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'main.performance': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+        'main.jobs': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
@@ -0,0 +1,11 @@
+# adultarrangements/settings/dev.py
+"""Local development: DEBUG on, plain static files unless STATIC_BUILD=1."""
+from .base import *  # noqa: F401,F403
+from .base import os
+
+DEBUG = True
+ALLOWED_HOSTS = ['localhost', '127.0.0.1', '0.0.0.0']
+
+# STATIC_BUILD=1 runs the production asset pipeline locally (requires `collectstatic`)
+if os.environ.get('STATIC_BUILD') == '1':
+    STATICFILES_STORAGE = 'main.storage.MinifiedCompressedManifestStaticFilesStorage'
@@ -0,0 +1,28 @@
+# adultarrangements/settings/prod.py
+"""Deployments: Render, or anywhere with DJANGO_ENV=prod."""
+from .base import *  # noqa: F401,F403
+from .base import os
+
+DEBUG = False
+SECRET_KEY = os.environ.get('SECRET_KEY', SECRET_KEY)  # noqa: F405
+ALLOWED_HOSTS = ['.onrender.com', 'elite-lifestyle-connections.com', 'localhost', '127.0.0.1']
+
+# Minified, fingerprinted CSS with Brotli + gzip variants precompressed for
+# WhiteNoise by collectstatic
+STATICFILES_STORAGE = 'main.storage.MinifiedCompressedManifestStaticFilesStorage'
+
+# ===== SECURITY =====
+SECURE_SSL_REDIRECT = True
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+SECURE_BROWSER_XSS_FILTER = True
+SECURE_CONTENT_TYPE_NOSNIFF = True
+X_FRAME_OPTIONS = 'DENY'
+SECURE_HSTS_SECONDS = 31536000
+SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+SECURE_HSTS_PRELOAD = True
+
+# ===== RENDER =====
+if 'RENDER' in os.environ:
+    # Render's load balancer appends the client address to X-Forwarded-For
+    RATELIMIT_PROXY_COUNT = 1
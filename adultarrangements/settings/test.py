@@ -0,0 +1,20 @@
+# adultarrangements/settings/test.py
+"""
+Test runs: dev settings plus a second SQLite database standing in for a
+replica. `manage.py test` uses this module unless DJANGO_SETTINGS_MODULE
+says otherwise; point pytest-django at it too.
+"""
+from .dev import *  # noqa: F401,F403
+from .dev import DATABASES
+
+# Routing tests opt in with override_settings(DATABASE_REPLICAS=['test_replica']).
+# SQLite test databases without a TEST NAME live in memory, so nothing is
+# written next to the project.
+DATABASES['test_replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+}
+
+# Tests flush profile events themselves (events.flush()); a background
+# thread writing on its own connection would race the test transaction
+PROFILE_EVENT_FLUSHER = False
@@ -4,6 +4,8 @@ from django.urls import path, include
 from django.views.generic import TemplateView
 from django.contrib.auth import views as auth_views
 from main.views import register_view  # IMPORTANT: This import must exist
+from main.page_cache import public_page
+from main.ratelimit import ratelimit
 
 urlpatterns = [
     # Admin
@@ -11,15 +13,17 @@ urlpatterns = [
     
     # ===== PUBLIC PAGES =====
     # These templates are in templates/ directory (not main/templates/)
-    path('', TemplateView.as_view(template_name='index.html'), name='home'),
-    path('about/', TemplateView.as_view(template_name='about.html'), name='about'),
-    path('safety/', TemplateView.as_view(template_name='safety.html'), name='safety'),
-    path('privacy/', TemplateView.as_view(template_name='privacy.html'), name='privacy'),
-    path('terms/', TemplateView.as_view(template_name='terms.html'), name='terms'),
-    path('contact/', TemplateView.as_view(template_name='contact.html'), name='contact'),
+    # Anonymous hits are served from the page cache (main/page_cache.py)
+    path('', public_page(TemplateView.as_view(template_name='index.html')), name='home'),
+    path('about/', public_page(TemplateView.as_view(template_name='about.html')), name='about'),
+    path('safety/', public_page(TemplateView.as_view(template_name='safety.html')), name='safety'),
+    path('privacy/', public_page(TemplateView.as_view(template_name='privacy.html')), name='privacy'),
+    path('terms/', public_page(TemplateView.as_view(template_name='terms.html')), name='terms'),
+    path('contact/', public_page(TemplateView.as_view(template_name='contact.html')), name='contact'),
     
     # ===== AUTHENTICATION =====
-    path('login/', auth_views.LoginView.as_view(template_name='login.html'), name='login'),
+    path('login/', ratelimit('login', '10/m', key='ip', methods=['POST'])(
+        auth_views.LoginView.as_view(template_name='login.html')), name='login'),
     path('logout/', auth_views.LogoutView.as_view(next_page='home'), name='logout'),
     path('register/', register_view, name='register'),  # Uses your custom view
     path('join/', register_view, name='join'),  # Alias for register
@@ -0,0 +1,41 @@
+# gunicorn.conf.py
+"""
+Server configuration: gunicorn -c gunicorn.conf.py
+
+SERVER_MODE=wsgi (default) runs sync workers on the WSGI application.
+SERVER_MODE=asgi runs uvicorn workers on the ASGI application, where the
+dashboard, search and portfolio pages use their async variants.
+
+The application is loaded once in the master and workers are forked from
+it (GUNICORN_PRELOAD=0 loads it in each worker instead); see
+`manage.py profile_startup` for what loading costs.
+"""
+import multiprocessing
+import os
+
+mode = os.environ.get('SERVER_MODE', 'wsgi')
+if mode not in ('wsgi', 'asgi'):
+    raise ValueError(f'SERVER_MODE must be wsgi or asgi, not {mode!r}')
+
+bind = f'0.0.0.0:{os.environ.get("PORT", "8000")}'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+if mode == 'asgi':
+    wsgi_app = 'adultarrangements.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'adultarrangements.wsgi:application'
+    threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+# Workers fork from a master that already imported Django, the app and its
+# views, so booting or replacing one costs a fork instead of a cold start
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def post_fork(server, worker):
+    if preload_app:
+        # Nothing should connect while loading, but a socket inherited from
+        # the master must never be shared between workers
+        from django.db import connections
+        connections.close_all()
@@ -0,0 +1,96 @@
+# main/accounts.py
+"""
+Account deletion.
+
+request_deletion() closes an account at once: the member can no longer
+sign in and their portfolio drops out of every feed. The rows that hang
+off the account are then removed by the purge_account job in batches of
+ACCOUNT_PURGE_BATCH_SIZE, each in its own short transaction, so deleting
+a long-standing member never holds locks on the message or event tables
+for longer than one batch. The User row goes last, once Django's
+collector has almost nothing left to load. Progress is kept per step on
+AccountDeletion.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import cards
+from .models import (
+    AccountDeletion, CuratedIntroduction, DataExport, DiscreetMessage, ExclusiveExperience, GalleryAccessRequest,
+    Interest, LifestyleProfile, Notification, ProfileEvent, ProfileEventDaily, RecommendationList,
+)
+
+# (step, user_id -> rows to delete), biggest tables first
+PURGE_STEPS = [
+    ('profile_events', lambda user_id: ProfileEvent.objects.filter(Q(actor_id=user_id) | Q(profile__user_id=user_id))),
+    ('daily_events', lambda user_id: ProfileEventDaily.objects.filter(Q(actor_id=user_id) | Q(profile__user_id=user_id))),
+    ('messages', lambda user_id: DiscreetMessage.objects.filter(sender_id=user_id)),
+    ('introductions', lambda user_id: CuratedIntroduction.participants.through.objects.filter(user_id=user_id)),
+    ('notifications', lambda user_id: Notification.objects.filter(Q(recipient_id=user_id) | Q(actor_id=user_id))),
+    ('interests', lambda user_id: Interest.objects.filter(Q(from_user_id=user_id) | Q(to_user_id=user_id))),
+    ('experiences', lambda user_id: ExclusiveExperience.objects.filter(host_id=user_id)),
+    ('gallery_requests', lambda user_id: GalleryAccessRequest.objects.filter(
+        Q(requester_id=user_id) | Q(gallery_owner_id=user_id))),
+    ('recommendations', lambda user_id: RecommendationList.objects.filter(profile__user_id=user_id)),
+]
+
+
+def request_deletion(user):
+    """Close ``user``'s account now; returns the AccountDeletion to hand to purge()"""
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        LifestyleProfile.objects.filter(user=user).update(
+            public_portfolio=False, portfolio_suspended=True, last_updated=timezone.now(),
+        )
+        cards.sync(LifestyleProfile.objects.filter(user=user).values_list('pk', flat=True))
+        deletion, _ = AccountDeletion.objects.get_or_create(user_id=user.pk, defaults={'username': user.username})
+    return deletion
+
+
+def _save_progress(deletion, **fields):
+    AccountDeletion.objects.filter(pk=deletion.pk).update(progress=deletion.progress, **fields)
+
+
+def purge(deletion_id, batch_size=None, seconds=None):
+    """
+    Delete the account's rows batch by batch until none are left or
+    ``seconds`` (default ACCOUNT_PURGE_SECONDS) run out. Returns True once
+    the account is gone; call again to continue otherwise.
+    """
+    batch_size = batch_size or settings.ACCOUNT_PURGE_BATCH_SIZE
+    deadline = time.monotonic() + (settings.ACCOUNT_PURGE_SECONDS if seconds is None else seconds)
+    deletion = AccountDeletion.objects.get(pk=deletion_id)
+    if deletion.status == 'done':
+        return True
+    _save_progress(deletion, status='running')
+
+    for step, rows in PURGE_STEPS:
+        queryset = rows(deletion.user_id)
+        while True:
+            if time.monotonic() >= deadline:
+                return False
+            ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted, _ = queryset.model.objects.filter(pk__in=ids).delete()
+                deletion.progress[step] = deletion.progress.get(step, 0) + deleted
+                _save_progress(deletion)
+            # Let replicas and other writers catch up between batches
+            time.sleep(settings.ACCOUNT_PURGE_PAUSE_SECONDS)
+
+    # Archives live outside the database
+    for export in DataExport.objects.filter(user_id=deletion.user_id).exclude(file=''):
+        export.file.delete(save=False)
+
+    with transaction.atomic():
+        # The profile plus anything created since its step ran
+        deleted, _ = User.objects.filter(pk=deletion.user_id).delete()
+        deletion.progress['account'] = deleted
+        _save_progress(deletion, status='done', finished_at=timezone.now())
+    return True
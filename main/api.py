@@ -0,0 +1,376 @@
+# main/api.py
+"""
+JSON API for the member area (mounted at /api/v1/).
+
+Every endpoint reads straight from values() querysets, so only the
+requested columns are fetched and no model instances are built, and is
+encoded with orjson. Clients choose columns with ``?fields=a,b`` (see
+each endpoint's field map) and page lists with the ``next`` cursor passed
+back as ``?after=``. Responses carry an ETag built from the rows'
+last_updated (or last activity) stamps; a matching If-None-Match gets a
+304 with no body. Messages moved to cold storage (main/archive.py) are
+read a month at a time from the conversation's archive endpoint.
+"""
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+from functools import wraps
+
+import orjson
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from .models import CuratedIntroduction, DiscreetMessage, LifestyleProfile, PortfolioCard
+from .pagination import InvalidCursor, keyset_page, list_page
+from .ratelimit import ratelimit
+from .recommendations import eligible_portfolios, recommended_ids
+from .routers import replica_reads, untracked_writes
+from . import archive, events, interests, places
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+# Newest members first; matches the card_newest_idx index
+PORTFOLIO_ORDERING = ('-portfolio_created', '-profile')
+CONVERSATION_ORDERING = ('-last_interaction', '-id')
+MESSAGE_ORDERING = ('-exchanged_at', '-id')
+
+# Public field name -> values() lookup. Lists read PortfolioCard rows
+# (main/cards.py); a single portfolio reads its LifestyleProfile.
+CARD_FIELDS = {
+    'id': 'profile',
+    'username': 'username',
+    'preferred_name': 'preferred_name',
+    'gender': 'gender',
+    'primary_location': 'primary_location',
+    'place': 'place_id',
+    'lifestyle_preference': 'lifestyle_preference',
+    'engagement_tier': 'engagement_tier',
+    'thumbnail': 'image',
+    'last_active': 'last_active',
+    'last_updated': 'last_updated',
+}
+PORTFOLIO_FIELDS = {
+    'id': 'id',
+    'username': 'user__username',
+    'preferred_name': 'preferred_name',
+    'gender': 'gender',
+    'primary_location': 'primary_location',
+    'place': 'place_id',
+    'lifestyle_preference': 'lifestyle_preference',
+    'engagement_tier': 'engagement_tier',
+    'thumbnail': 'portfolio_thumbnail',
+    'last_active': 'last_active',
+    'last_updated': 'last_updated',
+    'image': 'portfolio_image',
+    'gender_preference': 'gender_preference',
+    'personal_statement': 'personal_statement',
+    'personal_philosophy': 'personal_philosophy',
+    'seeking_qualities': 'seeking_qualities',
+    'current_engagement': 'current_engagement',
+    'physique': 'physique',
+    'family_considerations': 'family_considerations',
+    'lifestyle_habits': 'lifestyle_habits',
+    'stature': 'stature',
+    'financial_capacity': 'financial_capacity',
+    'preferred_engagements': 'preferred_engagements',
+    'appreciates_qualities': 'appreciates_qualities',
+    'availability_framework': 'availability_framework',
+}
+CONVERSATION_FIELDS = {
+    'id': 'id',
+    'with': 'other_username',
+    'unread': 'unread',
+    'last_message': 'last_exchange__content',
+    'last_sender': 'last_exchange__sender__username',
+    'last_interaction': 'last_interaction',
+}
+MATCH_FIELDS = {
+    'id': 'id',
+    'username': 'to_user__username',
+    'matched_at': 'matched_at',
+    'introduction': 'introduction_id',
+}
+MESSAGE_FIELDS = {
+    'id': 'id',
+    'sender': 'sender__username',
+    'content': 'content',
+    'is_read': 'is_read',
+    'exchanged_at': 'exchanged_at',
+}
+# File fields come back from values() as storage names
+MEDIA_FIELDS = {'thumbnail', 'image'}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def json_response(data, status=200):
+    return HttpResponse(orjson.dumps(data, default=_default), status=status, content_type='application/json')
+
+
+def api_view(view_func):
+    """Member-only GET endpoint: JSON errors, replica reads, private caching"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return json_response({'error': 'Authentication required.'}, status=401)
+        if request.method not in ('GET', 'HEAD'):
+            response = json_response({'error': 'Method not allowed.'}, status=405)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        try:
+            with_replicas = replica_reads(view_func)
+            response = with_replicas(request, *args, **kwargs)
+        except InvalidCursor:
+            response = json_response({'error': 'Invalid cursor.'}, status=400)
+        except ApiError as exc:
+            response = json_response({'error': str(exc)}, status=exc.status)
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        patch_vary_headers(response, ['Cookie'])
+        return response
+
+    return wrapper
+
+
+# ===== HELPERS =====
+def requested_fields(request, field_map):
+    """Names from ``?fields=`` (validated against ``field_map``), default all of them"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(field_map)
+    names = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in names if name not in field_map]
+    if unknown:
+        raise ApiError(f'Unknown fields: {", ".join(unknown)}. Available: {", ".join(field_map)}.')
+    return names
+
+
+def page_size(request):
+    try:
+        size = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('limit must be a number.')
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+def project(queryset, field_map, names, required=()):
+    """values() of the lookups behind ``names`` plus ``required`` model columns"""
+    return queryset.values(*dict.fromkeys([*required, *(field_map[name] for name in names)]))
+
+
+def shape(rows, field_map, names):
+    """Rename rows to the requested names and turn file names into URLs"""
+    media = MEDIA_FIELDS.intersection(names)
+    shaped = []
+    for row in rows:
+        item = {name: row[field_map[name]] for name in names}
+        for name in media:
+            item[name] = settings.MEDIA_URL + item[name] if item[name] else None
+        shaped.append(item)
+    return shaped
+
+
+def etag(*parts):
+    return '"%s"' % hashlib.md5(orjson.dumps(parts, default=_default)).hexdigest()
+
+
+def conditional(request, tag, build):
+    """304 when the client already holds ``tag``, else build() with the ETag set"""
+    response = get_conditional_response(request, etag=tag)
+    if response is None:
+        response = build()
+    response['ETag'] = tag
+    return response
+
+
+def list_response(request, rows, field_map, names, next_cursor, stamps):
+    """A page of rows; the ETag covers each row's ``stamps`` columns"""
+    tag = etag(names, next_cursor, [[row[column] for column in stamps] for row in rows])
+    return conditional(
+        request, tag,
+        lambda: json_response({'results': shape(rows, field_map, names), 'next': next_cursor}),
+    )
+
+
+def ranked_page(request, ids, names):
+    """A page of a stored list of profile ids, in list order"""
+    page = list_page(ids, request.GET.get('after'), page_size(request))
+    found = {
+        row['profile']: row for row in
+        project(PortfolioCard.objects.filter(pk__in=page.object_list), CARD_FIELDS, names, ('profile', 'last_updated'))
+    }
+    # Portfolios withdrawn since the list was stored are skipped, so a page can run short
+    rows = [found[pk] for pk in page.object_list if pk in found]
+    return list_response(request, rows, CARD_FIELDS, names, page.next_cursor, ('profile', 'last_updated'))
+
+
+# ===== ENDPOINTS =====
+@api_view
+def feed(request):
+    """Dashboard feed: the stored compatibility ranking, else the newest portfolios"""
+    names = requested_fields(request, CARD_FIELDS)
+    profile = LifestyleProfile.objects.filter(user=request.user).only('pk').first()
+    recommended = recommended_ids(profile) if profile else None
+    if recommended:
+        return ranked_page(request, recommended, names)
+    portfolios = PortfolioCard.objects.exclude(user=request.user)
+    return _portfolio_list(request, portfolios, names)
+
+
+@api_view
+def search(request):
+    """Eligible portfolios filtered by ``place`` id or ``location`` text and ``status`` (tier), newest first"""
+    names = requested_fields(request, CARD_FIELDS)
+    portfolios = PortfolioCard.objects.exclude(user=request.user)
+    location = request.GET.get('location', '')
+    place = request.GET.get('place', '')
+    status = request.GET.get('status', '')
+    if place:
+        if not place.isdigit():
+            raise ApiError('place must be a place id.')
+        portfolios = portfolios.filter(place_id=int(place))
+    elif location:
+        portfolios = portfolios.filter(place__in=places.matching(location))
+    if status in ('premium', 'exclusive'):
+        portfolios = portfolios.filter(engagement_tier=status)
+    return _portfolio_list(request, portfolios, names)
+
+
+@api_view
+def place_suggestions(request):
+    """Location autocomplete: up to 10 places with a name starting with ``q``"""
+    return json_response({'results': places.suggest(request.GET.get('q', ''))})
+
+
+def _portfolio_list(request, portfolios, names):
+    page = keyset_page(
+        project(portfolios, CARD_FIELDS, names, ('profile', 'portfolio_created', 'last_updated')),
+        PORTFOLIO_ORDERING, request.GET.get('after'), page_size(request),
+    )
+    return list_response(request, page.object_list, CARD_FIELDS, names, page.next_cursor, ('profile', 'last_updated'))
+
+
+@api_view
+@ratelimit('view_portfolio', '60/m')
+def portfolio(request, username):
+    """One portfolio; counts as a view like the HTML page, except for a 304 revalidation"""
+    names = requested_fields(request, PORTFOLIO_FIELDS)
+    current = eligible_portfolios().filter(user__username=username).values('id', 'user_id', 'last_updated').first()
+    if current is None:
+        raise ApiError('Portfolio not found.', status=404)
+
+    # The stamp is checked before the full row is read
+    tag = etag(names, current['id'], current['last_updated'])
+
+    def build():
+        with untracked_writes():
+            LifestyleProfile.objects.filter(pk=current['id']).update(view_count=F('view_count') + 1)
+        if current['user_id'] != request.user.pk:
+            events.record(current['id'], 'view', request.user.pk)
+        row = project(LifestyleProfile.objects.filter(pk=current['id']), PORTFOLIO_FIELDS, names).get()
+        return json_response(shape([row], PORTFOLIO_FIELDS, names)[0])
+
+    return conditional(request, tag, build)
+
+
+@api_view
+def saved_connections(request):
+    """Members the user saved, most recent first"""
+    names = requested_fields(request, CARD_FIELDS)
+    saved = LifestyleProfile.objects.filter(user=request.user).values_list('saved_connections', flat=True).first()
+    user_ids = list(reversed(saved or []))
+    # saved_connections holds user ids; rank the matching profile ids in the same order
+    profile_ids = dict(LifestyleProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'id'))
+    return ranked_page(request, [profile_ids[pk] for pk in user_ids if pk in profile_ids], names)
+
+
+@api_view
+def matches(request):
+    """Members whose interest in the user is mutual, newest match first"""
+    names = requested_fields(request, MATCH_FIELDS)
+    page = keyset_page(
+        project(interests.matches(request.user.pk), MATCH_FIELDS, names, ('id', 'matched_at', 'introduction_id')),
+        interests.MATCH_ORDERING, request.GET.get('after'), page_size(request),
+    )
+    return list_response(
+        request, page.object_list, MATCH_FIELDS, names, page.next_cursor, ('id', 'matched_at', 'introduction_id'),
+    )
+
+
+@api_view
+def conversations(request):
+    """The member's introductions, most recently active first"""
+    names = requested_fields(request, CONVERSATION_FIELDS)
+    other = User.objects.filter(curated_introductions=OuterRef('pk')).exclude(pk=request.user.pk)
+    introductions = CuratedIntroduction.objects.filter(participants=request.user).annotate(
+        other_username=Subquery(other.values('username')[:1]),
+        unread=Count('discreet_messages', filter=Q(discreet_messages__is_read=False)
+                     & ~Q(discreet_messages__sender=request.user)),
+    )
+    page = keyset_page(
+        project(introductions, CONVERSATION_FIELDS, names, ('id', 'last_interaction')),
+        CONVERSATION_ORDERING, request.GET.get('after'), page_size(request),
+    )
+    return list_response(
+        request, page.object_list, CONVERSATION_FIELDS, names, page.next_cursor, ('id', 'last_interaction'),
+    )
+
+
+@api_view
+def conversation_messages(request, introduction_id):
+    """Messages in one of the member's introductions, newest first"""
+    names = requested_fields(request, MESSAGE_FIELDS)
+    if not CuratedIntroduction.objects.filter(pk=introduction_id, participants=request.user).exists():
+        raise ApiError('Conversation not found.', status=404)
+    page = keyset_page(
+        project(DiscreetMessage.objects.filter(introduction_id=introduction_id), MESSAGE_FIELDS, names,
+                ('id', 'exchanged_at', 'is_read')),
+        MESSAGE_ORDERING, request.GET.get('after'), page_size(request),
+    )
+    # is_read is part of the stamp so a read receipt changes the ETag
+    return list_response(
+        request, page.object_list, MESSAGE_FIELDS, names, page.next_cursor, ('id', 'exchanged_at', 'is_read'),
+    )
+
+
+@api_view
+def conversation_archive(request, introduction_id):
+    """Archived messages of one of the member's introductions, oldest first; ``?month=YYYY-MM``"""
+    names = requested_fields(request, MESSAGE_FIELDS)
+    if not CuratedIntroduction.objects.filter(pk=introduction_id, participants=request.user).exists():
+        raise ApiError('Conversation not found.', status=404)
+    month = request.GET.get('month')
+    if month:
+        try:
+            month = datetime.strptime(month, '%Y-%m').date()
+        except ValueError:
+            raise ApiError('month must be YYYY-MM.')
+
+    # Archives never change once written, so the month list identifies the content
+    months = archive.archived_months(introduction_id)
+    tag = etag(names, month, months)
+
+    def build():
+        messages = archive.archived_messages(introduction_id, month or None)
+        senders = dict(User.objects.filter(pk__in={m['sender_id'] for m in messages}).values_list('id', 'username'))
+        rows = [{**message, 'sender__username': senders.get(message['sender_id'])} for message in messages]
+        return json_response({
+            'months': [f'{m:%Y-%m}' for m in months],
+            'results': shape(rows, MESSAGE_FIELDS, names),
+        })
+
+    return conditional(request, tag, build)
@@ -4,4 +4,6 @@ class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
     
-    # Remove the ready() method that imports signals
+    def ready(self):
+        # PortfolioCard upkeep (post_save receivers)
+        from . import cards  # noqa: F401
@@ -0,0 +1,114 @@
+# main/archive.py
+"""
+Cold storage for old messages.
+
+archive() moves every whole month of DiscreetMessage older than
+MESSAGE_ARCHIVE_AFTER_DAYS into MessageArchive: one zlib-compressed JSON
+row per introduction per month. On PostgreSQL the month's partition is
+then dropped outright; elsewhere its rows are deleted by range. Each
+month is archived in one transaction, so a crash leaves it either fully
+hot or fully archived.
+
+Archived messages are read on demand with archived_messages(), e.g. by
+the API when a member scrolls past the hot history.
+"""
+import json
+import zlib
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from . import partitions
+from .models import CuratedIntroduction, DiscreetMessage, MessageArchive
+
+MESSAGE_COLUMNS = ('introduction_id', 'id', 'sender_id', 'content', 'is_read', 'exchanged_at')
+
+
+def archivable_months(now=None, using='default'):
+    """Whole months, from the oldest message on, that ended more than MESSAGE_ARCHIVE_AFTER_DAYS ago"""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.MESSAGE_ARCHIVE_AFTER_DAYS)
+    oldest = DiscreetMessage.objects.using(using).order_by('exchanged_at').values_list('exchanged_at', flat=True).first()
+    months = []
+    month = partitions.month_start(oldest) if oldest else None
+    while month and partitions.bounds(month)[1] <= cutoff:
+        months.append(month)
+        month = partitions.add_months(month, 1)
+    return months
+
+
+def _pack(rows):
+    return zlib.compress(json.dumps([
+        {'id': pk, 'sender_id': sender_id, 'content': content, 'is_read': is_read, 'exchanged_at': at.isoformat()}
+        for _, pk, sender_id, content, is_read, at in rows
+    ]).encode(), 9)
+
+
+def archive_month(month, batch_size=500, using='default'):
+    """Compress one month of messages into MessageArchive and remove them; returns the message count"""
+    connection = connections[using]
+    start, end = partitions.bounds(month)
+    messages = DiscreetMessage.objects.using(using).filter(exchanged_at__gte=start, exchanged_at__lt=end)
+    archived = 0
+    with transaction.atomic(using=using):
+        rows = messages.order_by('introduction_id', 'exchanged_at', 'id').values_list(*MESSAGE_COLUMNS)
+        batch = []
+        for introduction_id, group in groupby(rows.iterator(chunk_size=2000), key=itemgetter(0)):
+            group = list(group)
+            batch.append(MessageArchive(
+                introduction_id=introduction_id, month=month, message_count=len(group), data=_pack(group),
+            ))
+            archived += len(group)
+            if len(batch) >= batch_size:
+                MessageArchive.objects.using(using).bulk_create(batch)
+                batch = []
+        MessageArchive.objects.using(using).bulk_create(batch)
+
+        # Threads whose latest message leaves keep no pointer to it
+        CuratedIntroduction.objects.using(using).filter(
+            last_exchange_id__in=messages.values('id'),
+        ).update(last_exchange=None)
+
+        qn = connection.ops.quote_name
+        if partitions.is_partitioned(connection) and month in partitions.partitions(connection):
+            partitions.drop_partition(connection, month)
+        # Anything left for the month (no partition, or rows in the default one)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {qn(partitions.TABLE)} WHERE exchanged_at >= %s AND exchanged_at < %s', [start, end],
+            )
+    return archived
+
+
+def archive(now=None, batch_size=500, using='default', log=None):
+    """Archive every month past MESSAGE_ARCHIVE_AFTER_DAYS; returns the number of messages archived"""
+    total = 0
+    for month in archivable_months(now, using):
+        count = archive_month(month, batch_size, using)
+        total += count
+        if log:
+            log(f'  {month:%Y-%m}: {count} messages archived')
+    return total
+
+
+def archived_months(introduction_id):
+    return list(
+        MessageArchive.objects.filter(introduction_id=introduction_id)
+        .order_by('month').values_list('month', flat=True).distinct()
+    )
+
+
+def archived_messages(introduction_id, month=None):
+    """An introduction's archived messages (optionally one month's), oldest first"""
+    archives = MessageArchive.objects.filter(introduction_id=introduction_id)
+    if month is not None:
+        archives = archives.filter(month=month)
+    messages = []
+    for data in archives.order_by('month', 'id').values_list('data', flat=True):
+        messages.extend(json.loads(zlib.decompress(data)))
+    messages.sort(key=itemgetter('exchanged_at', 'id'))
+    return messages
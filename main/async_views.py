@@ -0,0 +1,212 @@
+# main/async_views.py
+"""
+Async variants of the busiest member pages, routed instead of their
+main/views.py twins when the site runs under ASGI (SERVER_MODE=asgi, see
+gunicorn.conf.py).
+
+Django 4.2's ORM and cache are synchronous, so gather() runs each
+independent query or cache call on a worker thread (each with its own
+database connection) and awaits them together: a page costs its slowest
+lookup rather than the sum of them. Anything that touches the session,
+messages or the lazy request.user stays on the request's own thread
+(sync_to_async's default), as does template rendering.
+"""
+import asyncio
+from contextlib import ExitStack
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.core.paginator import Page, Paginator
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.http import Http404
+from django.shortcuts import redirect, render
+
+from .models import LifestyleProfile, PortfolioCard, RecommendationList
+from .ratelimit import too_many_requests
+from .routers import replica_reads, untracked_writes
+from .views import PROFILE_SESSION_FLAG
+from . import events, metrics, places, presence
+
+PAGE_SIZE = 12
+
+
+def _run(func):
+    """Call ``func`` on a worker thread, its queries counted for PerformanceMiddleware"""
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(metrics.query_timer(alias)))
+            return func()
+    finally:
+        # Worker threads outlive the request; apply CONN_MAX_AGE as request_finished would
+        close_old_connections()
+
+
+async def gather(*funcs):
+    """Run the sync callables concurrently on worker threads; returns their results in order"""
+    return await asyncio.gather(*(
+        sync_to_async(partial(_run, func), thread_sensitive=False)() for func in funcs
+    ))
+
+
+async def page(queryset, number, per_page=PAGE_SIZE):
+    """Paginator.get_page() with the count and the page's rows fetched concurrently"""
+    paginator = Paginator(queryset, per_page)
+    try:
+        number = max(int(number), 1)
+    except (TypeError, ValueError):
+        number = 1
+    bottom = (number - 1) * per_page
+    count, rows = await gather(queryset.count, lambda: list(queryset[bottom:bottom + per_page]))
+    paginator.count = count
+    if number > paginator.num_pages:
+        # Past the end (rare): fall back to the last page like get_page()
+        number = paginator.num_pages
+        bottom = (number - 1) * per_page
+        (rows,) = await gather(lambda: list(queryset[bottom:bottom + per_page]))
+    return Page(rows, number, paginator)
+
+
+def _member(request):
+    return request.user if request.user.is_authenticated else None
+
+
+def member_view(view_func):
+    """Async login_required: resolves request.user on the request thread first"""
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        user = await sync_to_async(_member)(request)
+        if user is None:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, user, *args, **kwargs)
+
+    return wrapper
+
+
+# ===== MEMBER VIEWS =====
+def _profile(user, known):
+    if known:
+        profile = LifestyleProfile.objects.filter(user=user).first()
+        if profile is not None:
+            return profile, False
+    return LifestyleProfile.objects.get_or_create(user=user)
+
+
+def _recommended(user):
+    # Keyed by user so it needn't wait for the profile lookup
+    return RecommendationList.objects.filter(profile__user=user).values_list('candidates', flat=True).first()
+
+
+def _remember_profile(request, created):
+    request.session[PROFILE_SESSION_FLAG] = True
+    if created:
+        messages.info(request, 'Welcome! Please complete your portfolio for better matches.')
+
+
+@member_view
+@replica_reads
+async def lifestyle_dashboard(request, user):
+    """Async variant of views.lifestyle_dashboard"""
+    known = await sync_to_async(request.session.get)(PROFILE_SESSION_FLAG)
+    (profile, created), recommended = await gather(partial(_profile, user, known), partial(_recommended, user))
+    if created or not known:
+        await sync_to_async(_remember_profile)(request, created)
+
+    page_number = request.GET.get('page', 1)
+    if recommended:
+        portfolios = Paginator(recommended, PAGE_SIZE).get_page(page_number)
+        (found,) = await gather(partial(PortfolioCard.objects.in_bulk, portfolios.object_list))
+        portfolios.object_list = [found[pk] for pk in portfolios.object_list if pk in found]
+    else:
+        portfolios = await page(
+            PortfolioCard.objects.exclude(user=user).order_by('-last_active'), page_number,
+        )
+    (online_ids,) = await gather(partial(presence.online, [portfolio.user_id for portfolio in portfolios]))
+
+    return await sync_to_async(render)(request, 'main/lifestyle_dashboard.html', {
+        'title': 'Lifestyle Portfolio Dashboard | Elite Connections',
+        'description': 'Your exclusive lifestyle connections dashboard',
+        'portfolios': portfolios,
+        'online_ids': online_ids,
+        'recommended': bool(recommended),
+        'user_profile': profile,
+    })
+
+
+@member_view
+@replica_reads
+async def curated_search(request, user):
+    """Async variant of views.curated_search"""
+    portfolios_list = PortfolioCard.objects.exclude(user=user)
+    location = request.GET.get('location', '')
+    place = request.GET.get('place', '')
+    status = request.GET.get('status', '')
+    online_now = request.GET.get('online') == '1'
+    if place.isdigit():
+        portfolios_list = portfolios_list.filter(place_id=int(place))
+    elif location:
+        portfolios_list = portfolios_list.filter(place__in=places.matching(location))
+    if status in ('premium', 'exclusive'):
+        portfolios_list = portfolios_list.filter(engagement_tier=status)
+    portfolios_list = portfolios_list.order_by('-last_active')
+    if online_now:
+        (online,) = await gather(partial(presence.online_rows, portfolios_list))
+        portfolios = Paginator(online, PAGE_SIZE).get_page(request.GET.get('page', 1))
+    else:
+        portfolios = await page(portfolios_list, request.GET.get('page', 1))
+    (online_ids,) = await gather(partial(presence.online, [portfolio.user_id for portfolio in portfolios]))
+    return await sync_to_async(render)(request, 'main/curated_search.html', {
+        'title': 'Curated Search | Find Compatible Lifestyles',
+        'description': 'Search for sophisticated individuals based on lifestyle compatibility.',
+        'portfolios': portfolios,
+        'online_ids': online_ids,
+        'location': location,
+        'place': place,
+        'status': status,
+        'online_now': online_now,
+    })
+
+
+def _portfolio(username):
+    profile = LifestyleProfile.objects.select_related('user').filter(user__username=username).first()
+    if profile is None:
+        raise Http404('No portfolio matches the given query.')
+    return profile
+
+
+def _count_view(profile, viewer):
+    with untracked_writes():
+        LifestyleProfile.objects.filter(pk=profile.pk).update(view_count=F('view_count') + 1)
+    if viewer != profile.user_id:
+        events.record(profile.pk, 'view', viewer)
+
+
+@replica_reads
+async def view_portfolio(request, username):
+    """Async variant of views.view_portfolio; the rate limit check runs alongside the lookup"""
+    await sync_to_async(_member)(request)  # the rate limit key is the member
+    rejected, profile = await gather(
+        partial(too_many_requests, request, 'view_portfolio', '60/m'), partial(_portfolio, username),
+    )
+    if rejected:
+        return rejected
+    if not profile.curator_approved or not profile.public_portfolio:
+        await sync_to_async(messages.error)(request, 'This portfolio is not available.')
+        return redirect('lifestyle_dashboard')
+
+    profile.view_count += 1
+    name = profile.preferred_name or profile.user.username
+    response, _ = await asyncio.gather(
+        sync_to_async(render)(request, 'main/view_portfolio.html', {
+            'title': f'{name} | Lifestyle Portfolio',
+            'description': f'View {name}\'s lifestyle portfolio.',
+            'portfolio': profile,
+            'portfolio_user': profile.user,
+        }),
+        gather(partial(_count_view, profile, request.user.pk)),
+    )
+    return response
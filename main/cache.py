@@ -0,0 +1,106 @@
+# main/cache.py
+"""
+Cache backends that report hits and misses to the request metrics, and
+support the bitset operations main/presence.py needs: setbit() and
+any_bits(). Bitsets use Redis' layout (offset 0 is the high bit of the
+first byte) on every backend.
+"""
+import contextvars
+import threading
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache, RedisCacheClient
+
+from . import metrics
+
+_MISSING = object()
+# Backends whose get_many() loops over get() must not count twice
+_in_get_many = contextvars.ContextVar('in_get_many', default=False)
+
+
+class InstrumentedCacheMixin:
+    """Counts hits/misses of get()/get_many() for the current request"""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        hit = value is not _MISSING
+        if not _in_get_many.get():
+            metrics.record_cache(int(hit), int(not hit))
+        return value if hit else default
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        token = _in_get_many.set(True)
+        try:
+            found = super().get_many(keys, version=version)
+        finally:
+            _in_get_many.reset(token)
+        metrics.record_cache(len(found), len(keys) - len(found))
+        return found
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    _bit_lock = threading.Lock()
+
+    def setbit(self, key, offset, timeout, version=None):
+        """Set bit ``offset`` of the bitset at ``key`` and (re)set its expiry"""
+        with self._bit_lock:
+            bits = bytearray(LocMemCache.get(self, key, b'', version=version))
+            index = offset // 8
+            if len(bits) <= index:
+                bits.extend(bytes(index + 1 - len(bits)))
+            bits[index] |= 0x80 >> (offset % 8)
+            self.set(key, bytes(bits), timeout, version=version)
+
+    def any_bits(self, keys, offsets, version=None):
+        """The ``offsets`` set in at least one of the bitsets at ``keys``"""
+        found = set()
+        for bits in LocMemCache.get_many(self, keys, version=version).values():
+            found.update(o for o in offsets if o // 8 < len(bits) and bits[o // 8] & (0x80 >> (o % 8)))
+        return found
+
+
+class SingleTripRedisCacheClient(RedisCacheClient):
+    """incr() in one round trip instead of EXISTS followed by INCRBY"""
+
+    INCR_EXISTING = "if redis.call('exists', KEYS[1]) == 1 then return redis.call('incrby', KEYS[1], ARGV[1]) end"
+
+    def incr(self, key, delta):
+        value = self.get_client(key, write=True).eval(self.INCR_EXISTING, 1, key, delta)
+        if value is None:
+            raise ValueError("Key '%s' not found." % key)
+        return value
+
+    def setbit(self, key, offset, timeout):
+        client = self.get_client(key, write=True)
+        pipeline = client.pipeline(transaction=False)
+        pipeline.setbit(key, offset, 1)
+        pipeline.expire(key, timeout)
+        pipeline.execute()
+
+    def any_bits(self, keys, offsets):
+        pipeline = self.get_client(None).pipeline(transaction=False)
+        for key in keys:
+            pipeline.execute_command('BITFIELD_RO', key, *(arg for o in offsets for arg in ('GET', 'u1', o)))
+        found = set()
+        for values in pipeline.execute():
+            found.update(o for o, value in zip(offsets, values) if value)
+        return found
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self._class = SingleTripRedisCacheClient
+
+    def setbit(self, key, offset, timeout, version=None):
+        """Set bit ``offset`` of the bitset at ``key`` and (re)set its expiry"""
+        key = self.make_and_validate_key(key, version=version)
+        self._cache.setbit(key, offset, self.get_backend_timeout(timeout))
+
+    def any_bits(self, keys, offsets, version=None):
+        """The ``offsets`` set in at least one of the bitsets at ``keys``, in one round trip"""
+        offsets = list(offsets)
+        if not offsets:
+            return set()
+        return self._cache.any_bits([self.make_and_validate_key(key, version=version) for key in keys], offsets)
@@ -0,0 +1,107 @@
+# main/cards.py
+"""
+PortfolioCard upkeep.
+
+A card exists exactly for each discoverable portfolio (approved, public,
+not suspended) and copies the handful of columns a grid card shows, so
+feed and search pages scan a narrow table instead of LifestyleProfile
+rows full of JSON and free text.
+
+sync() re-derives the cards of given profiles: it upserts the
+discoverable ones and deletes the rest, a chunk at a time. It runs from
+post_save signals on LifestyleProfile and User, and directly after the
+bulk update()s that bypass signals (tier expiry, account closure,
+thumbnails). rebuild() resyncs everything; run it from the
+rebuild_portfolio_cards command or job after bulk data changes.
+"""
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import LifestyleProfile, PortfolioCard
+from .recommendations import eligible_portfolios
+
+STATEMENT_LENGTH = PortfolioCard._meta.get_field('statement').max_length
+SOURCE_FIELDS = (
+    'id', 'user_id', 'user__username', 'preferred_name', 'gender', 'lifestyle_preference',
+    'portfolio_image', 'portfolio_thumbnail', 'primary_location', 'place_id', 'date_of_birth',
+    'engagement_tier', 'engagement_expires_at', 'personal_statement', 'last_active',
+    'portfolio_created', 'last_updated',
+)
+# Saves with update_fields touching none of these leave the card alone
+WATCHED_FIELDS = {
+    'user', 'preferred_name', 'gender', 'lifestyle_preference', 'portfolio_image', 'portfolio_thumbnail',
+    'primary_location', 'place', 'date_of_birth', 'engagement_tier', 'engagement_expires_at',
+    'personal_statement', 'last_active', 'last_updated',
+    'curator_approved', 'public_portfolio', 'portfolio_suspended',
+}
+CARD_COLUMNS = [
+    field.name for field in PortfolioCard._meta.concrete_fields if not field.primary_key
+]
+
+
+def _card(row):
+    return PortfolioCard(
+        profile_id=row['id'],
+        user_id=row['user_id'],
+        username=row['user__username'],
+        preferred_name=row['preferred_name'],
+        gender=row['gender'],
+        lifestyle_preference=row['lifestyle_preference'],
+        image=row['portfolio_thumbnail'] or row['portfolio_image'] or '',
+        primary_location=row['primary_location'],
+        place_id=row['place_id'],
+        date_of_birth=row['date_of_birth'],
+        engagement_tier=row['engagement_tier'],
+        engagement_expires_at=row['engagement_expires_at'],
+        statement=row['personal_statement'][:STATEMENT_LENGTH],
+        last_active=row['last_active'],
+        portfolio_created=row['portfolio_created'],
+        last_updated=row['last_updated'],
+    )
+
+
+def sync(profile_ids, batch_size=1000):
+    """Bring the cards of ``profile_ids`` in line with their profiles; returns how many are discoverable"""
+    profile_ids = iter(profile_ids)
+    visible = 0
+    while chunk := list(islice(profile_ids, batch_size)):
+        cards = [_card(row) for row in eligible_portfolios().filter(pk__in=chunk).values(*SOURCE_FIELDS)]
+        with transaction.atomic():
+            PortfolioCard.objects.filter(pk__in=chunk).exclude(pk__in=[card.pk for card in cards]).delete()
+            PortfolioCard.objects.bulk_create(
+                cards, update_conflicts=True, unique_fields=['profile'], update_fields=CARD_COLUMNS,
+            )
+        visible += len(cards)
+    return visible
+
+
+def rebuild(batch_size=1000, log=None):
+    """Resync every card; returns the number of discoverable portfolios"""
+    PortfolioCard.objects.exclude(profile__in=eligible_portfolios().values('pk')).delete()
+    ids = LifestyleProfile.objects.order_by('pk').values_list('pk', flat=True)
+    visible = sync(ids.iterator(chunk_size=batch_size), batch_size)
+    if log:
+        log(f'  {visible} cards')
+    return visible
+
+
+@receiver(post_save, sender=LifestyleProfile, dispatch_uid='portfolio_card_profile')
+def _profile_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not WATCHED_FIELDS.intersection(update_fields):
+        return
+    sync([instance.pk])
+
+
+@receiver(post_save, sender=User, dispatch_uid='portfolio_card_user')
+def _user_saved(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    if raw or created or (update_fields is not None and 'username' not in update_fields):
+        return
+    PortfolioCard.objects.filter(user=instance).exclude(username=instance.username).update(
+        username=instance.username,
+    )
@@ -0,0 +1,54 @@
+# main/engagements.py
+"""
+Paid engagement tiers.
+
+Premium and exclusive tiers run until engagement_expires_at. Rather than
+checking expiry on every request, expire() runs on a schedule (the
+expire_engagements command or job) and downgrades every lapsed member in
+set-based chunks: each chunk is one SELECT of ids off the
+engagement_expiry_idx index, one UPDATE and one multi-row INSERT of
+notifications, however many members it covers.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from . import cards
+from .models import PAID_TIERS, LifestyleProfile, Notification
+
+DEFAULT_TIER = 'standard'
+
+
+def lapsed(now):
+    """Paid tiers whose term has ended"""
+    return LifestyleProfile.objects.filter(engagement_tier__in=PAID_TIERS, engagement_expires_at__lte=now)
+
+
+def expire(now=None, batch_size=5000, dry_run=False, log=None):
+    """Downgrade every lapsed paid tier to standard; returns how many were downgraded"""
+    now = now or timezone.now()
+    if dry_run:
+        return lapsed(now).count()
+
+    downgraded = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                lapsed(now).select_for_update().order_by('engagement_expires_at', 'id')
+                .values_list('id', 'user_id')[:batch_size]
+            )
+            if not rows:
+                break
+            # last_updated moves so API ETags and the incremental recommendation
+            # build see the change (update() skips auto_now)
+            changed = lapsed(now).filter(pk__in=[pk for pk, _ in rows]).update(
+                engagement_tier=DEFAULT_TIER, engagement_expires_at=None, last_updated=now,
+            )
+            Notification.objects.bulk_create(
+                [Notification(recipient_id=user_id, kind='tier_expired', created_at=now) for _, user_id in rows],
+                batch_size=1000,
+            )
+            cards.sync(pk for pk, _ in rows)
+        downgraded += changed
+        if log:
+            log(f'  {downgraded} downgraded')
+    return downgraded
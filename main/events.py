@@ -0,0 +1,229 @@
+# main/events.py
+"""
+Portfolio views and expressions of interest.
+
+Recording an event appends to an in-process buffer; a daemon thread per
+process bulk-inserts it into ProfileEvent every
+PROFILE_EVENT_FLUSH_SECONDS, or as soon as it holds
+PROFILE_EVENT_BUFFER_SIZE events. A popular profile costs a slice of one
+multi-row INSERT per event instead of a read-modify-write of a JSON blob
+on its row, and no request ever waits on that INSERT. Events for a
+profile or member deleted in the meantime are dropped at flush time;
+when the database is unreachable the batch is kept for the next attempt
+(up to PROFILE_EVENT_BUFFER_LIMIT events). Events still buffered when a
+worker is killed are lost; these are analytics, not account state.
+
+rollup() folds raw events older than PROFILE_EVENT_RAW_DAYS into
+ProfileEventDaily; activity() reads both.
+"""
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DatabaseError, IntegrityError, close_old_connections, transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import LifestyleProfile, ProfileEvent, ProfileEventDaily
+from .routers import untracked_writes
+
+logger = logging.getLogger(__name__)
+
+_buffer = []
+_lock = threading.Lock()
+_wake = threading.Event()
+_flusher_pid = None
+
+
+def record(profile_id, kind, actor_id=None):
+    """Queue one event for the flusher thread"""
+    event = ProfileEvent(profile_id=profile_id, actor_id=actor_id, kind=kind, occurred_at=timezone.now())
+    with _lock:
+        _buffer.append(event)
+        full = len(_buffer) >= settings.PROFILE_EVENT_BUFFER_SIZE
+    if settings.PROFILE_EVENT_FLUSHER:
+        _start_flusher()
+        if full:
+            _wake.set()
+
+
+def _start_flusher():
+    """One flusher per process; a forked worker starts its own"""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_forever, name='profile-event-flusher', daemon=True).start()
+
+
+def _flush_forever():
+    global _flusher_pid
+    while True:
+        _wake.wait(settings.PROFILE_EVENT_FLUSH_SECONDS)
+        _wake.clear()
+        if not settings.PROFILE_EVENT_FLUSHER:
+            with _lock:
+                _flusher_pid = None
+            return
+        close_old_connections()
+        try:
+            flush()
+        except Exception:
+            logger.exception('Flushing profile events failed')
+        finally:
+            close_old_connections()
+
+
+def flush():
+    """Bulk-insert every buffered event; returns how many were written"""
+    global _buffer
+    with _lock:
+        events, _buffer = _buffer, []
+    if not events:
+        return 0
+    # Analytics inserts shouldn't pin the viewer's reads to the primary
+    with untracked_writes():
+        try:
+            ProfileEvent.objects.bulk_create(events, batch_size=500)
+        except IntegrityError:
+            events = _insert_existing(events)
+        except DatabaseError:
+            _requeue(events)
+            raise
+    return len(events)
+
+
+def _insert_existing(events):
+    """
+    Retry a batch that referenced a deleted profile or member (a purge, or
+    a removed card) without those events; returns the events written
+    """
+    profile_ids = set(LifestyleProfile.objects.filter(
+        pk__in={event.profile_id for event in events}).values_list('pk', flat=True))
+    actor_ids = set(User.objects.filter(
+        pk__in={event.actor_id for event in events if event.actor_id}).values_list('pk', flat=True))
+    valid = [
+        event for event in events
+        if event.profile_id in profile_ids and (event.actor_id is None or event.actor_id in actor_ids)
+    ]
+    try:
+        ProfileEvent.objects.bulk_create(valid, batch_size=500)
+    except IntegrityError:
+        # Deleted while we looked; row by row, dropping only the failures
+        written = []
+        for event in valid:
+            try:
+                with transaction.atomic():
+                    event.save(force_insert=True)
+                written.append(event)
+            except IntegrityError:
+                pass
+        valid = written
+    if len(valid) < len(events):
+        logger.warning('Dropped %s profile events for deleted profiles or members', len(events) - len(valid))
+    return valid
+
+
+def _requeue(events):
+    """Put a batch the database refused back at the front of the buffer, within the limit"""
+    with _lock:
+        room = max(settings.PROFILE_EVENT_BUFFER_LIMIT - len(_buffer), 0)
+        kept = events[-room:] if room else []
+        _buffer[:0] = kept
+    if len(kept) < len(events):
+        logger.warning('Dropped %s profile events; the buffer is full', len(events) - len(kept))
+
+
+atexit.register(flush)
+
+
+def rollup(now=None, log=None):
+    """
+    Move raw events from whole days older than PROFILE_EVENT_RAW_DAYS into
+    daily rows, one day per transaction. Returns the number of events rolled up.
+    """
+    now = now or timezone.now()
+    cutoff = timezone.localdate(now) - timedelta(days=settings.PROFILE_EVENT_RAW_DAYS)
+    cutoff_at = timezone.make_aware(datetime.combine(cutoff, datetime.min.time()))
+    oldest = ProfileEvent.objects.filter(occurred_at__lt=cutoff_at).order_by('occurred_at').first()
+    if oldest is None:
+        return 0
+
+    rolled = 0
+    day = timezone.localdate(oldest.occurred_at)
+    while day < cutoff:
+        start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        events = ProfileEvent.objects.filter(occurred_at__gte=start, occurred_at__lt=start + timedelta(days=1))
+        with transaction.atomic():
+            # Count and delete the same rows: events flushed into this day
+            # after the count have higher ids and wait for the next rollup
+            max_id = events.aggregate(max_id=Max('id'))['max_id']
+            events = events.filter(id__lte=max_id or 0)
+            counts = {
+                (row['profile_id'], row['kind'], row['actor_id']): row['total']
+                for row in events.values('profile_id', 'kind', 'actor_id').annotate(total=Count('id')).order_by()
+            }
+            if counts:
+                # Late flushes can land in a day that was already rolled up
+                existing = {
+                    (row.profile_id, row.kind, row.actor_id): row
+                    for row in ProfileEventDaily.objects.select_for_update().filter(day=day)
+                }
+                updated, created = [], []
+                for key, total in counts.items():
+                    if key in existing:
+                        existing[key].count += total
+                        updated.append(existing[key])
+                    else:
+                        profile_id, kind, actor_id = key
+                        created.append(ProfileEventDaily(
+                            profile_id=profile_id, kind=kind, actor_id=actor_id, day=day, count=total))
+                ProfileEventDaily.objects.bulk_update(updated, ['count'], batch_size=500)
+                ProfileEventDaily.objects.bulk_create(created, batch_size=500)
+                deleted, _ = events.delete()
+                rolled += deleted
+        if log and counts:
+            log(f'  {day}: {sum(counts.values())} events -> {len(counts)} daily rows')
+        day += timedelta(days=1)
+    return rolled
+
+
+def activity(profile, kind='view', days=30, limit=50):
+    """
+    Who viewed (or showed interest in) ``profile`` over the last ``days``:
+    per-day totals plus the most recent actors, merged from raw events and
+    daily rollups.
+    """
+    since = timezone.localdate() - timedelta(days=days - 1)
+    since_at = timezone.make_aware(datetime.combine(since, datetime.min.time()))
+    raw = ProfileEvent.objects.filter(profile=profile, kind=kind, occurred_at__gte=since_at)
+    daily = ProfileEventDaily.objects.filter(profile=profile, kind=kind, day__gte=since)
+
+    per_day = {}
+    for row in raw.annotate(day=TruncDate('occurred_at')).values('day').annotate(total=Count('id')).order_by():
+        per_day[row['day']] = per_day.get(row['day'], 0) + row['total']
+    for row in daily.values('day').annotate(total=Sum('count')).order_by():
+        per_day[row['day']] = per_day.get(row['day'], 0) + row['total']
+
+    actors = {}
+    for row in raw.filter(actor__isnull=False).values('actor_id').annotate(total=Count('id'), last=Max('occurred_at')).order_by():
+        actors[row['actor_id']] = {'count': row['total'], 'last_seen': timezone.localdate(row['last'])}
+    for row in daily.filter(actor__isnull=False).values('actor_id').annotate(total=Sum('count'), last=Max('day')).order_by():
+        entry = actors.setdefault(row['actor_id'], {'count': 0, 'last_seen': row['last']})
+        entry['count'] += row['total']
+        entry['last_seen'] = max(entry['last_seen'], row['last'])
+
+    recent = sorted(actors.items(), key=lambda item: (item[1]['last_seen'], item[1]['count']), reverse=True)[:limit]
+    return {
+        'total': sum(per_day.values()),
+        'per_day': sorted(per_day.items()),
+        'actors': recent,
+    }
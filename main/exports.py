@@ -0,0 +1,195 @@
+# main/exports.py
+"""
+Personal data exports.
+
+stream(user) yields a ZIP archive of everything held about a member as it
+is written: profile.json, one NDJSON file per table and the member's
+photos under media/. Rows are read with iterator(chunk_size=
+EXPORT_CHUNK_SIZE) and photos copied in blocks, and zipfile writes to a
+sink that is drained after every chunk (entries carry data descriptors,
+so nothing is seeked back over). Memory use is the same for a new member
+and one with a decade of messages.
+
+Small accounts download the stream straight from the request. Accounts
+over EXPORT_INLINE_MAX_ROWS get a DataExport instead, which the
+build_data_export job writes to private storage via build().
+"""
+import tempfile
+import zipfile
+from decimal import Decimal
+
+import orjson
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+
+from . import archive, notifications
+from .models import (
+    CuratedIntroduction, DataExport, DiscreetMessage, ExclusiveExperience, GalleryAccessRequest, Interest,
+    LifestyleProfile, MessageArchive, Notification,
+)
+
+MEDIA_BLOCK_SIZE = 64 * 1024
+USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'last_login')
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def _line(row):
+    return orjson.dumps(row, default=_default, option=orjson.OPT_APPEND_NEWLINE)
+
+
+class _Sink:
+    """Write-only file object whose contents are taken with drain(); zipfile sees it as unseekable"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _tables(user):
+    """(file name, values() queryset) per table, each ordered for a stable export"""
+    introductions = CuratedIntroduction.objects.filter(participants=user)
+    return [
+        ('introductions.ndjson', introductions.order_by('id').values(
+            'id', 'introduction_initiated', 'last_interaction')),
+        ('messages.ndjson', DiscreetMessage.objects.filter(introduction__in=introductions.values('id'))
+         .order_by('introduction_id', 'exchanged_at', 'id')
+         .values('introduction_id', 'id', 'sender__username', 'content', 'is_read', 'exchanged_at')),
+        ('gallery_requests.ndjson', GalleryAccessRequest.objects.filter(Q(requester=user) | Q(gallery_owner=user))
+         .order_by('id').values('id', 'requester__username', 'gallery_owner__username', 'access_status',
+                                'requested_at')),
+        ('interests.ndjson', Interest.objects.filter(from_user=user).order_by('id').values(
+            'to_user__username', 'created_at', 'matched_at', 'introduction_id')),
+        ('experiences.ndjson', ExclusiveExperience.objects.filter(host=user).order_by('id').values()),
+        ('notifications.ndjson', Notification.objects.filter(recipient=user).order_by('id').values(
+            'kind', 'actor__username', 'created_at')),
+    ]
+
+
+def row_count(user):
+    """Rough size of an export: the rows it would contain"""
+    introductions = CuratedIntroduction.objects.filter(participants=user).values('id')
+    archived = MessageArchive.objects.filter(introduction__in=introductions).values_list('message_count', flat=True)
+    return sum(queryset.count() for _, queryset in _tables(user)) + sum(archived)
+
+
+def _media_names(profile):
+    names = [profile.get('portfolio_image'), profile.get('portfolio_thumbnail')]
+    for key in ('lifestyle_images', 'private_gallery'):
+        names.extend(name for name in profile.get(key) or [] if isinstance(name, str))
+    return [name for name in dict.fromkeys(names) if name]
+
+
+def stream(user):
+    """Yield a ZIP of ``user``'s data, a chunk at a time"""
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    sink = _Sink()
+    archive_file = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def entry(name, compress_type=zipfile.ZIP_DEFLATED):
+        info = zipfile.ZipInfo(name, date_time=timezone.localtime().timetuple()[:6])
+        info.compress_type = compress_type
+        return archive_file.open(info, 'w', force_zip64=True)
+
+    profile = LifestyleProfile.objects.filter(user=user).values().first() or {}
+    connection_ids = (profile.get('saved_connections') or []) + (profile.get('restricted_connections') or [])
+    usernames = dict(User.objects.filter(pk__in=connection_ids).values_list('id', 'username'))
+    with entry('profile.json') as fh:
+        fh.write(orjson.dumps({
+            'account': {field: getattr(user, field) for field in USER_FIELDS},
+            'profile': profile,
+            'connections': {
+                key: [usernames.get(pk) for pk in profile.get(key) or [] if pk in usernames]
+                for key in ('saved_connections', 'restricted_connections')
+            },
+        }, default=_default, option=orjson.OPT_INDENT_2))
+    yield sink.drain()
+
+    for name, queryset in _tables(user):
+        with entry(name) as fh:
+            for row in queryset.iterator(chunk_size=chunk_size):
+                fh.write(_line(row))
+                if len(sink.chunks) >= 16:
+                    yield sink.drain()
+        yield sink.drain()
+
+    # Months moved to cold storage, one decompressed month in memory at a time
+    introductions = CuratedIntroduction.objects.filter(participants=user).values('id')
+    with entry('archived_messages.ndjson') as fh:
+        months = (
+            MessageArchive.objects.filter(introduction__in=introductions)
+            .order_by('introduction_id', 'month').values_list('introduction_id', 'month').distinct()
+        )
+        for introduction_id, month in months.iterator(chunk_size=chunk_size):
+            for message in archive.archived_messages(introduction_id, month):
+                fh.write(_line({'introduction_id': introduction_id, **message}))
+            yield sink.drain()
+    yield sink.drain()
+
+    for name in _media_names(profile):
+        try:
+            source = default_storage.open(name, 'rb')
+        except (FileNotFoundError, OSError):
+            continue
+        # Photos are already compressed
+        with source, entry(f'media/{name}', zipfile.ZIP_STORED) as fh:
+            while block := source.read(MEDIA_BLOCK_SIZE):
+                fh.write(block)
+                yield sink.drain()
+
+    archive_file.close()
+    yield sink.drain()
+
+
+def filename(user):
+    return f'{user.username}-data-{timezone.localdate():%Y%m%d}.zip'
+
+
+def request_export(user):
+    """A queued DataExport, or the member's unfinished one"""
+    unfinished = DataExport.objects.filter(user=user, status__in=['pending', 'running']).first()
+    return unfinished or DataExport.objects.create(user=user)
+
+
+def build(export_id):
+    """Write an export's archive to private storage through a temporary file"""
+    export = DataExport.objects.select_related('user').get(pk=export_id)
+    DataExport.objects.filter(pk=export.pk).update(status='running')
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            for chunk in stream(export.user):
+                tmp.write(chunk)
+            size = tmp.tell()
+            tmp.seek(0)
+            export.file.save(f'{export.user_id}/{filename(export.user)}', File(tmp), save=False)
+    except Exception:
+        DataExport.objects.filter(pk=export.pk).update(status='failed', finished_at=timezone.now())
+        raise
+    # Only the newest archive is kept
+    for old in DataExport.objects.filter(user=export.user, status='ready').exclude(pk=export.pk):
+        old.file.delete(save=False)
+        old.delete()
+    DataExport.objects.filter(pk=export.pk).update(
+        status='ready', file=export.file.name, size=size, finished_at=timezone.now(),
+    )
+    notifications.notify(export.user_id, 'export_ready')
+    return export
@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from .models import LifestyleProfile, DiscreetMessage, ExclusiveExperience
+from . import places
 from datetime import date
 
 # ===== REGISTRATION FORM =====
@@ -38,12 +39,10 @@ class CustomRegistrationForm(UserCreationForm):
         self.fields['password1'].widget.attrs.update({'placeholder': 'Create a password'})
         self.fields['password2'].widget.attrs.update({'placeholder': 'Confirm password'})
     
-    def clean_email(self):
-        """Validate email is unique"""
-        email = self.cleaned_data.get('email')
-        if User.objects.filter(email=email).exists():
-            raise ValidationError("A portfolio with this email already exists.")
-        return email
+    # Email uniqueness is enforced by the case-insensitive unique index
+    # (main/migrations/0005_user_email_unique.py); register_view reports
+    # the IntegrityError instead of pre-checking with a query
+    DUPLICATE_EMAIL_ERROR = "A portfolio with this email already exists."
     
     def save(self, commit=True):
         user = super().save(commit=False)
@@ -105,6 +104,12 @@ class PortfolioForm(forms.ModelForm):
             if age > 100:
                 raise ValidationError("Please enter a valid date of birth.")
         return dob
+    
+    def save(self, commit=True):
+        """Link the portfolio to the place its location names"""
+        if 'primary_location' in self.changed_data or self.instance.place_id is None:
+            self.instance.place_id = places.resolve(self.cleaned_data.get('primary_location'))
+        return super().save(commit)
 
 # ===== MESSAGE FORM =====
 class DiscreetMessageForm(forms.ModelForm):
@@ -175,6 +180,35 @@ class ExclusiveExperienceForm(forms.ModelForm):
         
         return cleaned_data
 
+# ===== DISCRETION SETTINGS FORM =====
+class DiscretionSettingsForm(forms.ModelForm):
+    """How often notification digests are emailed"""
+    
+    class Meta:
+        model = LifestyleProfile
+        fields = ['digest_frequency']
+        labels = {'digest_frequency': 'Email me a summary'}
+        widgets = {
+            'digest_frequency': forms.Select(attrs={'class': 'form-control'}),
+        }
+
+class DeleteAccountForm(forms.Form):
+    """Password confirmation before an account is closed"""
+    password = forms.CharField(
+        label='Confirm your password',
+        widget=forms.PasswordInput(attrs={'class': 'form-control', 'autocomplete': 'current-password'}),
+    )
+    
+    def __init__(self, user, *args, **kwargs):
+        self.user = user
+        super().__init__(*args, **kwargs)
+    
+    def clean_password(self):
+        password = self.cleaned_data['password']
+        if not self.user.check_password(password):
+            raise ValidationError('That password is not correct.')
+        return password
+
 # ===== SEARCH FILTER FORM =====
 class FilterForm(forms.Form):
     """Form for portfolio search filters"""
@@ -0,0 +1,78 @@
+# main/interests.py
+"""
+Interest and mutual matches.
+
+Each expression of interest is one Interest row, unique per (from_user,
+to_user). express() inserts it and then looks up the reciprocal row
+(from_user=them, to_user=me) on that same unique index, so detecting a
+match is one index probe however many interests exist. When the pair is
+mutual both rows get matched_at and a CuratedIntroduction, and both
+members are notified. A member's matches are their own rows with
+matched_at set, paged newest first off interest_match_idx.
+
+Interests saved before this table existed were copied from
+saved_connections by migration 0015; pairs matched there have no
+introduction until one of them writes.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import notifications
+from .models import CuratedIntroduction, Interest
+
+# A member's matches, newest first; matches the interest_match_idx index
+MATCH_ORDERING = ('-matched_at', '-id')
+
+
+def _introduction(user_id, other_id):
+    """The pair's existing introduction, or a new one"""
+    existing = CuratedIntroduction.objects.filter(participants=user_id).filter(participants=other_id).first()
+    if existing:
+        return existing
+    introduction = CuratedIntroduction.objects.create()
+    introduction.participants.add(user_id, other_id)
+    return introduction
+
+
+def express(from_user_id, to_user_id, now=None):
+    """Record interest; returns the CuratedIntroduction if it completed a match, else None"""
+    if from_user_id == to_user_id:
+        raise ValueError('Members cannot express interest in themselves')
+    now = now or timezone.now()
+    with transaction.atomic():
+        # Two members expressing interest in each other at once queue behind
+        # these locks (lower id first), so the second always sees the first
+        list(User.objects.select_for_update().filter(pk__in=[from_user_id, to_user_id]).order_by('pk')
+             .values_list('pk', flat=True))
+        interest, created = Interest.objects.get_or_create(
+            from_user_id=from_user_id, to_user_id=to_user_id, defaults={'created_at': now},
+        )
+        if not created:
+            return None
+        reciprocal = Interest.objects.filter(from_user_id=to_user_id, to_user_id=from_user_id).values_list(
+            'pk', flat=True,
+        ).first()
+        if reciprocal is None:
+            return None
+        introduction = _introduction(from_user_id, to_user_id)
+        Interest.objects.filter(pk__in=[interest.pk, reciprocal]).update(matched_at=now, introduction=introduction)
+    notifications.notify(to_user_id, 'match', from_user_id)
+    notifications.notify(from_user_id, 'match', to_user_id)
+    return introduction
+
+
+def withdraw(from_user_id, to_user_id):
+    """Drop an interest; a match it was part of ends, the introduction stays"""
+    with transaction.atomic():
+        deleted, _ = Interest.objects.filter(from_user_id=from_user_id, to_user_id=to_user_id).delete()
+        if deleted:
+            Interest.objects.filter(from_user_id=to_user_id, to_user_id=from_user_id).update(
+                matched_at=None, introduction=None,
+            )
+    return bool(deleted)
+
+
+def matches(user_id):
+    """The member's matched interests (to_user is the match); page with MATCH_ORDERING"""
+    return Interest.objects.filter(from_user_id=user_id, matched_at__isnull=False)
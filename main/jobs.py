@@ -0,0 +1,128 @@
+# main/jobs.py
+"""
+Database-backed background jobs.
+
+Request handlers call enqueue() and return; `manage.py runworker` claims
+ready jobs with SELECT ... FOR UPDATE SKIP LOCKED (so any number of
+workers can poll the same table without a broker), runs them, and retries
+failures with exponential backoff. Because a job is just a row, enqueueing
+inside a transaction means the job only becomes visible if the
+transaction commits.
+
+Tasks are plain functions taking JSON-serialisable keyword arguments,
+registered with @task (see main/tasks.py).
+"""
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .routers import untracked_writes
+
+logger = logging.getLogger('main.jobs')
+
+PRIORITY_HIGH = 10
+PRIORITY_DEFAULT = 0
+PRIORITY_LOW = -10
+
+_registry = {}
+
+
+def task(name=None, max_attempts=5):
+    """Register a function as a job task under ``name`` (default: module.function)"""
+    def register(func):
+        func.task_name = name or f'{func.__module__}.{func.__name__}'
+        func.max_attempts = max_attempts
+        _registry[func.task_name] = func
+        return func
+    return register
+
+
+def enqueue(func, priority=PRIORITY_DEFAULT, delay=None, **kwargs):
+    """Queue ``func(**kwargs)`` to run in a worker; returns the Job"""
+    if getattr(func, 'task_name', None) not in _registry:
+        raise ValueError(f'{func!r} is not a registered task')
+    run_at = timezone.now() + delay if delay else timezone.now()
+    # Queue rows are never read back by the client, so don't pin it to the primary
+    with untracked_writes():
+        return Job.objects.create(
+            task=func.task_name, kwargs=kwargs, priority=priority,
+            run_at=run_at, max_attempts=func.max_attempts,
+        )
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def backoff(attempts):
+    """Seconds before retry ``attempts`` (1-based): doubling from the base, capped, with jitter"""
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def requeue_stale():
+    """Put jobs left running by a worker that died back in the queue"""
+    stale = timezone.now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS)
+    return Job.objects.filter(status='running', locked_at__lt=stale).update(
+        status='queued', locked_by='', locked_at=None,
+    )
+
+
+def claim(worker, limit=1):
+    """Lock and mark up to ``limit`` ready jobs as running, most urgent first"""
+    now = timezone.now()
+    ready = Job.objects.filter(status='queued', run_at__lte=now).order_by(F('priority').desc(), 'run_at', 'id')
+    with transaction.atomic():
+        # SQLite has no row locks; it serialises writers instead
+        if connection.features.has_select_for_update_skip_locked:
+            ready = ready.select_for_update(skip_locked=True)
+        jobs = list(ready[:limit])
+        for job in jobs:
+            job.status = 'running'
+            job.locked_by = worker
+            job.locked_at = now
+            job.attempts += 1
+        Job.objects.bulk_update(jobs, ['status', 'locked_by', 'locked_at', 'attempts'])
+    return jobs
+
+
+def run(job):
+    """Run one claimed job and record the outcome; returns True on success"""
+    func = _registry.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task {job.task}')
+        func(**job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        retry = job.attempts < job.max_attempts and func is not None
+        Job.objects.filter(pk=job.pk).update(
+            status='queued' if retry else 'failed',
+            run_at=timezone.now() + timedelta(seconds=backoff(job.attempts)),
+            locked_by='', locked_at=None, last_error=error,
+            finished_at=None if retry else timezone.now(),
+        )
+        logger.warning('Job %s (%s) failed on attempt %s/%s%s', job.pk, job.task, job.attempts,
+                       job.max_attempts, '' if retry else '; giving up', exc_info=True)
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status='done', locked_by='', locked_at=None, finished_at=timezone.now(),
+    )
+    return True
+
+
+def purge(days=None):
+    """Delete finished jobs older than ``days`` (default JOB_RETENTION_DAYS)"""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS if days is None else days)
+    deleted, _ = Job.objects.filter(status__in=['done', 'failed'], finished_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,307 @@
+# main/loadtest.py
+"""
+Load-test scenarios for a running server.
+
+Each virtual user is a synthetic member on one asyncio task with its own
+keep-alive connection and cookie jar. It signs in through the real login
+form, then repeats a member journey until the run ends: dashboard and its
+second page, a search, a few portfolios, sometimes saving, restricting or
+messaging a member, and the conversations API. Latencies and statuses are
+collected per route; report() summarizes them with percentiles and a
+latency histogram, and regressions() compares p95s against an earlier
+report.
+
+The HTTP/1.1 client is a small asyncio-streams one so the runner needs
+nothing beyond the standard library. Requests are never redirected: a 3xx
+counts as success, like a browser's first hop, unless it sends the member
+back to the login page or to https (the session was lost, or the server
+runs prod security settings over plain http). A sign-in that doesn't
+redirect is an error too.
+"""
+import asyncio
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from django.urls import reverse
+
+from .management.commands.benchmark_views import percentile
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SEARCH_LOCATIONS = ('London', 'New York', 'Paris', 'Miami', 'Dubai', 'Los Angeles', 'Tokyo', 'Sydney')
+
+_csrf_input = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class HttpError(Exception):
+    pass
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; reopened when the server closes it"""
+
+    def __init__(self, host, port, timeout):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body=b''):
+        """(status, headers as a list of (lower-cased name, value), body)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {len(body)}']
+        head.extend(f'{name}: {value}' for name, value in headers.items())
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            status, response_headers, response_body = await asyncio.wait_for(self._response(), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+        if any(name == 'connection' and value.lower() == 'close' for name, value in response_headers):
+            await self.close()
+        return status, response_headers, response_body
+
+    async def _response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HttpError('connection closed by server')
+        status = int(status_line.split()[1])
+        headers = []
+        while (line := await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers.append((name.strip().lower(), value.strip()))
+        fields = dict(headers)
+        if fields.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while size := int((await self.reader.readline()).split(b';')[0], 16):
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            while await self.reader.readline() not in (b'\r\n', b'\n', b''):
+                pass  # trailers
+            return status, headers, b''.join(chunks)
+        if 'content-length' in fields:
+            return status, headers, await self.reader.readexactly(int(fields['content-length']))
+        if status in (204, 304):
+            return status, headers, b''
+        # No length: the body runs to the end of the connection
+        body = await self.reader.read()
+        await self.close()
+        return status, headers, body
+
+
+class Stats:
+    """Latencies and outcomes per route"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def add(self, route, elapsed_ms, status):
+        self.latencies[route].append(elapsed_ms)
+        self.statuses[route][status] += 1
+
+
+def is_error(status):
+    """Statuses are ints, or strings naming a failure ('error', 'login_redirect', ...)"""
+    return isinstance(status, str) or status >= 400
+
+
+class VirtualUser:
+    """A synthetic member walking through journeys on its own connection"""
+
+    def __init__(self, username, password, targets, connection, stats, rng, think_ms):
+        self.username, self.password = username, password
+        self.targets = targets
+        self.connection = connection
+        self.stats = stats
+        self.rng = rng
+        self.think_ms = think_ms
+        self.cookies = {}
+        self.login_path = reverse('login')
+
+    async def get(self, route, path, **params):
+        return await self.send(route, 'GET', path + (f'?{urlencode(params)}' if params else ''))
+
+    def outcome(self, status, headers, expect):
+        """The status recorded for a response: its code, or why it counts as an error"""
+        if expect is not None and status != expect:
+            return f'{status}_unexpected'
+        if 300 <= status < 400:
+            location = urlsplit(dict(headers).get('location', ''))
+            if location.scheme == 'https':
+                return 'https_redirect'
+            if location.path == self.login_path:
+                return 'login_redirect'
+        return status
+
+    async def send(self, route, method, path, form=None, expect=None):
+        headers = {'Accept': 'text/html,application/json'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+        body = b''
+        if form is not None:
+            body = urlencode(form).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        started = time.perf_counter()
+        try:
+            status, response_headers, response_body = await self.connection.request(method, path, headers, body)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HttpError, ValueError, IndexError):
+            self.stats.add(route, (time.perf_counter() - started) * 1000, 'error')
+            return None, b''
+        self.stats.add(route, (time.perf_counter() - started) * 1000, self.outcome(status, response_headers, expect))
+        for name, value in response_headers:
+            if name == 'set-cookie':
+                cookie, _, attributes = value.partition(';')
+                key, _, cookie_value = cookie.strip().partition('=')
+                if not cookie_value or 'max-age=0' in attributes.lower():
+                    self.cookies.pop(key, None)
+                else:
+                    self.cookies[key] = cookie_value
+        return status, response_body
+
+    async def think(self):
+        if self.think_ms:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think_ms / 1000)
+
+    async def login(self):
+        _, page = await self.get('login_form', self.login_path)
+        match = _csrf_input.search(page.decode('utf-8', 'replace'))
+        # A failed sign-in re-renders the form with a 200
+        status, _ = await self.send('login', 'POST', self.login_path, {
+            'username': self.username, 'password': self.password,
+            'csrfmiddlewaretoken': match.group(1) if match else '',
+        }, expect=302)
+        return status == 302
+
+    async def journey(self):
+        rng = self.rng
+        await self.get('lifestyle_dashboard', reverse('lifestyle_dashboard'))
+        await self.think()
+        await self.get('lifestyle_dashboard_paged', reverse('lifestyle_dashboard'), page=2)
+        await self.think()
+        search = {'location': rng.choice(SEARCH_LOCATIONS)}
+        if rng.random() < 0.3:
+            search['online'] = 1
+        await self.get('curated_search', reverse('curated_search'), **search)
+        await self.think()
+        for user_id, username in rng.sample(self.targets, min(3, len(self.targets))):
+            await self.get('view_portfolio', reverse('view_portfolio', args=[username]))
+            await self.think()
+            if rng.random() < 0.3:
+                await self.get('save_connection', reverse('save_connection', args=[user_id]))
+            if rng.random() < 0.05:
+                await self.get('restrict_connection', reverse('restrict_connection', args=[user_id]))
+            if rng.random() < 0.2:
+                await self.get('send_message', reverse('send_message', args=[user_id]))
+        await self.get('api_conversations', reverse('api_conversations'), limit=20)
+        await self.think()
+
+    async def run(self, deadline):
+        try:
+            if not await self.login():
+                return
+            while time.monotonic() < deadline:
+                await self.journey()
+        finally:
+            await self.connection.close()
+
+
+async def _run(base_url, members, password, targets, users, duration, think_ms, timeout, seed, ramp_up):
+    parts = urlsplit(base_url)
+    host, port = parts.hostname or '127.0.0.1', parts.port or 80
+    stats = Stats()
+    deadline = time.monotonic() + duration
+
+    async def start(index, username):
+        # Spread logins out so the run doesn't open with a thundering herd
+        await asyncio.sleep(ramp_up * index / max(users, 1))
+        user = VirtualUser(
+            username, password, targets, Connection(host, port, timeout), stats,
+            random.Random(f'{seed}:{index}'), think_ms,
+        )
+        await user.run(deadline)
+
+    started = time.monotonic()
+    await asyncio.gather(*(start(i, members[i % len(members)]) for i in range(users)))
+    return stats, time.monotonic() - started
+
+
+def run(base_url, members, password, targets, users=20, duration=30.0, think_ms=0, timeout=30.0, seed=0,
+        ramp_up=1.0):
+    """Drive ``users`` virtual members against ``base_url``; returns (Stats, elapsed seconds)"""
+    if base_url.startswith('https:'):
+        raise ValueError('Only plain http:// targets are supported')
+    return asyncio.run(_run(base_url, members, password, targets, users, duration, think_ms, timeout, seed,
+                            ramp_up))
+
+
+def histogram(latencies):
+    """Request counts per HISTOGRAM_BOUNDS_MS bucket, keyed by upper bound ('inf' for the last)"""
+    counts = Counter()
+    for latency in latencies:
+        bound = next((b for b in HISTOGRAM_BOUNDS_MS if latency <= b), None)
+        counts[str(bound) if bound else 'inf'] += 1
+    return {key: counts[key] for key in [*map(str, HISTOGRAM_BOUNDS_MS), 'inf']}
+
+
+def report(stats, elapsed):
+    """Per-route throughput, latency percentiles, histogram and error rate"""
+    routes = {}
+    for route, latencies in stats.latencies.items():
+        ordered = sorted(latencies)
+        statuses = stats.statuses[route]
+        errors = sum(count for status, count in statuses.items() if is_error(status))
+        routes[route] = {
+            'requests': len(ordered),
+            'rps': len(ordered) / elapsed if elapsed else 0.0,
+            'errors': errors,
+            'error_rate': errors / len(ordered),
+            'status': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+            'p50_ms': percentile(ordered, 50),
+            'p90_ms': percentile(ordered, 90),
+            'p95_ms': percentile(ordered, 95),
+            'p99_ms': percentile(ordered, 99),
+            'max_ms': ordered[-1],
+            'histogram': histogram(ordered),
+        }
+    total = sum(route['requests'] for route in routes.values())
+    errors = sum(route['errors'] for route in routes.values())
+    return {
+        'elapsed_s': elapsed,
+        'requests': total,
+        'rps': total / elapsed if elapsed else 0.0,
+        'error_rate': errors / total if total else 0.0,
+        'routes': routes,
+    }
+
+
+def regressions(current, baseline, max_regression_pct, min_regression_ms=0.0):
+    """
+    [(route, baseline p95, current p95)] for routes whose p95 grew by more
+    than ``max_regression_pct`` percent and ``min_regression_ms`` (noise
+    floor for very fast routes) over ``baseline``. Baseline routes missing
+    from ``current`` are included with a current p95 of None.
+    """
+    regressed = []
+    for route, before in baseline['routes'].items():
+        result = current['routes'].get(route)
+        if result is None:
+            regressed.append((route, before.get('p95_ms'), None))
+            continue
+        if before.get('p95_ms') is None or result['p95_ms'] is None:
+            continue
+        growth = result['p95_ms'] - before['p95_ms']
+        if growth > before['p95_ms'] * max_regression_pct / 100 and growth > min_regression_ms:
+            regressed.append((route, before['p95_ms'], result['p95_ms']))
+    return regressed
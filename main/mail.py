@@ -0,0 +1,56 @@
+# main/mail.py
+"""Email backend that hands messages to the background worker."""
+import base64
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+
+def serialize(message):
+    """JSON-safe copy of an EmailMessage (tuple attachments only)"""
+    attachments = []
+    for attachment in message.attachments:
+        filename, content, mimetype = attachment  # MIMEBase attachments are not supported
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append([filename, base64.b64encode(content).decode(), mimetype])
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': dict(message.extra_headers),
+        'alternatives': [list(alternative) for alternative in getattr(message, 'alternatives', [])],
+        'attachments': attachments,
+    }
+
+
+def deserialize(data):
+    message = EmailMultiAlternatives(
+        subject=data['subject'], body=data['body'], from_email=data['from_email'],
+        to=data['to'], cc=data['cc'], bcc=data['bcc'], reply_to=data['reply_to'], headers=data['headers'],
+        alternatives=[tuple(alternative) for alternative in data['alternatives']],
+    )
+    for filename, content, mimetype in data['attachments']:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Queues one send_email job per message; JOB_EMAIL_BACKEND delivers it"""
+
+    def send_messages(self, email_messages):
+        from .jobs import PRIORITY_HIGH, enqueue
+        from .tasks import send_email
+
+        for message in email_messages:
+            enqueue(send_email, priority=PRIORITY_HIGH, message=serialize(message))
+        return len(email_messages)
+
+
+def delivery_connection():
+    return get_connection(settings.JOB_EMAIL_BACKEND)
@@ -0,0 +1,29 @@
+# main/management/commands/account_deletions.py
+"""Progress of account deletions, optionally purging them inline."""
+from django.core.management.base import BaseCommand
+
+from main import accounts
+from main.models import AccountDeletion
+
+
+class Command(BaseCommand):
+    help = 'List account deletions and their purge progress; --run purges unfinished ones in this process'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Include finished deletions')
+        parser.add_argument('--run', action='store_true', help='Purge unfinished deletions now')
+
+    def handle(self, *args, **options):
+        deletions = AccountDeletion.objects.order_by('requested_at')
+        if not options['all']:
+            deletions = deletions.exclude(status='done')
+        for deletion in deletions:
+            if options['run'] and deletion.status != 'done':
+                while not accounts.purge(deletion.pk):
+                    pass
+                deletion.refresh_from_db()
+            progress = ', '.join(f'{step} {count}' for step, count in deletion.progress.items()) or 'nothing yet'
+            self.stdout.write(
+                f'{deletion.username:<24}{deletion.get_status_display():<10}'
+                f'requested {deletion.requested_at:%Y-%m-%d %H:%M}  {progress}'
+            )
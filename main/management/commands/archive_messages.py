@@ -0,0 +1,21 @@
+# main/management/commands/archive_messages.py
+"""Move old months of messages to compressed cold storage. Run daily from cron."""
+from django.core.management.base import BaseCommand
+
+from main import archive
+
+
+class Command(BaseCommand):
+    help = 'Archive whole months of messages older than MESSAGE_ARCHIVE_AFTER_DAYS into MessageArchive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Archive rows per INSERT')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the months that would be archived')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            months = archive.archivable_months()
+            self.stdout.write(', '.join(f'{month:%Y-%m}' for month in months) or 'Nothing to archive')
+            return
+        total = archive.archive(batch_size=options['batch_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} messages'))
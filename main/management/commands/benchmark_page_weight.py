@@ -0,0 +1,107 @@
+# main/management/commands/benchmark_page_weight.py
+"""Measure the transfer weight of rendered pages and the assets they reference."""
+import gzip
+import json
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional outside production builds
+    brotli = None
+
+PUBLIC_PAGES = ['/', '/about/', '/safety/', '/login/', '/register/']
+MEMBER_PAGES = ['/lifestyle-dashboard/', '/curated-search/']
+
+_ASSET_RE = re.compile(r'<(?:link|script|img)\b[^>]*?\b(?:href|src)="([^"]+)"', re.I)
+
+
+def _compressed_sizes(data):
+    return {
+        'raw': len(data),
+        'gzip': len(gzip.compress(data, 9)),
+        'brotli': len(brotli.compress(data)) if brotli else None,
+    }
+
+
+def _read_static_url(url):
+    """Bytes behind a local /static/ URL, from the collected build or the source dirs"""
+    path = urlsplit(url).path
+    static_url = '/' + settings.STATIC_URL.lstrip('/')
+    name = path[len(static_url):]
+    if staticfiles_storage.exists(name):
+        with staticfiles_storage.open(name) as fh:
+            return fh.read()
+    found = finders.find(name)
+    if found:
+        with open(found, 'rb') as fh:
+            return fh.read()
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Report HTML, CSS, font and external-request weight for public and member pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Paths to measure (default: public pages)')
+        parser.add_argument('--username', help='Also measure member pages logged in as this user')
+        parser.add_argument('--json', dest='json_path', help='Write results to this JSON file')
+
+    def measure(self, client, path):
+        response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned HTTP {response.status_code}')
+
+        html = response.content
+        result = {'path': path, 'html': _compressed_sizes(html), 'assets': {}, 'external': []}
+        static_url = '/' + settings.STATIC_URL.lstrip('/')
+        for url in dict.fromkeys(_ASSET_RE.findall(html.decode('utf-8'))):
+            if urlsplit(url).netloc:
+                result['external'].append(url)
+            elif url.startswith(static_url):
+                data = _read_static_url(url)
+                if data is not None:
+                    result['assets'][url] = _compressed_sizes(data)
+
+        total = dict(result['html'])
+        for sizes in result['assets'].values():
+            for key, value in sizes.items():
+                if value is not None and total[key] is not None:
+                    total[key] += value
+        result['total'] = total
+        return result
+
+    def handle(self, *args, **options):
+        host = next((h for h in settings.ALLOWED_HOSTS if not h.startswith('.')), 'localhost')
+        client = Client(HTTP_HOST=host)
+
+        paths = options['paths'] or list(PUBLIC_PAGES)
+        if options['username']:
+            try:
+                client.force_login(User.objects.get(username=options['username']))
+            except User.DoesNotExist:
+                raise CommandError(f'No user named {options["username"]}')
+            paths += [p for p in MEMBER_PAGES if p not in paths]
+
+        results = [self.measure(client, path) for path in paths]
+
+        self.stdout.write(f'{"PAGE":<24}{"HTML":>10}{"ASSETS":>8}{"RAW":>10}{"GZIP":>10}{"BROTLI":>10}{"EXTERNAL":>10}')
+        for r in results:
+            total = r['total']
+            self.stdout.write(
+                f'{r["path"]:<24}{r["html"]["raw"]:>10}{len(r["assets"]):>8}{total["raw"]:>10}'
+                f'{total["gzip"]:>10}{total["brotli"] if total["brotli"] is not None else "-":>10}'
+                f'{len(r["external"]):>10}'
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({'pages': results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["json_path"]}'))
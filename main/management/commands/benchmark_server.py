@@ -0,0 +1,151 @@
+# main/management/commands/benchmark_server.py
+"""
+Throughput benchmark of the member pages under real gunicorn servers:
+WSGI sync workers against ASGI uvicorn workers (async views).
+
+Each mode is started with gunicorn.conf.py on a local port against the
+current database, then hammered by --concurrency keep-alive clients for
+--duration seconds per route, logged in as one synthetic member.
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from main.management.commands.benchmark_views import Command as ViewBenchmark, percentile
+
+DEFAULT_ROUTES = 'lifestyle_dashboard,curated_search,view_portfolio'
+
+
+class Command(BaseCommand):
+    help = 'Compare requests per second of the member pages under WSGI and ASGI gunicorn workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default='wsgi,asgi')
+        parser.add_argument('--routes', default=DEFAULT_ROUTES)
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers per mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Simultaneous clients')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per route')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--username', help='Member to log in as (default: first approved synthetic member)')
+        parser.add_argument('--output', help='Write results to this JSON file')
+
+    def session_cookie(self, member):
+        client = Client()
+        client.force_login(member)
+        return f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    def start_server(self, mode, port, workers):
+        env = {
+            **os.environ, 'SERVER_MODE': mode, 'WEB_CONCURRENCY': str(workers),
+            # One member hammering a page is exactly what the rate limits stop
+            'RATELIMIT_ENABLED': '0',
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+             '--bind', f'127.0.0.1:{port}', '--log-level', 'warning'],
+            cwd=settings.BASE_DIR, env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'{mode} server exited with code {server.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f'{mode} server did not start on port {port}')
+
+    def load(self, port, path, cookie, concurrency, duration):
+        latencies, statuses, lock = [], Counter(), threading.Lock()
+        stop_at = time.monotonic() + duration
+
+        def client():
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            mine, codes = [], Counter()
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers={'Cookie': cookie, 'Host': '127.0.0.1'})
+                    response = connection.getresponse()
+                    response.read()
+                    codes[response.status] += 1
+                except (OSError, http.client.HTTPException):
+                    codes['error'] += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                    continue
+                mine.append((time.perf_counter() - started) * 1000)
+            connection.close()
+            with lock:
+                latencies.extend(mine)
+                statuses.update(codes)
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        latencies.sort()
+        return {
+            'url': path,
+            'requests': len(latencies),
+            'rps': len(latencies) / elapsed,
+            'status': {str(code): count for code, count in statuses.items()},
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+        }
+
+    def handle(self, *args, **options):
+        modes = options['modes'].split(',')
+        if set(modes) - {'wsgi', 'asgi'}:
+            raise CommandError('--modes takes wsgi and/or asgi')
+        member, target = ViewBenchmark().pick_members(options['username'])
+        cookie = self.session_cookie(member)
+        sample_kwargs = {'view_portfolio': {'username': target.username}}
+        routes = {name: reverse(name, kwargs=sample_kwargs.get(name)) for name in options['routes'].split(',')}
+
+        results = {}
+        for mode in modes:
+            self.stdout.write(f'Starting {mode} server ({options["workers"]} workers)...')
+            server = self.start_server(mode, options['port'], options['workers'])
+            try:
+                results[mode] = {
+                    name: self.load(options['port'], path, cookie, options['concurrency'], options['duration'])
+                    for name, path in routes.items()
+                }
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+        self.print_table(results)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'options': {k: options[k] for k in ('workers', 'concurrency', 'duration')},
+                           'member': member.username, 'modes': results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+    def print_table(self, results):
+        self.stdout.write(f'{"MODE":<6}{"ROUTE":<24}{"REQS":>8}{"RPS":>9}{"P50":>9}{"P95":>9}  STATUS')
+        for mode, routes in results.items():
+            for name, r in routes.items():
+                status = ','.join(f'{code}x{count}' for code, count in sorted(r['status'].items()))
+                self.stdout.write(
+                    f'{mode:<6}{name:<24}{r["requests"]:>8}{r["rps"]:>9.1f}'
+                    f'{r["p50_ms"] or 0:>9.2f}{r["p95_ms"] or 0:>9.2f}  {status}'
+                )
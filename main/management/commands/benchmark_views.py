@@ -0,0 +1,268 @@
+# main/management/commands/benchmark_views.py
+"""Repeatable latency / query benchmark for every route in main/urls.py."""
+import json
+import logging
+import platform
+import subprocess
+import time
+from collections import Counter
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from main import urls as main_urls
+from main.models import CuratedIntroduction, DataExport, LifestyleProfile
+from main.synthetic import SYNTHETIC_PREFIX
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class RowsScannedEstimator:
+    """
+    Rows read by a query. PostgreSQL reports exact numbers through
+    EXPLAIN ANALYZE; SQLite only exposes the plan, so a full table scan is
+    counted as the table's row count and index searches are not counted.
+    """
+
+    def __init__(self):
+        self._table_sizes = {}
+
+    def rows_scanned(self, alias, sql):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('EXPLAIN (ANALYZE, FORMAT JSON) ' + sql)
+                    return self._postgres_rows(cursor.fetchone()[0][0]['Plan']), []
+                if connection.vendor == 'sqlite':
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                    return self._sqlite_rows(cursor, [row[-1] for row in cursor.fetchall()])
+        except DatabaseError:
+            pass
+        return None, []
+
+    def _postgres_rows(self, plan):
+        rows = 0
+        if 'Scan' in plan['Node Type']:
+            loops = plan.get('Actual Loops', 1)
+            rows += (plan.get('Actual Rows', 0) + plan.get('Rows Removed by Filter', 0)) * loops
+        for child in plan.get('Plans', []):
+            rows += self._postgres_rows(child)
+        return rows
+
+    def _sqlite_rows(self, cursor, details):
+        rows, full_scans = 0, []
+        for detail in details:
+            if not detail.startswith('SCAN '):
+                continue
+            table = detail.split()[1]
+            if table not in self._table_sizes:
+                try:
+                    cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+                    self._table_sizes[table] = cursor.fetchone()[0]
+                except DatabaseError:  # subquery / CTE names
+                    self._table_sizes[table] = 0
+            rows += self._table_sizes[table]
+            full_scans.append(table)
+        return rows, full_scans
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every route in main/urls.py against the synthetic dataset and write JSON results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--username', help='Member to log in as (default: first approved synthetic member)')
+        parser.add_argument('--routes', help='Comma separated route names to run (default: all)')
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Previous results JSON to diff against')
+
+    def pick_members(self, username):
+        approved = LifestyleProfile.objects.filter(
+            curator_approved=True, public_portfolio=True, portfolio_suspended=False,
+            user__username__startswith=SYNTHETIC_PREFIX,
+        ).select_related('user').order_by('pk')
+        if username:
+            try:
+                member = User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'No user named {username}')
+        else:
+            first = approved.first()
+            if first is None:
+                raise CommandError('No synthetic members found; run generate_synthetic_data first')
+            member = first.user
+        target = approved.exclude(user=member).first()
+        if target is None:
+            raise CommandError('Need at least two approved synthetic members')
+        return member, target.user
+
+    def sample_kwargs(self, member, target):
+        """Values for URL parameters; a parameter with no value here skips its routes"""
+        today = timezone.localdate()
+        kwargs = {'username': target.username, 'user_id': target.pk, 'year': today.year, 'month': today.month}
+        introduction = CuratedIntroduction.objects.filter(participants=member).order_by('pk').first()
+        if introduction:
+            kwargs['introduction_id'] = introduction.pk
+        export = DataExport.objects.filter(user=member, status='ready').order_by('-pk').first()
+        if export:
+            kwargs['export_id'] = export.pk
+        return kwargs
+
+    def route_urls(self, member, target, only, skipped):
+        """(name, url) per route; routes that can't be built are added to ``skipped`` with the reason"""
+        sample_kwargs = self.sample_kwargs(member, target)
+        seen = set()
+        for pattern in main_urls.urlpatterns:
+            name = pattern.name
+            if not name or name in seen or (only and name not in only):
+                continue
+            seen.add(name)
+            params = list(pattern.pattern.converters)
+            missing = [p for p in params if p not in sample_kwargs]
+            if missing:
+                skipped[name] = f'no sample value for {", ".join(missing)}'
+                continue
+            yield name, reverse(name, kwargs={p: sample_kwargs[p] for p in params})
+
+    def run_route(self, client, url, iterations, warmup, estimator):
+        aliases = list(settings.DATABASES)
+        timings, statuses = [], Counter()
+        queries = query_time = 0.0
+        first_run = {}
+        # Actions (save/restrict) write; roll everything back so runs are repeatable
+        with transaction.atomic():
+            for i in range(warmup + iterations):
+                contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in aliases}
+                for ctx in contexts.values():
+                    ctx.__enter__()
+                started = time.perf_counter()
+                response = client.get(url)
+                elapsed = time.perf_counter() - started
+                for ctx in contexts.values():
+                    ctx.__exit__(None, None, None)
+                if i < warmup:
+                    continue
+                timings.append(elapsed * 1000)
+                statuses[response.status_code] += 1
+                for alias, ctx in contexts.items():
+                    queries += len(ctx.captured_queries)
+                    query_time += sum(float(q['time']) for q in ctx.captured_queries) * 1000
+                    if i == warmup:
+                        first_run[alias] = list(ctx.captured_queries)
+            transaction.set_rollback(True)
+
+        rows_scanned, full_scans = 0, set()
+        for alias, captured in first_run.items():
+            for query in captured:
+                if not query['sql'].lstrip().upper().startswith('SELECT'):
+                    continue
+                rows, scans = estimator.rows_scanned(alias, query['sql'])
+                rows_scanned += rows or 0
+                full_scans.update(scans)
+
+        timings.sort()
+        return {
+            'url': url,
+            'status': dict(statuses),
+            'p50_ms': percentile(timings, 50),
+            'p90_ms': percentile(timings, 90),
+            'p95_ms': percentile(timings, 95),
+            'p99_ms': percentile(timings, 99),
+            'mean_ms': sum(timings) / len(timings),
+            'queries': queries / iterations,
+            'query_ms': query_time / iterations,
+            'rows_scanned': rows_scanned,
+            'full_scans': sorted(full_scans),
+        }
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        member, target = self.pick_members(options['username'])
+        only = set(options['routes'].split(',')) if options['routes'] else None
+
+        host = next((h for h in settings.ALLOWED_HOSTS if not h.startswith('.')), 'localhost')
+        client = Client(HTTP_HOST=host, raise_request_exception=False)
+        client.force_login(member)
+
+        estimator = RowsScannedEstimator()
+        results, skipped = {}, {}
+        # 500s are recorded in the results; don't dump a traceback per request
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            # Repeating a route would trip its rate limit and time the 429 instead of the view
+            with override_settings(RATELIMIT_ENABLED=False):
+                for name, url in self.route_urls(member, target, only, skipped):
+                    results[name] = self.run_route(client, url, options['iterations'], options['warmup'], estimator)
+        finally:
+            request_logger.setLevel(level)
+
+        report = {
+            'meta': {
+                'revision': _git_revision(),
+                'timestamp': timezone.now().isoformat(),
+                'vendor': connections['default'].vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'iterations': options['iterations'],
+                'members': User.objects.filter(username__startswith=SYNTHETIC_PREFIX).count(),
+                'member': member.username,
+            },
+            'routes': results,
+            'skipped': skipped,
+        }
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)['routes']
+
+        self.print_table(results, baseline)
+        for name, reason in skipped.items():
+            self.stdout.write(self.style.WARNING(f'Skipped {name}: {reason}'))
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+    def print_table(self, results, baseline):
+        self.stdout.write(
+            f'{"ROUTE":<26}{"STATUS":>8}{"P50":>9}{"P95":>9}{"P99":>9}{"QUERIES":>9}{"ROWS":>10}'
+            + (f'{"ΔP95":>9}{"ΔQ":>7}' if baseline else '')
+        )
+        for name, r in results.items():
+            status = ','.join(str(code) for code in sorted(r['status']))
+            line = (
+                f'{name:<26}{status:>8}{r["p50_ms"]:>9.2f}{r["p95_ms"]:>9.2f}{r["p99_ms"]:>9.2f}'
+                f'{r["queries"]:>9.1f}{r["rows_scanned"]:>10}'
+            )
+            if baseline and name in baseline:
+                before = baseline[name]
+                line += f'{r["p95_ms"] - before["p95_ms"]:>+9.2f}{r["queries"] - before["queries"]:>+7.1f}'
+            self.stdout.write(line)
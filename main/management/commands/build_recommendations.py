@@ -0,0 +1,31 @@
+# main/management/commands/build_recommendations.py
+"""Precompute "recommended for you" lists. Run every few minutes from cron."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from main import recommendations
+
+
+class Command(BaseCommand):
+    help = 'Score member compatibility and store the top candidates for each member'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rescore every member instead of only profiles changed since the last run')
+        parser.add_argument('--top-k', type=int, default=recommendations.TOP_K)
+        parser.add_argument('--batch-size', type=int, default=128,
+                            help='Members scored per NumPy block (memory grows with block x portfolios)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rescored, merged = recommendations.build(
+            full=options['full'],
+            k=options['top_k'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescored {rescored} members, merged changes into {merged} lists in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,34 @@
+# main/management/commands/collectstatic.py
+"""
+collectstatic for the production asset build: with the minified storage
+(prod settings, or STATIC_BUILD=1) it runs fetch_fonts first when the
+self-hosted fonts are missing, and fails the build if they still are,
+instead of shipping pages that load Google Fonts.
+"""
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from main.storage import MinifiedCompressedManifestStaticFilesStorage
+from main.templatetags.assets import self_hosted_fonts
+
+
+class Command(CollectStaticCommand):
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--skip-fonts', action='store_true',
+                            help="Don't fetch or require the self-hosted fonts (offline builds, tests)")
+
+    def handle(self, **options):
+        if isinstance(self.storage, MinifiedCompressedManifestStaticFilesStorage) and not options['skip_fonts']:
+            if self_hosted_fonts() is None:
+                call_command('fetch_fonts', stdout=self.stdout, stderr=self.stderr)
+            fonts = self_hosted_fonts()
+            missing = [font for font in fonts or [] if not finders.find(font)]
+            if not fonts or missing:
+                raise CommandError(
+                    'Self-hosted fonts are missing (%s); run `manage.py fetch_fonts`'
+                    % (', '.join(missing) or 'css/fonts.css')
+                )
+        return super().handle(**options)
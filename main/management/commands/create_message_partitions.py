@@ -0,0 +1,28 @@
+# main/management/commands/create_message_partitions.py
+"""Create upcoming monthly DiscreetMessage partitions (PostgreSQL). Run daily from cron."""
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from main import partitions
+
+
+class Command(BaseCommand):
+    help = 'Create missing monthly partitions of the message table ahead of time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, help='Default: MESSAGE_PARTITION_MONTHS_AHEAD')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not partitions.is_partitioned(connection):
+            self.stdout.write(f'{partitions.TABLE} is not partitioned on {connection.vendor}; nothing to do')
+            return
+        created = partitions.ensure_partitions(months_ahead=options['months_ahead'], using=options['database'])
+        for month in created:
+            self.stdout.write(f'  created {partitions.partition_name(month)}')
+        existing = partitions.partitions(connection)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(created)} partitions created; {len(existing)} months from {existing[0]:%Y-%m} to {existing[-1]:%Y-%m}'
+            if existing else f'{len(created)} partitions created'
+        ))
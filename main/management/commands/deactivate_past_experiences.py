@@ -0,0 +1,28 @@
+# main/management/commands/deactivate_past_experiences.py
+"""Close experience listings whose date has passed. Run daily from cron."""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from main.models import ExclusiveExperience
+
+
+class Command(BaseCommand):
+    help = 'Deactivate past experience listings with batched bulk UPDATEs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per UPDATE, so no single statement holds locks for long')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        # The partial upcoming index only covers active rows, so this lookup
+        # stays cheap and shrinks the index as rows are closed
+        stale = ExclusiveExperience.objects.filter(is_active=True, experience_date__lt=today)
+        total = 0
+        while True:
+            ids = list(stale.order_by('experience_date', 'commencement', 'id')
+                       .values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += ExclusiveExperience.objects.filter(pk__in=ids).update(is_active=False)
+        self.stdout.write(self.style.SUCCESS(f'Deactivated {total} past experiences'))
@@ -0,0 +1,20 @@
+# main/management/commands/expire_engagements.py
+"""Downgrade premium/exclusive members whose term has ended. Run hourly from cron."""
+from django.core.management.base import BaseCommand, CommandError
+
+from main import engagements
+
+
+class Command(BaseCommand):
+    help = 'Move every lapsed paid engagement tier back to standard, in set-based chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Members downgraded per statement')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the lapsed members')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        count = engagements.expire(batch_size=options['batch_size'], dry_run=options['dry_run'], log=self.stdout.write)
+        verb = 'would be downgraded' if options['dry_run'] else 'downgraded'
+        self.stdout.write(self.style.SUCCESS(f'{count} engagement tiers {verb}'))
@@ -0,0 +1,76 @@
+# main/management/commands/fetch_fonts.py
+"""Download the site's Google Fonts so they can be self-hosted and preloaded."""
+import re
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.templatetags.assets import GOOGLE_FONTS_URL
+
+# Google only serves woff2 to browsers it recognises
+BROWSER_USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+_FACE_RE = re.compile(r'/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*{[^}]*})')
+_FAMILY_RE = re.compile(r"font-family:\s*'([^']+)'")
+_WEIGHT_RE = re.compile(r'font-weight:\s*([\d ]+);')
+_SRC_URL_RE = re.compile(r'url\((https://[^)]+)\)')
+
+
+class Command(BaseCommand):
+    help = 'Download Google Fonts into static/fonts and write static/css/fonts.css'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default=GOOGLE_FONTS_URL, help='Google Fonts css2 URL')
+        parser.add_argument(
+            '--subsets', default='latin',
+            help='Comma separated unicode subsets to keep (default: latin)',
+        )
+        parser.add_argument('--timeout', type=int, default=20)
+
+    def fetch(self, url, timeout):
+        request = urllib.request.Request(url, headers={'User-Agent': BROWSER_USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.read()
+        except OSError as exc:
+            raise CommandError(f'Could not download {url}: {exc}')
+
+    def handle(self, *args, **options):
+        static_dir = Path(settings.BASE_DIR) / 'static'
+        fonts_dir = static_dir / 'fonts'
+        fonts_dir.mkdir(parents=True, exist_ok=True)
+
+        subsets = {s.strip() for s in options['subsets'].split(',') if s.strip()}
+        css = self.fetch(options['url'], options['timeout']).decode('utf-8')
+
+        downloaded = {}  # remote url -> local file name (variable fonts share one file)
+        faces = []
+        for subset, face in _FACE_RE.findall(css):
+            if subset not in subsets:
+                continue
+            remote = _SRC_URL_RE.search(face).group(1)
+            if remote not in downloaded:
+                family = _FAMILY_RE.search(face).group(1)
+                slug = family.lower().replace(' ', '-')
+                name = f'{slug}-{subset}.woff2'
+                if name in downloaded.values():
+                    weight = _WEIGHT_RE.search(face).group(1).replace(' ', '-')
+                    name = f'{slug}-{weight}-{subset}.woff2'
+                (fonts_dir / name).write_bytes(self.fetch(remote, options['timeout']))
+                downloaded[remote] = name
+                self.stdout.write(f'  {name}')
+            faces.append(face.replace(remote, f'../fonts/{downloaded[remote]}'))
+
+        if not faces:
+            raise CommandError(f'No @font-face rules found for subsets: {", ".join(sorted(subsets))}')
+
+        header = '/* static/css/fonts.css - generated by `manage.py fetch_fonts`, do not edit */\n\n'
+        (static_dir / 'css' / 'fonts.css').write_text(header + '\n\n'.join(faces) + '\n', encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(faces)} @font-face rules and {len(downloaded)} font files'
+        ))
@@ -0,0 +1,37 @@
+# main/management/commands/generate_synthetic_data.py
+"""Populate the database with synthetic members for benchmarking."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from main import synthetic
+
+
+class Command(BaseCommand):
+    help = 'Generate N synthetic members with portfolios, conversations, gallery requests and experiences'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='Number of members to create')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same dataset)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--clear', action='store_true', help='Delete existing synthetic members first')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(f'Deleted {synthetic.clear()} rows')
+
+        started = time.perf_counter()
+        totals = synthetic.generate(
+            options['count'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        elapsed = time.perf_counter() - started
+
+        for key, value in totals.items():
+            self.stdout.write(f'  {key:<18}{value:>10}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {totals["users"]} members in {elapsed:.1f}s '
+            f'(password for every member: {synthetic.SYNTHETIC_PASSWORD})'
+        ))
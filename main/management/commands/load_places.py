@@ -0,0 +1,21 @@
+# main/management/commands/load_places.py
+"""Load the offline gazetteer into Place and link profiles to their places."""
+from django.core.management.base import BaseCommand
+
+from main import places
+
+
+class Command(BaseCommand):
+    help = 'Load places from a gazetteer file, then link every unlinked profile to the place it names'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gazetteer', default=str(places.GAZETTEER),
+                            help='Tab-separated file: name, country, latitude, longitude, population, aliases')
+        parser.add_argument('--skip-gazetteer', action='store_true', help='Only link profiles')
+
+    def handle(self, *args, **options):
+        if not options['skip_gazetteer']:
+            created, updated = places.load_gazetteer(options['gazetteer'])
+            self.stdout.write(f'{created} places added, {updated} updated from {options["gazetteer"]}')
+        linked = places.link_profiles()
+        self.stdout.write(self.style.SUCCESS(f'{linked} profiles linked to places'))
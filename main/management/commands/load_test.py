@@ -0,0 +1,156 @@
+# main/management/commands/load_test.py
+"""
+Load test: synthetic members walking member journeys against a server on
+localhost (see main/loadtest.py), reporting throughput, latency
+percentiles and histograms, and error rates per route.
+
+Point --url at a running runserver/gunicorn that uses this database and
+has rate limiting off (RATELIMIT_ENABLED=0), or pass --serve wsgi|asgi to
+start gunicorn with gunicorn.conf.py for the run. With --compare, the run
+fails when a route's p95 regresses by more than --max-p95-regression
+percent or is missing from the run; it also fails above
+--max-error-rate. Compare runs with the same --seed and --duration.
+"""
+import json
+import platform
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from main import loadtest
+from main.management.commands.benchmark_server import Command as ServerBenchmark
+from main.management.commands.benchmark_views import _git_revision
+from main.models import PortfolioCard
+from main.synthetic import SYNTHETIC_PASSWORD, SYNTHETIC_PREFIX
+
+
+class Command(BaseCommand):
+    help = 'Run member journeys against a local server and report throughput, latency and errors per route'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server to load (plain http)')
+        parser.add_argument('--serve', choices=['wsgi', 'asgi'], help='Start gunicorn in this mode for the run')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers with --serve')
+        parser.add_argument('--port', type=int, default=8766, help='Port for --serve')
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual members')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+        parser.add_argument('--ramp-up', type=float, default=1.0, help='Seconds over which users sign in')
+        parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between steps of a journey')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Seconds before a request counts as an error')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Previous results JSON to check p95s against')
+        parser.add_argument('--max-p95-regression', type=float, default=20.0, help='Percent')
+        parser.add_argument('--min-regression-ms', type=float, default=5.0,
+                            help='Ignore p95 growth smaller than this (noise on fast routes)')
+        parser.add_argument('--max-error-rate', type=float, default=1.0, help='Percent of requests')
+
+    def members(self, count):
+        """Synthetic members to sign in as, and (user id, username) pairs to visit"""
+        cards = list(
+            PortfolioCard.objects.filter(username__startswith=SYNTHETIC_PREFIX)
+            .order_by('profile').values_list('user_id', 'username')[:max(count, 2) * 5]
+        )
+        if len(cards) < 2:
+            raise CommandError('Need at least two approved synthetic members; run generate_synthetic_data first')
+        return [username for _, username in cards[:count]], cards
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['duration'] <= 0:
+            raise CommandError('--users and --duration must be positive')
+        members, targets = self.members(options['users'])
+
+        server = None
+        url = options['url']
+        if options['serve']:
+            self.stdout.write(f'Starting {options["serve"]} server ({options["workers"]} workers)...')
+            server = ServerBenchmark().start_server(options['serve'], options['port'], options['workers'])
+            url = f'http://127.0.0.1:{options["port"]}'
+        else:
+            self.stdout.write('Loading an external server: run it with RATELIMIT_ENABLED=0 or 429s count as errors')
+
+        self.stdout.write(
+            f'{options["users"]} members ({len(members)} distinct) for {options["duration"]:g}s against {url}'
+        )
+        try:
+            stats, elapsed = loadtest.run(
+                url, members, SYNTHETIC_PASSWORD, targets, users=options['users'], duration=options['duration'],
+                think_ms=options['think_ms'], timeout=options['timeout'], seed=options['seed'],
+                ramp_up=options['ramp_up'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if server:
+                server.terminate()
+                server.wait(timeout=30)
+
+        results = loadtest.report(stats, elapsed)
+        if not results['requests']:
+            raise CommandError(f'No requests completed against {url}')
+        report = {
+            'meta': {
+                'revision': _git_revision(),
+                'timestamp': timezone.now().isoformat(),
+                'vendor': connections['default'].vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'url': url,
+                'serve': options['serve'],
+                'server_mode': options['serve'] or settings.SERVER_MODE,
+                **{key: options[key] for key in ('users', 'duration', 'think_ms', 'seed')},
+            },
+            **results,
+        }
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+
+        self.print_table(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+        self.gate(results, baseline, options)
+
+    def gate(self, results, baseline, options):
+        failures = []
+        if results['error_rate'] * 100 > options['max_error_rate']:
+            failures.append(f'error rate {results["error_rate"]:.2%} is over {options["max_error_rate"]:g}%')
+        if baseline:
+            for route, before, after in loadtest.regressions(
+                results, baseline, options['max_p95_regression'], options['min_regression_ms'],
+            ):
+                if after is None:
+                    failures.append(f'{route} missing from this run')
+                else:
+                    failures.append(f'{route} p95 {before:.1f}ms -> {after:.1f}ms')
+        if failures:
+            raise CommandError('Load test failed: ' + '; '.join(failures))
+
+    def print_table(self, results, baseline):
+        self.stdout.write(
+            f'{"ROUTE":<28}{"REQS":>7}{"RPS":>8}{"ERR%":>7}{"P50":>9}{"P95":>9}{"P99":>9}'
+            + (f'{"ΔP95":>9}' if baseline else '')
+        )
+        for name, r in sorted(results['routes'].items()):
+            line = (
+                f'{name:<28}{r["requests"]:>7}{r["rps"]:>8.1f}{r["error_rate"] * 100:>7.1f}'
+                f'{r["p50_ms"]:>9.2f}{r["p95_ms"]:>9.2f}{r["p99_ms"]:>9.2f}'
+            )
+            before = baseline['routes'].get(name) if baseline else None
+            if before:
+                line += f'{r["p95_ms"] - before["p95_ms"]:>+9.2f}'
+            self.stdout.write(line)
+        self.stdout.write(
+            f'{results["requests"]} requests in {results["elapsed_s"]:.1f}s: {results["rps"]:.1f}/s, '
+            f'{results["error_rate"]:.2%} errors'
+        )
+        bounds = [*map(str, loadtest.HISTOGRAM_BOUNDS_MS), 'inf']
+        self.stdout.write('Latency histogram (requests up to N ms): ' + '  '.join(
+            f'{bound}:{sum(r["histogram"][bound] for r in results["routes"].values())}' for bound in bounds
+        ))
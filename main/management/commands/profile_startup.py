@@ -0,0 +1,131 @@
+# main/management/commands/profile_startup.py
+"""
+Cold-start profile of the WSGI and ASGI entry points.
+
+Each run imports an entry point in a fresh interpreter under
+``python -X importtime`` and times its phases: importing Django itself,
+evaluating the settings module, django.setup() (every app's models and
+ready()) and the rest of the entry point (handler, middleware and
+URLconf). That is what each gunicorn worker pays at boot, or what the
+master pays once with preload_app. The modules and packages whose
+imports cost the most are listed after the phases.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ENTRY_POINTS = {
+    'wsgi': 'adultarrangements.wsgi',
+    'asgi': 'adultarrangements.asgi',
+}
+PHASES = ('django', 'settings', 'setup', 'entry', 'total')
+
+# Runs in the child interpreter; argv[1] is the entry point module
+PROBE = '''
+import importlib, json, sys, time
+started = time.perf_counter()
+import django
+from django.conf import settings
+imported = time.perf_counter()
+settings.INSTALLED_APPS
+configured = time.perf_counter()
+django.setup()
+ready = time.perf_counter()
+importlib.import_module(sys.argv[1])
+done = time.perf_counter()
+print(json.dumps({
+    'django': (imported - started) * 1000,
+    'settings': (configured - imported) * 1000,
+    'setup': (ready - configured) * 1000,
+    'entry': (done - ready) * 1000,
+    'total': (done - started) * 1000,
+}))
+'''
+
+
+def parse_importtime(output):
+    """[(module, self_ms, cumulative_ms)] from ``-X importtime`` lines"""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return imports
+
+
+class Command(BaseCommand):
+    help = 'Report per-module import time and app-ready time of the WSGI/ASGI entry points'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entry', default='wsgi,asgi', help='Comma separated: wsgi, asgi')
+        parser.add_argument('--repeat', type=int, default=5, help='Cold starts per entry point; the median is shown')
+        parser.add_argument('--top', type=int, default=15, help='Modules and packages listed')
+        parser.add_argument('--output', help='Write results to this JSON file')
+
+    def cold_start(self, module):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, module],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Importing {module} failed:\n{result.stderr[-2000:]}')
+        return json.loads(result.stdout.splitlines()[-1]), parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        entries = options['entry'].split(',')
+        unknown = set(entries) - set(ENTRY_POINTS)
+        if unknown:
+            raise CommandError(f'Unknown entry points: {", ".join(sorted(unknown))}')
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1')
+
+        results = {}
+        for entry in entries:
+            runs = [self.cold_start(ENTRY_POINTS[entry]) for _ in range(options['repeat'])]
+            # Module table from the run with the median total
+            runs.sort(key=lambda run: run[0]['total'])
+            _, imports = runs[len(runs) // 2]
+            packages = Counter()
+            for name, self_ms, _ in imports:
+                packages[name.split('.')[0]] += self_ms
+            results[entry] = {
+                'phases_ms': {phase: statistics.median(run[0][phase] for run in runs) for phase in PHASES},
+                'modules': len(imports),
+                'slowest_modules': [
+                    {'module': name, 'self_ms': self_ms, 'cumulative_ms': cumulative_ms}
+                    for name, self_ms, cumulative_ms in sorted(imports, key=lambda i: -i[1])[:options['top']]
+                ],
+                'packages': [
+                    {'package': name, 'self_ms': total} for name, total in packages.most_common(options['top'])
+                ],
+            }
+
+        self.print_report(results, options['repeat'])
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'settings': os.environ.get('DJANGO_SETTINGS_MODULE'), 'repeat': options['repeat'],
+                           'entries': results}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+    def print_report(self, results, repeat):
+        for entry, result in results.items():
+            phases = result['phases_ms']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{entry}: {phases["total"]:.1f}ms to a ready application (median of {repeat}, '
+                f'{result["modules"]} modules imported)'
+            ))
+            self.stdout.write('  ' + '  '.join(f'{phase} {phases[phase]:.1f}ms' for phase in PHASES[:-1]))
+            self.stdout.write(f'  {"PACKAGE":<40}{"SELF ms":>10}')
+            for row in result['packages']:
+                self.stdout.write(f'  {row["package"]:<40}{row["self_ms"]:>10.1f}')
+            self.stdout.write(f'  {"MODULE":<40}{"SELF ms":>10}{"CUM ms":>10}')
+            for row in result['slowest_modules']:
+                self.stdout.write(f'  {row["module"]:<40}{row["self_ms"]:>10.1f}{row["cumulative_ms"]:>10.1f}')
@@ -0,0 +1,18 @@
+# main/management/commands/rebuild_portfolio_cards.py
+"""Resync every PortfolioCard with its profile, e.g. after bulk data changes."""
+from django.core.management.base import BaseCommand, CommandError
+
+from main import cards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the PortfolioCard table from the discoverable portfolios'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Profiles synced per transaction')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        visible = cards.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{visible} portfolio cards in sync'))
@@ -0,0 +1,13 @@
+# main/management/commands/rollup_profile_events.py
+"""Fold old ProfileEvent rows into daily aggregates. Run hourly from cron."""
+from django.core.management.base import BaseCommand
+
+from main import events
+
+
+class Command(BaseCommand):
+    help = 'Roll up raw profile view / interest events older than PROFILE_EVENT_RAW_DAYS into daily rows'
+
+    def handle(self, *args, **options):
+        rolled = events.rollup(log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {rolled} events'))
@@ -0,0 +1,66 @@
+# main/management/commands/runworker.py
+"""Background job worker. Run one or more alongside the web processes."""
+import logging
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from main import jobs
+
+logger = logging.getLogger('main.jobs')
+
+MAINTENANCE_SECONDS = 60
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (polls the job table with SKIP LOCKED)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--batch', type=int, default=1, help='Jobs claimed per poll')
+        parser.add_argument('--once', action='store_true', help='Exit when no job is ready instead of polling')
+        parser.add_argument('--max-jobs', type=int, help='Exit after running this many jobs')
+
+    def handle(self, *args, **options):
+        # Importing the task modules registers their tasks
+        from main import tasks  # noqa: F401
+
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        worker = jobs.worker_name()
+        logger.info('Worker %s started', worker)
+        completed = 0
+        next_maintenance = 0
+        while self.running:
+            close_old_connections()
+            if time.monotonic() >= next_maintenance:
+                requeued = jobs.requeue_stale()
+                if requeued:
+                    logger.warning('Requeued %s jobs from lost workers', requeued)
+                jobs.purge()
+                next_maintenance = time.monotonic() + MAINTENANCE_SECONDS
+
+            claimed = jobs.claim(worker, options['batch'])
+            if not claimed:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            for job in claimed:
+                started = time.perf_counter()
+                ok = jobs.run(job)
+                logger.info('Job %s (%s) %s in %.0fms', job.pk, job.task,
+                            'done' if ok else 'failed', (time.perf_counter() - started) * 1000)
+                completed += 1
+            if options['max_jobs'] and completed >= options['max_jobs']:
+                break
+        logger.info('Worker %s stopped after %s jobs', worker, completed)
+
+    def stop(self, signum, frame):
+        # Finish the job in hand, then exit
+        self.running = False
@@ -0,0 +1,16 @@
+# main/management/commands/send_notification_digests.py
+"""Email pending notification digests. Run every few minutes from cron."""
+from django.core.management.base import BaseCommand
+
+from main import notifications
+
+
+class Command(BaseCommand):
+    help = "Coalesce each member's pending notifications into one digest email at their chosen frequency"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Digests built and sent per transaction')
+
+    def handle(self, *args, **options):
+        sent = notifications.send_digests(batch_size=options['batch_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} digests'))
@@ -0,0 +1,53 @@
+# main/management/commands/warm_public_cache.py
+"""Render the public pages into the page cache. Run at deploy, after migrate."""
+import os
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import URLPattern, get_resolver
+
+from main.page_cache import page_cache_key
+
+
+def public_paths():
+    """Parameterless project-level routes wrapped in page_cache.public_page"""
+    for pattern in get_resolver().url_patterns:
+        if isinstance(pattern, URLPattern) and getattr(pattern.callback, 'public_page', False):
+            if not pattern.pattern.converters:
+                yield '/' + str(pattern.pattern)
+
+
+class Command(BaseCommand):
+    help = 'Re-render every cached public page so the first visitors after a deploy get cache hits'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', action='append', dest='hosts',
+                            help='Host to warm (repeatable; default: RENDER_EXTERNAL_HOSTNAME or ALLOWED_HOSTS)')
+        parser.add_argument('--scheme', choices=['http', 'https'], default='http' if settings.DEBUG else 'https')
+
+    def handle(self, *args, **options):
+        hosts = options['hosts'] or (
+            [os.environ['RENDER_EXTERNAL_HOSTNAME']] if os.environ.get('RENDER_EXTERNAL_HOSTNAME')
+            else [h for h in settings.ALLOWED_HOSTS if not h.startswith('.') and h != '*']
+        )
+        if not hosts:
+            raise CommandError('No host to warm; pass --host')
+
+        cache = caches[settings.PUBLIC_PAGE_CACHE_ALIAS]
+        if isinstance(cache, LocMemCache):
+            self.stderr.write('The page cache is per-process (no REDIS_URL); only this process is warmed')
+        secure = options['scheme'] == 'https'
+        warmed = 0
+        for host in hosts:
+            client = Client(HTTP_HOST=host, secure=secure)
+            for path in public_paths():
+                cache.delete(page_cache_key(options['scheme'], host, path))
+                response = client.get(path)
+                cached = cache.get(page_cache_key(options['scheme'], host, path)) is not None
+                self.stdout.write(f'  {response.status_code} {options["scheme"]}://{host}{path}'
+                                  + ('' if cached else ' (not cached)'))
+                warmed += cached
+        self.stdout.write(self.style.SUCCESS(f'Warmed {warmed} pages'))
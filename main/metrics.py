@@ -0,0 +1,184 @@
+# main/metrics.py
+"""
+In-process request metrics in Prometheus text format.
+
+Each worker process keeps its own series (the same model as
+prometheus_client without multiprocess mode), so scrape every worker or
+put them behind a per-worker port.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+# Request methods get their own label value; anything else (including
+# made-up verbs from scanners) is counted as 'other' to keep series bounded
+METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+# Statements kept per request for the slow-request log
+MAX_CAPTURED_QUERIES = 50
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [count per bucket..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            pairs = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(pairs + [("le", bound)])} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(pairs)} {series[-1]}')
+            lines.append(f'{self.name}_count{_labels(pairs)} {cumulative}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values"""
+
+    def __init__(self, name, documentation, label_names):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        if not amount:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            snapshot = dict(self._values)
+        for labels, value in sorted(snapshot.items()):
+            lines.append(f'{self.name}{_labels(zip(self.label_names, labels))} {value}')
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time spent handling a request.', ('view', 'method'), DURATION_BUCKETS)
+DB_QUERIES = Histogram(
+    'db_queries_per_request', 'Database queries executed per request.', ('view',), QUERY_COUNT_BUCKETS)
+DB_DURATION = Histogram(
+    'db_query_duration_seconds', 'Total database time per request.', ('view',), DURATION_BUCKETS)
+TEMPLATE_DURATION = Histogram(
+    'template_render_duration_seconds', 'Total template render time per request.', ('view',), DURATION_BUCKETS)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Cache lookups by result.', ('view', 'result'))
+SLOW_REQUESTS = Counter(
+    'http_slow_requests_total', 'Requests slower than PERF_SLOW_REQUEST_MS.', ('view',))
+RATE_LIMITED = Counter(
+    'http_rate_limited_total', 'Requests rejected with 429 by main.ratelimit.', ('scope',))
+
+REGISTRY = [REQUEST_DURATION, DB_QUERIES, DB_DURATION, TEMPLATE_DURATION, CACHE_REQUESTS, SLOW_REQUESTS, RATE_LIMITED]
+
+
+class RequestStats:
+    """Counters for the request currently being handled"""
+    __slots__ = ('db_count', 'db_time', 'template_time', 'cache_hits', 'cache_misses', 'queries')
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.queries = []  # (seconds, alias, sql)
+
+
+_current = contextvars.ContextVar('request_stats', default=None)
+
+
+def start_request():
+    """Begin collecting stats for this request; returns (stats, token)"""
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def record_query(alias, sql, seconds):
+    stats = _current.get()
+    if stats is not None:
+        stats.db_count += 1
+        stats.db_time += seconds
+        if len(stats.queries) < MAX_CAPTURED_QUERIES:
+            stats.queries.append((seconds, alias, sql))
+
+
+def query_timer(alias):
+    """Execute wrapper recording every query on ``alias`` into the current request's stats"""
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            record_query(alias, sql, time.perf_counter() - started)
+    return wrapper
+
+
+def record_template(seconds):
+    stats = _current.get()
+    if stats is not None:
+        stats.template_time += seconds
+
+
+def record_cache(hits, misses):
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+def observe_request(view, method, seconds, stats):
+    REQUEST_DURATION.observe((view, method if method in METHODS else 'other'), seconds)
+    DB_QUERIES.observe((view,), stats.db_count)
+    DB_DURATION.observe((view,), stats.db_time)
+    TEMPLATE_DURATION.observe((view,), stats.template_time)
+    CACHE_REQUESTS.inc((view, 'hit'), stats.cache_hits)
+    CACHE_REQUESTS.inc((view, 'miss'), stats.cache_misses)
+
+
+def render_prometheus():
+    """All series in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,119 @@
+# main/middleware.py
+"""Project middleware."""
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics, presence
+from .routers import pinned_to_primary, track_writes
+
+performance_logger = logging.getLogger('main.performance')
+
+
+class PerformanceMiddleware:
+    """
+    Per-view timing, DB query count/time, cache hits/misses and template
+    render time, exported by the /metrics/ endpoint.
+
+    Adds a Server-Timing header when DEBUG is on, and logs a sample of
+    requests slower than PERF_SLOW_REQUEST_MS together with their SQL.
+    Place it after WhiteNoise so static files aren't measured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_seconds = settings.PERF_SLOW_REQUEST_MS / 1000
+        self.slow_sample_rate = settings.PERF_SLOW_SAMPLE_RATE
+
+    def __call__(self, request):
+        stats, token = metrics.start_request()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics.query_timer(alias)))
+                response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = (match.view_name if match else None) or '<unresolved>'
+        metrics.observe_request(view, request.method, elapsed, stats)
+
+        if elapsed >= self.slow_seconds:
+            metrics.SLOW_REQUESTS.inc((view,))
+            if random.random() < self.slow_sample_rate:
+                self.log_slow_request(request, view, elapsed, stats)
+
+        if settings.DEBUG:
+            response['Server-Timing'] = (
+                f'total;dur={elapsed * 1000:.1f}, '
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.db_count} queries", '
+                f'tpl;dur={stats.template_time * 1000:.1f}, '
+                f'cache;desc="{stats.cache_hits} hit {stats.cache_misses} miss"'
+            )
+        return response
+
+    def log_slow_request(self, request, view, elapsed, stats):
+        slowest = sorted(stats.queries, key=lambda q: q[0], reverse=True)[:10]
+        performance_logger.warning(
+            'Slow request %s %s (%s) %.0fms: %d queries %.0fms, templates %.0fms, cache %d/%d hit\n%s',
+            request.method, request.path, view, elapsed * 1000,
+            stats.db_count, stats.db_time * 1000, stats.template_time * 1000,
+            stats.cache_hits, stats.cache_hits + stats.cache_misses,
+            '\n'.join(f'  [{alias}] {seconds * 1000:.1f}ms {sql}' for seconds, alias, sql in slowest),
+        )
+
+
+class PresenceMiddleware:
+    """
+    Records a presence heartbeat for every authenticated request: one
+    setbit in the shared cache. Must sit after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.user.is_authenticated:
+            presence.heartbeat(request.user.pk)
+        return self.get_response(request)
+
+
+class ReplicaPinningMiddleware:
+    """
+    Read-your-writes for replica routing.
+
+    When a request writes to the primary, the response sets a short-lived
+    cookie; while it is present that client's reads stay on the primary, so
+    an edited portfolio or a saved connection is visible straight away even
+    if the replicas are lagging. Does nothing when no replicas are configured.
+
+    Must sit after SessionMiddleware so session saves don't count as writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'DATABASE_REPLICAS', None):
+            return self.get_response(request)
+
+        pinned = settings.REPLICA_PIN_COOKIE in request.COOKIES
+        with pinned_to_primary(pinned), track_writes() as writes:
+            response = self.get_response(request)
+
+        if writes.wrote:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
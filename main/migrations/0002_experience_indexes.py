@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-19 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exclusiveexperience',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['experience_date', 'commencement', 'id'], name='experience_upcoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exclusiveexperience',
+            index=models.Index(fields=['host', '-experience_date'], name='experience_host_date_idx'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2 on 2026-10-19 02:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.utils.dateparse import parse_datetime
+
+
+def copy_json_events(apps, schema_editor):
+    """portfolio_views / interest_received were {user_id: timestamp}; keep one event per entry"""
+    LifestyleProfile = apps.get_model('main', 'LifestyleProfile')
+    ProfileEvent = apps.get_model('main', 'ProfileEvent')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    db = schema_editor.connection.alias
+    user_ids = set(User.objects.using(db).values_list('id', flat=True))
+    now = django.utils.timezone.now()
+    
+    events = []
+    profiles = LifestyleProfile.objects.using(db).values_list('id', 'portfolio_views', 'interest_received')
+    for profile_id, views, interests in profiles.iterator():
+        for kind, entries in (('view', views), ('interest', interests)):
+            for key, value in (entries or {}).items() if isinstance(entries, dict) else ():
+                actor = int(key) if str(key).isdigit() and int(key) in user_ids else None
+                occurred = parse_datetime(value) if isinstance(value, str) else None
+                if occurred and django.utils.timezone.is_naive(occurred):
+                    occurred = django.utils.timezone.make_aware(occurred)
+                events.append(ProfileEvent(profile_id=profile_id, actor_id=actor, kind=kind, occurred_at=occurred or now))
+        if len(events) >= 1000:
+            ProfileEvent.objects.using(db).bulk_create(events)
+            events = []
+    ProfileEvent.objects.using(db).bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('main', '0003_recommendation_list'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileEventDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('view', 'Portfolio View'), ('interest', 'Interest Expressed')], max_length=20)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_events', to='main.lifestyleprofile')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProfileEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('view', 'Portfolio View'), ('interest', 'Interest Expressed')], max_length=20)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='main.lifestyleprofile')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='profileeventdaily',
+            constraint=models.UniqueConstraint(fields=('profile', 'kind', 'day', 'actor'), name='profile_event_daily_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='profileevent',
+            index=models.Index(fields=['profile', 'kind', 'occurred_at'], name='profile_event_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profileevent',
+            index=models.Index(fields=['occurred_at'], name='profile_event_time_idx'),
+        ),
+        migrations.RunPython(copy_json_events, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='lifestyleprofile',
+            name='interest_received',
+        ),
+        migrations.RemoveField(
+            model_name='lifestyleprofile',
+            name='portfolio_views',
+        ),
+    ]
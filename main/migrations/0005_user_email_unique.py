@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """The index can't be built over emails that differ only in case; list them instead of a bare IntegrityError"""
+    User = apps.get_model('auth', 'User')
+    users = User.objects.using(schema_editor.connection.alias).exclude(email='').annotate(email_ci=Lower('email'))
+    duplicated = users.values('email_ci').annotate(total=Count('id')).filter(total__gt=1).values('email_ci')
+    conflicts = users.filter(email_ci__in=duplicated).order_by('email_ci', 'id').values_list('id', 'username', 'email')
+    if conflicts:
+        raise RuntimeError(
+            'Emails must be unique ignoring case before auth_user_email_ci_uniq can be created. '
+            'Change or clear the email of all but one account in each group, then migrate again:\n'
+            + '\n'.join(f'  user {pk} ({username}): {email}' for pk, username, email in conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Signup checks email uniqueness through this index instead of a
+    pre-check query. Blank emails (createsuperuser) are left out.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('main', '0004_profile_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX auth_user_email_ci_uniq ON auth_user (LOWER(email)) WHERE email <> ''",
+            "DROP INDEX auth_user_email_ci_uniq",
+        ),
+    ]
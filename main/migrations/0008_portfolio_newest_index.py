@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-19 03:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_notification_digests'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lifestyleprofile',
+            index=models.Index(condition=models.Q(('curator_approved', True), ('portfolio_suspended', False), ('public_portfolio', True)), fields=['-portfolio_created', '-id'], name='portfolio_newest_idx'),
+        ),
+    ]
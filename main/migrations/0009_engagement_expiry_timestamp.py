@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-19 03:17
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+# Smaller engagement_expiry values (2001-09-09 and earlier) are leftovers such
+# as day counts or test data rather than Unix timestamps
+MIN_PLAUSIBLE_TIMESTAMP = 10 ** 9
+
+FROM_UNIXTIME = {
+    'postgresql': 'to_timestamp(engagement_expiry)',
+    'sqlite': "datetime(engagement_expiry, 'unixepoch')",
+}
+
+
+def copy_expiry(apps, schema_editor):
+    """engagement_expiry held a Unix timestamp; members without a plausible one keep their tier open-ended"""
+    LifestyleProfile = apps.get_model('main', 'LifestyleProfile')
+    connection = schema_editor.connection
+    table = connection.ops.quote_name(LifestyleProfile._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} SET engagement_expires_at = {FROM_UNIXTIME[connection.vendor]} '
+            f'WHERE engagement_expiry >= %s',
+            [MIN_PLAUSIBLE_TIMESTAMP],
+        )
+    skipped = list(
+        LifestyleProfile.objects.using(connection.alias)
+        .filter(engagement_expiry__lt=MIN_PLAUSIBLE_TIMESTAMP).values_list('id', 'engagement_expiry')
+    )
+    if skipped:
+        logger.warning(
+            'Left engagement_expires_at empty for %s profiles with an implausible engagement_expiry: %s',
+            len(skipped), ', '.join(f'{pk}={value}' for pk, value in skipped),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_portfolio_newest_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lifestyleprofile',
+            name='engagement_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_expiry, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='lifestyleprofile',
+            name='engagement_expiry',
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('message', 'New Message'), ('gallery_request', 'Gallery Access Request'), ('interest', 'Interest Expressed'), ('tier_expired', 'Membership Tier Ended')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='lifestyleprofile',
+            index=models.Index(condition=models.Q(('engagement_tier__in', ('premium', 'exclusive'))), fields=['engagement_expires_at', 'id'], name='engagement_expiry_idx'),
+        ),
+    ]
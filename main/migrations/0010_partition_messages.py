@@ -0,0 +1,108 @@
+# Generated by Django 4.2 on 2026-10-19 03:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from main import partitions
+
+SEQUENCE = f'{partitions.TABLE}_id_seq'
+
+
+def _add_keys(apps, cursor, qn, primary_key):
+    table = partitions.TABLE
+    cursor.execute(f'ALTER TABLE {qn(table)} ADD PRIMARY KEY ({primary_key})')
+    targets = {
+        'introduction_id': apps.get_model('main', 'CuratedIntroduction')._meta.db_table,
+        'sender_id': apps.get_model(*settings.AUTH_USER_MODEL.split('.'))._meta.db_table,
+    }
+    for column, target in targets.items():
+        cursor.execute(
+            f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f"{table}_{column}_fk")} FOREIGN KEY ({column}) '
+            f'REFERENCES {qn(target)} (id) DEFERRABLE INITIALLY DEFERRED'
+        )
+    # introduction_id lookups use message_thread_idx, which leads with it
+    cursor.execute(f'CREATE INDEX {qn(f"{table}_sender_id_idx")} ON {qn(table)} (sender_id)')
+
+
+def partition_messages(apps, schema_editor):
+    """PostgreSQL: rebuild main_discreetmessage range-partitioned by month on exchanged_at"""
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    qn = connection.ops.quote_name
+    table, old = partitions.TABLE, f'{partitions.TABLE}_unpartitioned'
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+        cursor.execute(f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS) PARTITION BY RANGE (exchanged_at)')
+        cursor.execute(f'CREATE TABLE {qn(partitions.DEFAULT_PARTITION)} PARTITION OF {qn(table)} DEFAULT')
+        cursor.execute(f'SELECT MIN(exchanged_at) FROM {qn(old)}')
+        oldest = cursor.fetchone()[0]
+
+    partitions.ensure_partitions(using=connection.alias, first=partitions.month_start(oldest) if oldest else None)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+        cursor.execute(f'DROP TABLE {qn(old)}')
+        # The identity column went with the old table; a sequence serves the parent
+        cursor.execute(f'CREATE SEQUENCE {qn(SEQUENCE)} OWNED BY {qn(table)}.id')
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f"SELECT setval('{SEQUENCE}', COALESCE(MAX(id), 0) + 1, false) FROM {qn(table)}")
+        # A partitioned table's unique keys must include the partition key
+        _add_keys(apps, cursor, qn, 'id, exchanged_at')
+
+
+def unpartition_messages(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    qn = connection.ops.quote_name
+    table, partitioned = partitions.TABLE, f'{partitions.TABLE}_partitioned'
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(partitioned)}')
+        cursor.execute(f'ALTER SEQUENCE {qn(SEQUENCE)} OWNED BY NONE')
+        cursor.execute(f'CREATE TABLE {qn(table)} (LIKE {qn(partitioned)} INCLUDING DEFAULTS)')
+        cursor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(partitioned)}')
+        cursor.execute(f'DROP TABLE {qn(partitioned)}')
+        cursor.execute(f'ALTER SEQUENCE {qn(SEQUENCE)} OWNED BY {qn(table)}.id')
+        _add_keys(apps, cursor, qn, 'id')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_engagement_expiry_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('message_count', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='curatedintroduction',
+            name='last_exchange',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='latest_in_introduction', to='main.discreetmessage'),
+        ),
+        migrations.RunPython(partition_messages, unpartition_messages),
+        # After partitioning, so it is created on the parent and every partition
+        migrations.AddIndex(
+            model_name='discreetmessage',
+            index=models.Index(fields=['introduction', 'exchanged_at', 'id'], name='message_thread_idx'),
+        ),
+        migrations.AddField(
+            model_name='messagearchive',
+            name='introduction',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='message_archives', to='main.curatedintroduction'),
+        ),
+        migrations.AddIndex(
+            model_name='messagearchive',
+            index=models.Index(fields=['introduction', 'month'], name='message_archive_thread_idx'),
+        ),
+    ]
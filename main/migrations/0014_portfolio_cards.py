@@ -0,0 +1,98 @@
+# Generated by Django 4.2 on 2026-10-19 03:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_cards(apps, schema_editor):
+    """One card per discoverable portfolio, as main.cards.sync() would write it"""
+    LifestyleProfile = apps.get_model('main', 'LifestyleProfile')
+    PortfolioCard = apps.get_model('main', 'PortfolioCard')
+    db = schema_editor.connection.alias
+    profiles = LifestyleProfile.objects.using(db).filter(
+        curator_approved=True, public_portfolio=True, portfolio_suspended=False,
+    ).select_related('user')
+    cards = []
+    for profile in profiles.iterator(chunk_size=1000):
+        cards.append(PortfolioCard(
+            profile_id=profile.pk, user_id=profile.user_id, username=profile.user.username,
+            preferred_name=profile.preferred_name, gender=profile.gender,
+            lifestyle_preference=profile.lifestyle_preference,
+            image=profile.portfolio_thumbnail.name or profile.portfolio_image.name or '',
+            primary_location=profile.primary_location, place_id=profile.place_id,
+            date_of_birth=profile.date_of_birth, engagement_tier=profile.engagement_tier,
+            engagement_expires_at=profile.engagement_expires_at, statement=profile.personal_statement[:200],
+            last_active=profile.last_active, portfolio_created=profile.portfolio_created,
+            last_updated=profile.last_updated,
+        ))
+        if len(cards) >= 1000:
+            PortfolioCard.objects.using(db).bulk_create(cards)
+            cards = []
+    PortfolioCard.objects.using(db).bulk_create(cards)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('main', '0013_data_export'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioCard',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='main.lifestyleprofile')),
+                ('username', models.CharField(max_length=150)),
+                ('preferred_name', models.CharField(blank=True, max_length=100)),
+                ('gender', models.CharField(blank=True, max_length=10)),
+                ('lifestyle_preference', models.CharField(blank=True, max_length=50)),
+                ('image', models.ImageField(blank=True, upload_to='')),
+                ('primary_location', models.CharField(blank=True, max_length=255)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('engagement_tier', models.CharField(max_length=20)),
+                ('engagement_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('statement', models.CharField(blank=True, max_length=200)),
+                ('last_active', models.DateTimeField(blank=True, null=True)),
+                ('portfolio_created', models.DateTimeField()),
+                ('last_updated', models.DateTimeField()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='lifestyleprofile',
+            name='portfolio_newest_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='lifestyleprofile',
+            name='profile_place_active_idx',
+        ),
+        migrations.AlterField(
+            model_name='lifestyleprofile',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiles', to='main.place'),
+        ),
+        migrations.AddField(
+            model_name='portfoliocard',
+            name='place',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='main.place'),
+        ),
+        migrations.AddField(
+            model_name='portfoliocard',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliocard',
+            index=models.Index(fields=['-last_active'], name='card_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliocard',
+            index=models.Index(fields=['place', '-last_active'], name='card_place_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliocard',
+            index=models.Index(fields=['-portfolio_created', '-profile'], name='card_newest_idx'),
+        ),
+        migrations.RunPython(create_cards, migrations.RunPython.noop),
+    ]
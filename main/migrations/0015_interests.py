@@ -0,0 +1,66 @@
+# Generated by Django 4.2 on 2026-10-19 03:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_saved_connections(apps, schema_editor):
+    """One Interest per saved connection; pairs saved both ways are matched"""
+    LifestyleProfile = apps.get_model('main', 'LifestyleProfile')
+    Interest = apps.get_model('main', 'Interest')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    db = schema_editor.connection.alias
+    profiles = LifestyleProfile.objects.using(db).values_list('user_id', 'saved_connections', 'last_updated')
+    for user_id, saved, saved_at in profiles.iterator(chunk_size=1000):
+        targets = {pk for pk in saved or [] if isinstance(pk, int) and pk != user_id}
+        existing = User.objects.using(db).filter(pk__in=targets).values_list('pk', flat=True)
+        Interest.objects.using(db).bulk_create(
+            [Interest(from_user_id=user_id, to_user_id=pk, created_at=saved_at) for pk in existing],
+            ignore_conflicts=True,
+        )
+    reciprocal = Interest.objects.using(db).filter(
+        from_user=models.OuterRef('to_user'), to_user=models.OuterRef('from_user'),
+    )
+    Interest.objects.using(db).filter(models.Exists(reciprocal)).update(matched_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('main', '0014_portfolio_cards'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('message', 'New Message'), ('gallery_request', 'Gallery Access Request'), ('interest', 'Interest Expressed'), ('tier_expired', 'Membership Tier Ended'), ('export_ready', 'Data Export Ready'), ('match', 'Mutual Match')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='Interest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('matched_at', models.DateTimeField(blank=True, null=True)),
+                ('from_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interests_sent', to=settings.AUTH_USER_MODEL)),
+                ('introduction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='main.curatedintroduction')),
+                ('to_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interests_received', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='interest',
+            index=models.Index(condition=models.Q(('matched_at__isnull', False)), fields=['from_user', '-matched_at', '-id'], name='interest_match_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='interest',
+            constraint=models.UniqueConstraint(fields=('from_user', 'to_user'), name='interest_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='interest',
+            constraint=models.CheckConstraint(check=models.Q(('from_user', models.F('to_user')), _negated=True), name='interest_not_self'),
+        ),
+        migrations.RunPython(copy_saved_connections, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-19 05:02
+
+import re
+import unicodedata
+
+from django.db import migrations
+
+
+def normalize(text):
+    """As main.places.normalize()"""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return re.sub(r'[^0-9a-z]+', ' ', folded).strip()
+
+
+def link_places(apps, schema_editor):
+    """Link profiles and their cards to the place primary_location names, as main.places.link_profiles() would"""
+    LifestyleProfile = apps.get_model('main', 'LifestyleProfile')
+    PortfolioCard = apps.get_model('main', 'PortfolioCard')
+    Place = apps.get_model('main', 'Place')
+    PlaceName = apps.get_model('main', 'PlaceName')
+    db = schema_editor.connection.alias
+    known = {}
+    for name, place_id in PlaceName.objects.using(db).order_by('place__population', '-place_id').values_list('name', 'place_id'):
+        known[name] = place_id  # a shared name goes to the most populous place, as in 0017
+    unlinked = LifestyleProfile.objects.using(db).filter(place__isnull=True).exclude(primary_location='')
+    for location in list(unlinked.order_by().values_list('primary_location', flat=True).distinct()):
+        key = normalize(location)
+        if not key:
+            continue
+        if key not in known:
+            known[key] = Place.objects.using(db).create(name=' '.join(location.split())).pk
+            PlaceName.objects.using(db).create(place_id=known[key], name=key)
+        ids = list(unlinked.filter(primary_location=location).values_list('pk', flat=True))
+        LifestyleProfile.objects.using(db).filter(pk__in=ids).update(place_id=known[key])
+        PortfolioCard.objects.using(db).filter(profile_id__in=ids).update(place_id=known[key])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_interests'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_places, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2 on 2026-10-19 04:49
+
+from django.db import migrations, models
+
+
+def drop_duplicate_names(apps, schema_editor):
+    """Keep each name only on the most populous place that has it"""
+    PlaceName = apps.get_model('main', 'PlaceName')
+    db = schema_editor.connection.alias
+    seen = set()
+    duplicates = []
+    for pk, name in PlaceName.objects.using(db).order_by('name', '-place__population', 'place_id').values_list('pk', 'name'):
+        if name in seen:
+            duplicates.append(pk)
+        seen.add(name)
+    PlaceName.objects.using(db).filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_link_places'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_names, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='placename',
+            name='place_name_uniq',
+        ),
+        migrations.AlterField(
+            model_name='placename',
+            name='name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -1,7 +1,10 @@
 # main/models.py - CORRECTED VERSION
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.utils import timezone
+from django.utils.functional import cached_property
 import json
 
 # ===== GLOBAL CHOICES =====
@@ -30,6 +33,8 @@ ENGAGEMENT_TYPE_CHOICES = [
     ('premium', 'Premium'),
     ('exclusive', 'Exclusive'),
 ]
+# Tiers that run for a paid term and fall back to standard when it ends
+PAID_TIERS = ('premium', 'exclusive')
 
 # Relationship Status
 RELATIONSHIP_CHOICES = [
@@ -83,6 +88,14 @@ NET_WORTH_CHOICES = [
     ('Over $5M', 'Over $5M'),
 ]
 
+# Notification digest frequency
+DIGEST_FREQUENCY_CHOICES = [
+    ('hourly', 'Hourly'),
+    ('daily', 'Daily'),
+    ('weekly', 'Weekly'),
+    ('never', 'Never'),
+]
+
 # Period choices
 PERIOD_CHOICES = [
     ('per week', 'per week'),
@@ -90,6 +103,24 @@ PERIOD_CHOICES = [
     ('per meet', 'per meet'),
 ]
 
+class Place(models.Model):
+    """A normalized location profiles link to (main/places.py)"""
+    name = models.CharField(max_length=255)
+    country = models.CharField(max_length=100, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Ranks autocomplete suggestions
+    population = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return self.name
+
+class PlaceName(models.Model):
+    """A normalized spelling of a place, for exact lookups and prefix autocomplete"""
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='names')
+    # On PostgreSQL unique also adds a varchar_pattern_ops index for LIKE 'prefix%'
+    name = models.CharField(max_length=255, unique=True)
+
 class LifestyleProfile(models.Model):
     """Elite Lifestyle Connections Profile"""
     
@@ -103,11 +134,15 @@ class LifestyleProfile(models.Model):
     
     # === LIFESTYLE LOCATION ===
     primary_location = models.CharField(max_length=255, blank=True)
+    # Resolved from primary_location (main/places.py)
+    place = models.ForeignKey(Place, on_delete=models.SET_NULL, null=True, blank=True, related_name='profiles')
     latitude = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True)
     longitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True)
     
     # === PORTFOLIO PRESENCE ===
     portfolio_image = models.ImageField(upload_to='portfolios/', null=True, blank=True)
+    # Card-sized copy of portfolio_image, made in the background (main/tasks.py)
+    portfolio_thumbnail = models.ImageField(upload_to='portfolios/thumbnails/', null=True, blank=True)
     personal_statement = models.TextField(blank=True)
     lifestyle_preference = models.CharField(max_length=50, choices=LIFESTYLE_PREFERENCE_CHOICES, blank=True)
     
@@ -151,16 +186,29 @@ class LifestyleProfile(models.Model):
     # === CONNECTION METRICS ===
     saved_connections = models.JSONField(default=list)
     restricted_connections = models.JSONField(default=list)
-    portfolio_views = models.JSONField(default=dict)
-    interest_received = models.JSONField(default=dict)
+    # Who viewed / showed interest: see ProfileEvent and ProfileEventDaily
     last_active = models.DateTimeField(null=True, blank=True)
     view_count = models.IntegerField(default=0)
     
+    # === NOTIFICATIONS ===
+    digest_frequency = models.CharField(max_length=10, choices=DIGEST_FREQUENCY_CHOICES, default='daily')
+    last_digest_at = models.DateTimeField(null=True, blank=True)
+    
     # === DATES ===
-    engagement_expiry = models.IntegerField(null=True, blank=True)
+    engagement_expires_at = models.DateTimeField(null=True, blank=True)  # end of a paid tier's term
     portfolio_created = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            # expire_engagements: lapsed paid tiers, oldest expiry first
+            models.Index(
+                fields=['engagement_expires_at', 'id'],
+                condition=models.Q(engagement_tier__in=PAID_TIERS),
+                name='engagement_expiry_idx',
+            ),
+        ]
+    
     # === METHODS ===
     def get_life_stage(self):
         """Calculate life stage from date_of_birth"""
@@ -180,8 +228,10 @@ class LifestyleProfile(models.Model):
         return None
     
     def has_exclusive_access(self):
-        """Check if user has exclusive engagement tier"""
-        return self.engagement_tier in ['premium', 'exclusive']
+        """Paid tier whose term hasn't ended (expire_engagements downgrades lapsed ones)"""
+        if self.engagement_tier not in PAID_TIERS:
+            return False
+        return self.engagement_expires_at is None or self.engagement_expires_at > timezone.now()
     
     def update_activity(self):
         """Update last activity timestamp"""
@@ -191,10 +241,54 @@ class LifestyleProfile(models.Model):
     def __str__(self):
         return f"{self.preferred_name or self.user.username} - {self.engagement_tier} Lifestyle Portfolio"
 
+class PortfolioCard(models.Model):
+    """
+    Narrow copy of a discoverable portfolio: just what a grid card shows.
+    Feed and search read this instead of the wide LifestyleProfile rows;
+    main/cards.py keeps it in step.
+    """
+    profile = models.OneToOneField(LifestyleProfile, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    username = models.CharField(max_length=150)
+    preferred_name = models.CharField(max_length=100, blank=True)
+    gender = models.CharField(max_length=10, blank=True)
+    lifestyle_preference = models.CharField(max_length=50, blank=True)
+    # The thumbnail when there is one, else the full portfolio image
+    image = models.ImageField(blank=True)
+    primary_location = models.CharField(max_length=255, blank=True)
+    place = models.ForeignKey(Place, on_delete=models.SET_NULL, null=True, blank=True, db_index=False,
+                              related_name='+')
+    date_of_birth = models.DateField(null=True, blank=True)
+    engagement_tier = models.CharField(max_length=20)
+    engagement_expires_at = models.DateTimeField(null=True, blank=True)
+    statement = models.CharField(max_length=200, blank=True)
+    last_active = models.DateTimeField(null=True, blank=True)
+    portfolio_created = models.DateTimeField()
+    last_updated = models.DateTimeField()
+    
+    class Meta:
+        indexes = [
+            # Dashboard and search grids, most recently active first
+            models.Index(fields=['-last_active'], name='card_active_idx'),
+            models.Index(fields=['place', '-last_active'], name='card_place_active_idx'),
+            # Newest-first keyset pages (API feed and search)
+            models.Index(fields=['-portfolio_created', '-profile'], name='card_newest_idx'),
+        ]
+    
+    # Both only read the columns the card copies
+    get_life_stage = LifestyleProfile.get_life_stage
+    has_exclusive_access = LifestyleProfile.has_exclusive_access
+    
+    def __str__(self):
+        return f"Card for {self.username}"
+
 class CuratedIntroduction(models.Model):
     """Curated introduction between sophisticated individuals"""
     participants = models.ManyToManyField(User, related_name='curated_introductions')
-    last_exchange = models.ForeignKey('DiscreetMessage', on_delete=models.SET_NULL, null=True, related_name='latest_in_introduction')
+    # No database constraint: on PostgreSQL DiscreetMessage is partitioned and its
+    # primary key is (id, exchanged_at), so id alone can't be referenced
+    last_exchange = models.ForeignKey('DiscreetMessage', on_delete=models.SET_NULL, null=True, db_constraint=False,
+                                      related_name='latest_in_introduction')
     introduction_initiated = models.DateTimeField(auto_now_add=True)
     last_interaction = models.DateTimeField(auto_now=True)
     
@@ -219,6 +313,24 @@ class DiscreetMessage(models.Model):
     
     class Meta:
         ordering = ['exchanged_at']
+        indexes = [
+            # A thread, newest first; on PostgreSQL one small index per monthly partition
+            models.Index(fields=['introduction', 'exchanged_at', 'id'], name='message_thread_idx'),
+        ]
+
+class MessageArchive(models.Model):
+    """One introduction's messages for one month, compressed out of DiscreetMessage (main/archive.py)"""
+    introduction = models.ForeignKey(CuratedIntroduction, on_delete=models.CASCADE, related_name='message_archives')
+    month = models.DateField()  # first day of the month
+    message_count = models.PositiveIntegerField()
+    data = models.BinaryField()  # zlib-compressed JSON list of messages, oldest first
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [models.Index(fields=['introduction', 'month'], name='message_archive_thread_idx')]
+    
+    def __str__(self):
+        return f"Introduction {self.introduction_id} - {self.month:%Y-%m} ({self.message_count} messages)"
 
 class ExclusiveExperience(models.Model):
     """Exclusive experience listings"""
@@ -237,6 +349,19 @@ class ExclusiveExperience(models.Model):
     is_active = models.BooleanField(default=True)
     listed_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            # Upcoming feed: keyset order over active listings only, so the
+            # index stays small however many past listings accumulate
+            models.Index(
+                fields=['experience_date', 'commencement', 'id'],
+                condition=models.Q(is_active=True),
+                name='experience_upcoming_idx',
+            ),
+            # A host's own listings, newest first
+            models.Index(fields=['host', '-experience_date'], name='experience_host_date_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.experience_title} - {self.experience_date}"
 
@@ -253,3 +378,194 @@ class GalleryAccessRequest(models.Model):
     
     class Meta:
         unique_together = ['requester', 'gallery_owner']
+
+class RecommendationList(models.Model):
+    """Precomputed compatibility ranking shown on a member's dashboard"""
+    profile = models.OneToOneField(LifestyleProfile, on_delete=models.CASCADE, related_name='recommendations')
+    candidates = models.JSONField(default=list)  # LifestyleProfile ids, best match first
+    scores = models.JSONField(default=list)
+    computed_at = models.DateTimeField(db_index=True)
+    
+    def __str__(self):
+        return f"Recommendations for {self.profile_id} ({len(self.candidates)})"
+
+PROFILE_EVENT_CHOICES = [
+    ('view', 'Portfolio View'),
+    ('interest', 'Interest Expressed'),
+]
+
+class ProfileEvent(models.Model):
+    """Append-only record of one view of / expression of interest in a portfolio"""
+    profile = models.ForeignKey(LifestyleProfile, on_delete=models.CASCADE, related_name='events')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=20, choices=PROFILE_EVENT_CHOICES)
+    occurred_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['profile', 'kind', 'occurred_at'], name='profile_event_recent_idx'),
+            # Rollups walk the table oldest first
+            models.Index(fields=['occurred_at'], name='profile_event_time_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} of {self.profile_id} by {self.actor_id} at {self.occurred_at}"
+
+class ProfileEventDaily(models.Model):
+    """ProfileEvents rolled up per profile, actor, kind and day"""
+    profile = models.ForeignKey(LifestyleProfile, on_delete=models.CASCADE, related_name='daily_events')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=20, choices=PROFILE_EVENT_CHOICES)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['profile', 'kind', 'day', 'actor'], name='profile_event_daily_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.count} {self.kind} of {self.profile_id} on {self.day}"
+
+class Interest(models.Model):
+    """One member's interest in another; a pair that both hold is a match (main/interests.py)"""
+    from_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='interests_sent')
+    to_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='interests_received')
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set on both rows of a pair once the interest is mutual
+    matched_at = models.DateTimeField(null=True, blank=True)
+    introduction = models.ForeignKey(CuratedIntroduction, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='+')
+    
+    class Meta:
+        constraints = [
+            # Also answers the reciprocal lookup (from_user=them, to_user=me)
+            models.UniqueConstraint(fields=['from_user', 'to_user'], name='interest_unique'),
+            models.CheckConstraint(check=~models.Q(from_user=models.F('to_user')), name='interest_not_self'),
+        ]
+        indexes = [
+            # A member's matches, newest first, for keyset paging
+            models.Index(
+                fields=['from_user', '-matched_at', '-id'],
+                condition=models.Q(matched_at__isnull=False),
+                name='interest_match_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.from_user_id} -> {self.to_user_id}"
+
+JOB_STATUS_CHOICES = [
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+]
+
+class Job(models.Model):
+    """Background job run by `manage.py runworker` (see main/jobs.py)"""
+    task = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict)
+    priority = models.SmallIntegerField(default=0)  # higher runs first
+    status = models.CharField(max_length=10, choices=JOB_STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            # The worker's poll: only queued rows, in the order they are claimed
+            models.Index(
+                models.F('priority').desc(), 'run_at', 'id',
+                condition=models.Q(status='queued'),
+                name='job_ready_idx',
+            ),
+            models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+NOTIFICATION_KIND_CHOICES = [
+    ('message', 'New Message'),
+    ('gallery_request', 'Gallery Access Request'),
+    ('interest', 'Interest Expressed'),
+    ('tier_expired', 'Membership Tier Ended'),
+    ('export_ready', 'Data Export Ready'),
+    ('match', 'Mutual Match'),
+]
+
+class Notification(models.Model):
+    """Outbox entry waiting to go out in the recipient's next digest"""
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='pending_notifications')
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=20, choices=NOTIFICATION_KIND_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['recipient', 'created_at'], name='notification_recipient_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} for {self.recipient_id}"
+
+ACCOUNT_DELETION_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('running', 'Purging'),
+    ('done', 'Deleted'),
+]
+
+class AccountDeletion(models.Model):
+    """A closed account whose data is being purged in the background (main/accounts.py)"""
+    # Not a foreign key: the user row is the last thing deleted, and this record outlives it
+    user_id = models.IntegerField(unique=True)
+    username = models.CharField(max_length=150)
+    status = models.CharField(max_length=10, choices=ACCOUNT_DELETION_STATUS_CHOICES, default='pending')
+    progress = models.JSONField(default=dict)  # purge step -> rows deleted so far
+    requested_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Deletion of {self.username} ({self.status})"
+
+DATA_EXPORT_STATUS_CHOICES = [
+    ('pending', 'Queued'),
+    ('running', 'Building'),
+    ('ready', 'Ready'),
+    ('failed', 'Failed'),
+]
+
+class DataExportStorage(FileSystemStorage):
+    """FileSystemStorage rooted at DATA_EXPORT_ROOT, following changes to the setting like MEDIA_ROOT"""
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.DATA_EXPORT_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'DATA_EXPORT_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+def export_storage():
+    """Private storage for data export archives, outside MEDIA_ROOT"""
+    return DataExportStorage()
+
+class DataExport(models.Model):
+    """A member's data export built in the background (main/exports.py)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='data_exports')
+    status = models.CharField(max_length=10, choices=DATA_EXPORT_STATUS_CHOICES, default='pending')
+    file = models.FileField(storage=export_storage, blank=True)
+    size = models.BigIntegerField(default=0)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Export {self.pk} for {self.user_id} ({self.status})"
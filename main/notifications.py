@@ -0,0 +1,109 @@
+# main/notifications.py
+"""
+Notification digests.
+
+Events a member should hear about (messages, gallery requests, interest)
+are written to the Notification outbox with notify(). send_digests(), run
+by the send_notification_digests command or job, coalesces each member's
+pending rows into one email at their chosen frequency and delivers a batch
+of digests over a single backend connection.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import NOTIFICATION_KIND_CHOICES, LifestyleProfile, Notification
+from .routers import untracked_writes
+
+DIGEST_INTERVALS = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(weeks=1),
+}
+# Names listed per kind in a digest; the rest are counted
+DIGEST_NAMES_PER_KIND = 5
+
+KIND_LABELS = dict(NOTIFICATION_KIND_CHOICES)
+
+
+def notify(recipient_id, kind, actor_id=None):
+    """Add an event to ``recipient_id``'s next digest"""
+    # An outbox row is not something the actor reads back
+    with untracked_writes():
+        Notification.objects.create(recipient_id=recipient_id, kind=kind, actor_id=actor_id)
+
+
+def due_profiles(now):
+    """Members with pending notifications whose digest interval has passed"""
+    due = Q(last_digest_at__isnull=True)
+    for frequency, interval in DIGEST_INTERVALS.items():
+        due |= Q(digest_frequency=frequency, last_digest_at__lte=now - interval)
+    pending = Notification.objects.filter(recipient=OuterRef('user_id'), created_at__lte=now)
+    return LifestyleProfile.objects.filter(due, Exists(pending)).exclude(digest_frequency='never')
+
+
+def _summaries(user_ids, now):
+    """recipient -> [(label, count, names)] for pending notifications"""
+    rows = (
+        Notification.objects.filter(recipient_id__in=user_ids, created_at__lte=now)
+        .order_by('-created_at')
+        .values_list('recipient_id', 'kind', 'actor__username')
+    )
+    grouped = {}
+    for recipient_id, kind, username in rows:
+        entry = grouped.setdefault(recipient_id, {}).setdefault(kind, [0, []])
+        entry[0] += 1
+        if username and username not in entry[1] and len(entry[1]) < DIGEST_NAMES_PER_KIND:
+            entry[1].append(username)
+    return {
+        recipient_id: [(KIND_LABELS[kind], count, names) for kind, (count, names) in kinds.items()]
+        for recipient_id, kinds in grouped.items()
+    }
+
+
+def _digest(profile, summary):
+    body = render_to_string('main/emails/notification_digest.txt', {
+        'name': profile.preferred_name or profile.user.username,
+        'summary': summary,
+        'site_name': settings.SITE_NAME,
+        'site_domain': settings.SITE_DOMAIN,
+        'frequency': profile.get_digest_frequency_display().lower(),
+    })
+    total = sum(count for _, count, _ in summary)
+    subject = f'{settings.SITE_NAME}: {total} new update{"s" if total != 1 else ""}'
+    return EmailMessage(subject, body, to=[profile.user.email])
+
+
+def send_digests(now=None, batch_size=100, log=None):
+    """Send every due digest; returns the number of emails sent"""
+    now = now or timezone.now()
+    # Opted-out members never get a digest, so don't let their backlog grow
+    Notification.objects.filter(recipient__lifestyle_profile__digest_frequency='never').delete()
+
+    profile_ids = list(due_profiles(now).order_by('pk').values_list('pk', flat=True))
+    sent = 0
+    # One connection (one SMTP session) for the whole run
+    with get_connection(settings.JOB_EMAIL_BACKEND) as connection:
+        for offset in range(0, len(profile_ids), batch_size):
+            profiles = list(
+                LifestyleProfile.objects.filter(pk__in=profile_ids[offset:offset + batch_size]).select_related('user')
+            )
+            user_ids = [profile.user_id for profile in profiles]
+            summaries = _summaries(user_ids, now)
+            digests = [
+                _digest(profile, summaries[profile.user_id]) for profile in profiles
+                if profile.user.email and profile.user_id in summaries
+            ]
+            with transaction.atomic():
+                connection.send_messages(digests)
+                Notification.objects.filter(recipient_id__in=user_ids, created_at__lte=now).delete()
+                LifestyleProfile.objects.filter(pk__in=[p.pk for p in profiles]).update(last_digest_at=now)
+            sent += len(digests)
+            if log:
+                log(f'  {offset + len(profiles)}/{len(profile_ids)} members, {sent} digests sent')
+    return sent
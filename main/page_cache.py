@@ -0,0 +1,84 @@
+# main/page_cache.py
+"""
+Full-page cache for anonymous visitors to the public pages.
+
+Rendered pages are stored in the PUBLIC_PAGE_CACHE_ALIAS cache keyed by
+scheme, host and path (the pages take no query parameters) plus the deploy
+version, and served with an ETag and Last-Modified so a revalidating
+browser gets a 304 without the page being rendered. Logged-in members
+always get a fresh, private response; every response carries
+``Vary: Cookie`` so no downstream cache mixes the two.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def page_cache_key(scheme, host, path):
+    url = f'{scheme}://{host}{path}'
+    return f'public-page:{settings.PUBLIC_PAGE_CACHE_VERSION}:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def request_cache_key(request):
+    return page_cache_key(request.scheme, request.get_host(), request.path)
+
+
+def _cacheable(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # A page that rendered {% csrf_token %} is specific to this visitor
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def _response(request, entry):
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    patch_vary_headers(response, ['Cookie'])
+    return get_conditional_response(
+        request, etag=entry['etag'], last_modified=entry['last_modified'], response=response,
+    )
+
+
+def public_page(view_func):
+    """Serve ``view_func`` from the shared page cache for anonymous GET/HEAD"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            response = view_func(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Cookie'])
+            return response
+
+        cache = caches[settings.PUBLIC_PAGE_CACHE_ALIAS]
+        key = request_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            if not _cacheable(request, response):
+                patch_vary_headers(response, ['Cookie'])
+                return response
+            entry = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+                'last_modified': int(time.time()),
+            }
+            cache.set(key, entry, settings.PUBLIC_PAGE_CACHE_SECONDS)
+        return _response(request, entry)
+
+    wrapper.public_page = True
+    return wrapper
@@ -0,0 +1,111 @@
+# main/pagination.py
+"""
+Keyset (seek) pagination.
+
+OFFSET pagination makes the database walk every skipped row, so deep pages
+get slower as tables grow. A keyset page instead starts strictly after the
+last row of the previous page, which an index on the ordering columns
+answers directly at any depth. The ordering must end in a unique column
+(normally the primary key) so every row has a distinct position.
+
+Lists stored whole on a row (a recommendation ranking, saved connections)
+are paged by position instead with list_page(), behind the same opaque
+cursors.
+"""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage:
+    """One page of results plus the cursor for the next page"""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _split(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _pack(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def _unpack(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(row, ordering):
+    """Opaque cursor for the position of ``row`` (a model instance or values() dict)"""
+    values = []
+    for name, _ in _split(ordering):
+        value = row[name] if isinstance(row, dict) else getattr(row, name)
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    return _pack(values)
+
+
+def decode_cursor(cursor, model, ordering):
+    """Cursor -> typed values for the ordering fields; raises InvalidCursor"""
+    try:
+        raw = _unpack(cursor)
+        fields = _split(ordering)
+        if not isinstance(raw, list) or len(raw) != len(fields):
+            raise InvalidCursor('cursor does not match ordering')
+        return [model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, raw)]
+    except (ValueError, TypeError, ValidationError) as exc:
+        raise InvalidCursor(str(exc)) from exc
+
+
+def after(ordering, values):
+    """Q for rows strictly after ``values`` in ``ordering`` (expanded row comparison)"""
+    fields = _split(ordering)
+    clauses = []
+    for i, (name, descending) in enumerate(fields):
+        equal = {prior: value for (prior, _), value in zip(fields[:i], values[:i])}
+        clauses.append(Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': values[i]}))
+    return reduce(or_, clauses)
+
+
+def keyset_page(queryset, ordering, cursor=None, page_size=20):
+    """Fetch one page of ``queryset`` ordered by ``ordering``, starting after ``cursor``"""
+    if cursor:
+        queryset = queryset.filter(after(ordering, decode_cursor(cursor, queryset.model, ordering)))
+    rows = list(queryset.order_by(*ordering)[:page_size + 1])
+    next_cursor = encode_cursor(rows[page_size - 1], ordering) if len(rows) > page_size else None
+    return KeysetPage(rows[:page_size], next_cursor)
+
+
+def list_page(items, cursor=None, page_size=20):
+    """One page of an in-memory list, starting after the position in ``cursor``"""
+    start = 0
+    if cursor:
+        try:
+            raw = _unpack(cursor)
+        except ValueError as exc:
+            raise InvalidCursor(str(exc)) from exc
+        if not isinstance(raw, list) or len(raw) != 1 or not isinstance(raw[0], int) or raw[0] < 0:
+            raise InvalidCursor('cursor does not match a list position')
+        start = raw[0]
+    end = start + page_size
+    return KeysetPage(items[start:end], _pack([end]) if end < len(items) else None)
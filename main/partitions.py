@@ -0,0 +1,125 @@
+# main/partitions.py
+"""
+Monthly range partitions of DiscreetMessage on PostgreSQL.
+
+Migration 0010 turns main_discreetmessage into a table declaratively
+partitioned on exchanged_at: one child table per calendar month (UTC),
+plus a default partition that only catches rows no month covers. Inbox
+and thread reads are for recent messages, so they touch one or two small
+partitions whose indexes stay in memory, and main/archive.py retires old
+months by dropping whole partitions instead of deleting rows.
+
+ensure_partitions(), run by the create_message_partitions command or
+job, creates the coming months ahead of time. On other databases the
+table is an ordinary table and these functions do nothing.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import DiscreetMessage
+
+TABLE = DiscreetMessage._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_NAME = re.compile(rf'^{TABLE}_y(\d{{4}})m(\d{{2}})$')
+
+
+def month_start(moment):
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def bounds(month):
+    """[start, end) of a month as UTC datetimes"""
+    start = datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+    next_month = add_months(month, 1)
+    return start, datetime(next_month.year, next_month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month):
+    return f'{TABLE}_y{month.year}m{month.month:02}'
+
+
+def is_partitioned(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)', [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(connection):
+    """Months that have a partition, oldest first"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s AND pg_table_is_visible(p.oid)', [TABLE],
+        )
+        names = [PARTITION_NAME.match(name) for name, in cursor.fetchall()]
+    return sorted(date(int(m[1]), int(m[2]), 1) for m in names if m)
+
+
+def create_partition(connection, month):
+    """
+    Add the partition for ``month``. Rows for that month already sitting in
+    the default partition are moved into it (PostgreSQL refuses to attach
+    a range the default partition holds rows for).
+    """
+    qn = connection.ops.quote_name
+    start, end = bounds(month)
+    # Our own dates, inlined: DDL can't take bound parameters
+    range_sql = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_range = f"exchanged_at >= '{start.isoformat()}' AND exchanged_at < '{end.isoformat()}'"
+    name = qn(partition_name(month))
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'SELECT 1 FROM {qn(DEFAULT_PARTITION)} WHERE {in_range} LIMIT 1')
+        if cursor.fetchone() is None:
+            cursor.execute(f'CREATE TABLE {name} PARTITION OF {qn(TABLE)} {range_sql}')
+            return
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(DEFAULT_PARTITION)}')
+        cursor.execute(f'CREATE TABLE {name} PARTITION OF {qn(TABLE)} {range_sql}')
+        cursor.execute(f'INSERT INTO {name} SELECT * FROM {qn(DEFAULT_PARTITION)} WHERE {in_range}')
+        cursor.execute(f'DELETE FROM {qn(DEFAULT_PARTITION)} WHERE {in_range}')
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(DEFAULT_PARTITION)} DEFAULT')
+
+
+def drop_partition(connection, month):
+    """Detach and drop a month's partition with everything in it"""
+    qn = connection.ops.quote_name
+    name = qn(partition_name(month))
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {name}')
+        cursor.execute(f'DROP TABLE {name}')
+
+
+def ensure_partitions(months_ahead=None, now=None, using='default', first=None):
+    """
+    Create any missing partitions from ``first`` (default: this month)
+    through MESSAGE_PARTITION_MONTHS_AHEAD months ahead; returns the months
+    created.
+    """
+    connection = connections[using]
+    if not is_partitioned(connection):
+        return []
+    months_ahead = settings.MESSAGE_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(now or timezone.now())
+    existing = set(partitions(connection))
+    month = min(first or current, current)
+    created = []
+    while month <= add_months(current, months_ahead):
+        if month not in existing:
+            create_partition(connection, month)
+            created.append(month)
+        month = add_months(month, 1)
+    return created
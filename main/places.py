@@ -0,0 +1,145 @@
+# main/places.py
+"""
+Normalized locations.
+
+Profiles keep the free-text primary_location they typed, but also link
+to a Place, so filtering by location is an integer match on
+card_place_active_idx rather than an icontains scan. Every spelling
+of a place (its name plus gazetteer aliases) is a PlaceName row holding
+the normalized text: lower case, accents folded, punctuation collapsed
+to single spaces. Each normalized name belongs to one place. resolve() maps typed text to a place by exact
+normalized name, creating a place when nothing matches; suggest() serves
+autocomplete off the prefix index on PlaceName.name.
+
+Places come from the offline gazetteer (load_places command, default
+main/data/places.tsv) and from the locations members have typed.
+"""
+import csv
+import re
+import unicodedata
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from . import cards
+from .models import LifestyleProfile, Place, PlaceName
+
+GAZETTEER = Path(__file__).resolve().parent / 'data' / 'places.tsv'
+MIN_PREFIX = 2
+SUGGESTION_FIELDS = ('id', 'name', 'country', 'latitude', 'longitude')
+
+_separators = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """'  São Paulo,  BR ' -> 'sao paulo br'"""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return _separators.sub(' ', folded).strip()
+
+
+def resolve(text):
+    """Id of the place ``text`` names, created if unknown; None for blank text"""
+    key = normalize(text)
+    if not key:
+        return None
+    found = PlaceName.objects.filter(name=key).values_list('place_id', flat=True).first()
+    if found:
+        return found
+    try:
+        with transaction.atomic():
+            place = Place.objects.create(name=' '.join(text.split()))
+            PlaceName.objects.create(place=place, name=key)
+    except IntegrityError:
+        # Someone else saved the same new location first
+        return PlaceName.objects.get(name=key).place_id
+    return place.pk
+
+
+def matching(text):
+    """Ids (as a subquery) of places with a name starting with ``text``"""
+    key = normalize(text)
+    if len(key) < MIN_PREFIX:
+        # Too short to be a prefix: '' would match every place
+        return PlaceName.objects.filter(name=key).values('place_id')
+    return PlaceName.objects.filter(name__startswith=key).values('place_id')
+
+
+def suggest(text, limit=10):
+    """Autocomplete: the most populous places with a name starting with ``text``"""
+    key = normalize(text)
+    if len(key) < MIN_PREFIX:
+        return []
+
+    def lookup():
+        return list(
+            Place.objects.filter(names__name__startswith=key).distinct()
+            .order_by('-population', 'name').values(*SUGGESTION_FIELDS)[:limit]
+        )
+    # Short prefixes are few and shared by everyone typing
+    return cache.get_or_set(f'places:{limit}:{key}', lookup, settings.PLACE_SUGGESTION_CACHE_SECONDS)
+
+
+def read_gazetteer(path=GAZETTEER):
+    """
+    Rows of a tab-separated gazetteer: name, country, latitude, longitude,
+    population, then aliases separated by '|'. Lines starting with # are
+    comments.
+    """
+    with open(path, newline='', encoding='utf-8') as fh:
+        for row in csv.reader(fh, delimiter='\t'):
+            if not row or row[0].startswith('#'):
+                continue
+            name, country, latitude, longitude, population, *rest = row
+            yield {
+                'name': name.strip(),
+                'country': country.strip(),
+                'latitude': float(latitude),
+                'longitude': float(longitude),
+                'population': int(population or 0),
+                'aliases': [alias for alias in (rest[0].split('|') if rest else []) if alias.strip()],
+            }
+
+
+def load_gazetteer(path=GAZETTEER, batch_size=1000):
+    """Add or update the gazetteer's places and their names; returns (created, updated)"""
+    created = updated = 0
+    rows = list(read_gazetteer(path))
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        with transaction.atomic():
+            existing = dict(
+                PlaceName.objects.filter(name__in=[normalize(row['name']) for row in batch])
+                .values_list('name', 'place_id')
+            )
+            names = []
+            for row in batch:
+                fields = {key: row[key] for key in ('name', 'country', 'latitude', 'longitude', 'population')}
+                place_id = existing.get(normalize(row['name']))
+                if place_id:
+                    Place.objects.filter(pk=place_id).update(**fields)
+                    updated += 1
+                else:
+                    place_id = existing[normalize(row['name'])] = Place.objects.create(**fields).pk
+                    created += 1
+                names.extend(
+                    PlaceName(place_id=place_id, name=key)
+                    for key in {normalize(text) for text in [row['name'], *row['aliases']]} if key
+                )
+            PlaceName.objects.bulk_create(names, ignore_conflicts=True)
+    return created, updated
+
+
+def link_profiles(queryset=None):
+    """Point unlinked profiles at the place their primary_location names; returns how many were linked"""
+    queryset = LifestyleProfile.objects.all() if queryset is None else queryset
+    unlinked = queryset.filter(place__isnull=True).exclude(primary_location='')
+    linked = 0
+    for location in unlinked.order_by().values_list('primary_location', flat=True).distinct():
+        place_id = resolve(location)
+        if place_id:
+            ids = list(unlinked.filter(primary_location=location).values_list('pk', flat=True))
+            linked += LifestyleProfile.objects.filter(pk__in=ids).update(place_id=place_id)
+            cards.sync(ids)
+    return linked
@@ -0,0 +1,61 @@
+# main/presence.py
+"""
+Who is online, from heartbeats in the shared cache.
+
+Every authenticated request sets the member's bit (offset = user id) in
+the bitset for the current minute; a member is online if their bit is set
+in any of the last PRESENCE_WINDOW_MINUTES minutes. A bitset costs one
+bit per user id, so a million members fit in 125KB a minute, and each
+minute's key expires on its own once it leaves the window.
+
+online() checks a page of cards by reading just their bits, in a single
+cache round trip. Heartbeats also write last_active to the profile and
+its card, at most once per window per member, so an online member's card
+always has last_active within the last two windows: online_rows() reads
+just those cards for the search filter and keeps the ones online.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import LifestyleProfile, PortfolioCard
+from .routers import untracked_writes
+
+
+def _cache():
+    return caches[settings.PRESENCE_CACHE_ALIAS]
+
+
+def _minute_keys(now=None):
+    minute = int((time.time() if now is None else now) // 60)
+    return [f'presence:{minute - i}' for i in range(settings.PRESENCE_WINDOW_MINUTES)]
+
+
+def heartbeat(user_id, now=None):
+    """Mark ``user_id`` as seen this minute; refreshes last_active once per window"""
+    cache = _cache()
+    window = settings.PRESENCE_WINDOW_MINUTES * 60
+    cache.setbit(_minute_keys(now)[0], user_id, window + 60)
+    if cache.add(f'presence:active:{user_id}', 1, window):
+        seen = datetime.fromtimestamp(time.time() if now is None else now, tz=timezone.utc)
+        # Activity bookkeeping shouldn't pin the member's reads to the primary
+        with untracked_writes():
+            LifestyleProfile.objects.filter(user_id=user_id).update(last_active=seen)
+            PortfolioCard.objects.filter(user_id=user_id).update(last_active=seen)
+
+
+def online(user_ids, now=None):
+    """The subset of ``user_ids`` seen within the window"""
+    return _cache().any_bits(_minute_keys(now), list(user_ids))
+
+
+def online_rows(queryset, now=None):
+    """The rows of ``queryset`` (cards, already ordered) whose member is online, in order"""
+    since = datetime.fromtimestamp(time.time() if now is None else now, tz=timezone.utc) - timedelta(
+        minutes=2 * settings.PRESENCE_WINDOW_MINUTES,
+    )
+    rows = list(queryset.filter(last_active__gte=since))
+    found = online((row.user_id for row in rows), now)
+    return [row for row in rows if row.user_id in found]
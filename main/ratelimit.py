@@ -0,0 +1,109 @@
+# main/ratelimit.py
+"""
+Per-view rate limiting on shared cache counters.
+
+Each client gets one counter per fixed window, and the limit is checked
+against a sliding-window estimate:
+
+    previous window's hits * (share of it still inside the sliding window)
+    + current window's hits
+
+To keep that at a single cache round trip, the previous window's total is
+folded into the current counter when the window opens (high bits), so one
+incr() returns both numbers. Opening a window costs one extra get/add per
+client per window.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from . import metrics
+
+SHIFT = 1 << 32
+UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'30/m' -> (30, 60)"""
+    count, _, period = rate.partition('/')
+    return int(count), UNITS[period]
+
+
+def client_ip(request):
+    """REMOTE_ADDR, or the address our RATELIMIT_PROXY_COUNT proxies saw"""
+    proxies = settings.RATELIMIT_PROXY_COUNT
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        return hops[-min(proxies, len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def client_key(request, key):
+    if key == 'user' and request.user.is_authenticated:
+        return f'u{request.user.pk}'
+    return f'ip{client_ip(request)}'
+
+
+def hit(scope, ident, limit, window, now=None):
+    """
+    Count one request; returns 0 when allowed, otherwise the seconds until
+    the sliding-window estimate drops back under ``limit``.
+    """
+    cache = caches[settings.RATELIMIT_CACHE_ALIAS]
+    now = time.time() if now is None else now
+    index = int(now // window)
+    key = f'rl:{scope}:{ident}:{index}'
+    try:
+        value = cache.incr(key)
+    except ValueError:
+        previous = cache.get(f'rl:{scope}:{ident}:{index - 1}', 0) % SHIFT
+        value = previous * SHIFT + 1
+        # Kept into the next window, which reads it as its "previous"
+        if not cache.add(key, value, 2 * window):
+            value = cache.incr(key)
+
+    previous, current = divmod(value, SHIFT)
+    elapsed = now - index * window
+    if previous * (1 - elapsed / window) + current <= limit:
+        return 0
+    if current >= limit or not previous:
+        return math.ceil(window - elapsed)
+    # When the previous window's weight has decayed enough
+    return max(1, math.ceil(window * (1 - (limit - current) / previous) - elapsed))
+
+
+def too_many_requests(request, scope, rate, key='user'):
+    """Count this request against ``scope``; a 429 response once over the limit, else None"""
+    if not settings.RATELIMIT_ENABLED:
+        return None
+    limit, window = parse_rate(settings.RATELIMIT_RATES.get(scope, rate))
+    retry_after = hit(scope, client_key(request, key), limit, window)
+    if not retry_after:
+        return None
+    metrics.RATE_LIMITED.inc((scope,))
+    response = HttpResponse('Too many requests. Please slow down.', status=429, content_type='text/plain')
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def ratelimit(scope, rate, key='user', methods=None):
+    """
+    Limit a view to ``rate`` ('<count>/<s|m|h|d>') per user ('user', falling
+    back to IP for anonymous visitors) or per 'ip'. RATELIMIT_RATES can
+    override the rate of any scope. Only ``methods`` are counted (default: all).
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if methods is None or request.method in methods:
+                rejected = too_many_requests(request, scope, rate, key)
+                if rejected:
+                    return rejected
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,209 @@
+# main/recommendations.py
+"""
+Compatibility recommendations.
+
+Every member is scored against every eligible portfolio in NumPy blocks
+and the best TOP_K are stored in RecommendationList, so the dashboard
+reads a ready-made list instead of scoring per request. Lists are
+refreshed incrementally by build_recommendations: only profiles changed
+since the previous run are rescored in full, and those same profiles are
+merged into (or dropped from) everyone else's list. Members beyond a
+list's TOP_K are not kept, so run with --full now and then to refill the
+tail of lists where a changed candidate dropped out or fell back.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import (
+    GENDER_CHOICES, GENDER_INTEREST_CHOICES, LIFESTYLE_PREFERENCE_CHOICES, NET_WORTH_CHOICES,
+    LifestyleProfile, RecommendationList,
+)
+
+TOP_K = 120  # ten dashboard pages
+WEIGHTS = {
+    'lifestyle': 0.30,
+    'engagements': 0.30,
+    'qualities': 0.20,
+    'financial': 0.20,
+}
+
+GENDERS = [value for value, _ in GENDER_CHOICES]
+PREFERENCES = [value for value, _ in GENDER_INTEREST_CHOICES]
+LIFESTYLES = [value for value, _ in LIFESTYLE_PREFERENCE_CHOICES]
+NET_WORTH = [value for value, _ in NET_WORTH_CHOICES]
+
+# ACCEPTS[preference, gender]; the last gender column is "not given"
+ACCEPTS = np.zeros((len(PREFERENCES), len(GENDERS) + 1), dtype=bool)
+for _p, _preference in enumerate(PREFERENCES):
+    ACCEPTS[_p] = [_preference in ('Both', gender) for gender in GENDERS + ['']]
+
+
+def eligible_portfolios():
+    """Portfolios that may be shown to other members"""
+    return LifestyleProfile.objects.filter(curator_approved=True, public_portfolio=True, portfolio_suspended=False)
+
+
+def _codes(values, choices, missing=-1):
+    index = {value: i for i, value in enumerate(choices)}
+    return np.array([index.get(value, missing) for value in values], dtype=np.int16)
+
+
+def _multi_hot(lists):
+    vocabulary = {}
+    rows, cols = [], []
+    for row, values in enumerate(lists):
+        for value in set(values if isinstance(values, list) else []):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(value, len(vocabulary)))
+    matrix = np.zeros((len(lists), max(len(vocabulary), 1)), dtype=np.float32)
+    matrix[rows, cols] = 1
+    return matrix
+
+
+class ProfileMatrix:
+    """Column-wise encoding of every profile's matching attributes"""
+
+    FIELDS = (
+        'id', 'gender', 'gender_preference', 'lifestyle_preference', 'financial_capacity',
+        'preferred_engagements', 'appreciates_qualities', 'last_updated',
+        'curator_approved', 'public_portfolio', 'portfolio_suspended',
+    )
+
+    def __init__(self, rows):
+        columns = list(zip(*rows)) if rows else [()] * len(self.FIELDS)
+        data = dict(zip(self.FIELDS, columns))
+        self.ids = np.array(data['id'], dtype=np.int64)
+        self.last_updated = list(data['last_updated'])
+        self.gender = _codes(data['gender'], GENDERS, missing=len(GENDERS))
+        self.preference = _codes(data['gender_preference'], PREFERENCES, missing=PREFERENCES.index('Both'))
+        self.lifestyle = _codes(data['lifestyle_preference'], LIFESTYLES)
+        self.net_worth = _codes(data['financial_capacity'], NET_WORTH)
+        self.engagements = _multi_hot(data['preferred_engagements'])
+        self.qualities = _multi_hot(data['appreciates_qualities'])
+        self.eligible = np.array(
+            [a and p and not s for a, p, s in zip(
+                data['curator_approved'], data['public_portfolio'], data['portfolio_suspended'])],
+            dtype=bool,
+        )
+
+    @classmethod
+    def load(cls):
+        return cls(list(LifestyleProfile.objects.order_by('id').values_list(*cls.FIELDS)))
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _jaccard(matrix, viewers, candidates):
+        a, b = matrix[viewers], matrix[candidates]
+        shared = a @ b.T
+        union = a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :] - shared
+        return np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+    def scores(self, viewers, candidates):
+        """(len(viewers), len(candidates)) compatibility; -inf where not a match"""
+        v, c = viewers[:, None], candidates[None, :]
+
+        lifestyle = (self.lifestyle[v] == self.lifestyle[c]) & (self.lifestyle[v] >= 0)
+        known = (self.net_worth[v] >= 0) & (self.net_worth[c] >= 0)
+        distance = np.abs(self.net_worth[v] - self.net_worth[c]) / (len(NET_WORTH) - 1)
+        score = (
+            WEIGHTS['lifestyle'] * lifestyle
+            + WEIGHTS['financial'] * np.where(known, 1 - distance, 0)
+            + WEIGHTS['engagements'] * self._jaccard(self.engagements, viewers, candidates)
+            + WEIGHTS['qualities'] * self._jaccard(self.qualities, viewers, candidates)
+        ).astype(np.float32)
+
+        mutual = ACCEPTS[self.preference[v], self.gender[c]] & ACCEPTS[self.preference[c], self.gender[v]]
+        score[~mutual | ~self.eligible[c] | (v == c)] = -np.inf
+        return score
+
+
+def top_k(ids, scores, k):
+    """Best ``k`` (id, score) pairs of one score row, best first, ties by lowest id"""
+    scores = np.round(scores, 4)
+    if len(scores) > k:
+        # Everything tied with the k-th best, so the tie-break below decides
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        keep = np.flatnonzero(scores >= threshold)
+    else:
+        keep = np.arange(len(scores))
+    keep = keep[np.isfinite(scores[keep])]
+    keep = keep[np.lexsort((ids[keep], -scores[keep]))][:k]
+    return ids[keep].tolist(), scores[keep].tolist()
+
+
+def _save(lists, computed_at):
+    RecommendationList.objects.bulk_create(
+        [RecommendationList(profile_id=pid, candidates=c, scores=s, computed_at=computed_at)
+         for pid, (c, s) in lists.items()],
+        update_conflicts=True,
+        unique_fields=['profile'],
+        update_fields=['candidates', 'scores', 'computed_at'],
+    )
+
+
+def build(full=False, k=TOP_K, batch_size=128, log=None):
+    """
+    Refresh recommendation lists. Returns (lists rescored in full, lists
+    updated by merging changed profiles).
+    """
+    started = timezone.now()
+    matrix = ProfileMatrix.load()
+    everyone = np.arange(len(matrix))
+
+    if full:
+        stale = everyone
+    else:
+        since = RecommendationList.objects.aggregate(latest=Max('computed_at'))['latest']
+        has_list = set(RecommendationList.objects.values_list('profile_id', flat=True))
+        stale = np.array([
+            i for i, pid in enumerate(matrix.ids.tolist())
+            if pid not in has_list or (since and matrix.last_updated[i] and matrix.last_updated[i] > since)
+        ], dtype=np.int64)
+
+    # Changed members get a fresh ranking over every eligible portfolio
+    candidates = everyone[matrix.eligible]
+    for offset in range(0, len(stale), batch_size):
+        viewers = stale[offset:offset + batch_size]
+        block = matrix.scores(viewers, candidates)
+        with transaction.atomic():
+            _save({int(matrix.ids[v]): top_k(matrix.ids[candidates], row, k)
+                   for v, row in zip(viewers, block)}, started)
+        if log:
+            log(f'  scored {offset + len(viewers)}/{len(stale)} members')
+
+    if full or not len(stale):
+        return len(stale), 0
+
+    # Everyone else only needs the changed profiles merged into their list
+    changed_ids = set(matrix.ids[stale].tolist())
+    others = np.setdiff1d(everyone, stale)
+    merged = 0
+    for offset in range(0, len(others), batch_size):
+        viewers = others[offset:offset + batch_size]
+        block = matrix.scores(viewers, stale)
+        existing = RecommendationList.objects.in_bulk(matrix.ids[viewers].tolist(), field_name='profile_id')
+        updates = {}
+        for v, row in zip(viewers, block):
+            current = existing.get(int(matrix.ids[v]))
+            if current is None:
+                continue
+            pool = {pid: s for pid, s in zip(current.candidates, current.scores) if pid not in changed_ids}
+            pool.update((int(pid), float(s)) for pid, s in zip(matrix.ids[stale], row) if np.isfinite(s))
+            ids = np.fromiter(pool, dtype=np.int64, count=len(pool))
+            ranked = top_k(ids, np.fromiter(pool.values(), dtype=np.float32, count=len(pool)), k)
+            if ranked[0] != current.candidates:
+                updates[current.profile_id] = ranked
+        if updates:
+            with transaction.atomic():
+                _save(updates, started)
+            merged += len(updates)
+    return len(stale), merged
+
+
+def recommended_ids(profile):
+    """Stored ranking for ``profile`` or None when it hasn't been computed yet"""
+    return RecommendationList.objects.filter(profile=profile).values_list('candidates', flat=True).first()
@@ -0,0 +1,106 @@
+# main/routers.py
+"""Database routing between the primary and its read replicas."""
+import asyncio
+import contextvars
+import random
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+# Set while a replica-safe view (feed, search, portfolio) is running
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+# Set for clients that wrote recently, so they read their own writes
+_pinned_to_primary = contextvars.ContextVar('pinned_to_primary', default=False)
+# Set while writes should not count towards pinning (view counters etc.)
+_untracked_writes = contextvars.ContextVar('untracked_writes', default=False)
+
+
+@contextmanager
+def read_from_replicas():
+    """Route reads inside this block to a replica when one is configured"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def pinned_to_primary(pinned=True):
+    """Keep every read inside this block on the primary"""
+    token = _pinned_to_primary.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+@contextmanager
+def untracked_writes():
+    """Bookkeeping writes in this block don't pin the client to the primary"""
+    token = _untracked_writes.set(True)
+    try:
+        yield
+    finally:
+        _untracked_writes.reset(token)
+
+
+class WriteTracker:
+    """Execute wrapper noting whether a data-changing statement reached the primary"""
+
+    def __init__(self):
+        self.wrote = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.wrote and not _untracked_writes.get():
+            self.wrote = sql.lstrip()[:6].upper() in WRITE_STATEMENTS
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def track_writes():
+    """Yield a WriteTracker watching the primary connection for this block"""
+    tracker = WriteTracker()
+    with connections['default'].execute_wrapper(tracker):
+        yield tracker
+
+
+def replica_reads(view_func):
+    """View decorator: the view's reads may be served by a replica"""
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            with read_from_replicas():
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with read_from_replicas():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes always go to 'default'. Reads go to a random replica only inside
+    read_from_replicas(), and never for clients pinned to the primary, so
+    code that reads back its own writes keeps seeing the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if replicas and _replica_reads.get() and not _pinned_to_primary.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
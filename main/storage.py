@@ -0,0 +1,43 @@
+# main/storage.py
+"""Static file storage used by the production asset build."""
+import re
+
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Strings are matched first so comments and whitespace inside them survive
+_CSS_STRING_OR_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_CSS_STRING_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+_CSS_WHITESPACE_RE = re.compile(r'\s+')
+_CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = _CSS_STRING_OR_COMMENT_RE.sub(lambda m: m.group(1) or '', css)
+    parts = _CSS_STRING_RE.split(css)
+    for i in range(0, len(parts), 2):  # even indexes are outside string literals
+        chunk = _CSS_WHITESPACE_RE.sub(' ', parts[i])
+        chunk = _CSS_PUNCTUATION_RE.sub(r'\1', chunk)
+        parts[i] = _CSS_COLON_RE.sub(':', chunk).replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+class MinifiedCompressedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    WhiteNoise manifest storage that minifies CSS before it is fingerprinted.
+
+    collectstatic saves every file through ``_save``, so the hashed copies and
+    the ``.gz``/``.br`` variants WhiteNoise precompresses are all built from
+    the minified source.
+    """
+
+    def _save(self, name, content):
+        if name.endswith('.css'):
+            content.seek(0)  # the manifest pass has already read it to compute the hash
+            data = content.read()
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            content = ContentFile(minify_css(data).encode('utf-8'))
+        return super()._save(name, content)
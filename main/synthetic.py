@@ -0,0 +1,235 @@
+# main/synthetic.py
+"""Synthetic member data for benchmarks and load tests."""
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import cards, places
+from .models import (
+    BODY_TYPE_CHOICES, CHILDREN_CHOICES, HEIGHT_CHOICES, LIFESTYLE_PREFERENCE_CHOICES,
+    NET_WORTH_CHOICES, PERIOD_CHOICES, RELATIONSHIP_CHOICES, SMOKER_CHOICES,
+    CuratedIntroduction, DiscreetMessage, ExclusiveExperience, GalleryAccessRequest, LifestyleProfile,
+)
+
+SYNTHETIC_PREFIX = 'synth_'
+SYNTHETIC_PASSWORD = 'synthetic-Member-2025'
+
+CITIES = [
+    ('New York, NY', 14), ('Los Angeles, CA', 10), ('Miami, FL', 8), ('Chicago, IL', 6),
+    ('London, UK', 8), ('Dubai, UAE', 5), ('Las Vegas, NV', 5), ('San Francisco, CA', 5),
+    ('Houston, TX', 4), ('Toronto, ON', 4), ('Paris, France', 4), ('Atlanta, GA', 3),
+    ('Boston, MA', 3), ('Dallas, TX', 3), ('Monaco', 2), ('Sydney, Australia', 2),
+    ('Seattle, WA', 2), ('Scottsdale, AZ', 2), ('Austin, TX', 2), ('Denver, CO', 2),
+]
+ENGAGEMENTS = ['fine_dining', 'travel', 'galas', 'yachting', 'art_events', 'wellness_retreats', 'nightlife']
+QUALITIES = ['discretion', 'ambition', 'humour', 'elegance', 'intellect', 'generosity', 'adventure']
+VENUES = ['The Ritz', 'Nobu', 'Le Bernardin', 'Private Yacht', 'Soho House', 'Four Seasons', 'Aman']
+SENTENCES = [
+    'Looking forward to our evening.', 'That sounds wonderful.', 'Are you free this weekend?',
+    'I loved the gallery you mentioned.', 'Let us plan something discreet.', 'Thank you for a lovely time.',
+    'I will be travelling next week.', 'Dinner at eight works perfectly.',
+]
+
+# (value, weight)
+TIERS = [('standard', 80), ('premium', 15), ('exclusive', 5)]
+NET_WORTH_WEIGHTS = [30, 25, 18, 13, 9, 5]
+
+
+def _weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+def _geometric(rng, mean, cap):
+    """Small non-negative counts with a long tail"""
+    return min(int(rng.expovariate(1 / mean)), cap)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk inserts set auto_now/auto_now_add fields to historical values"""
+    fields = [
+        f for model in models for f in model._meta.concrete_fields
+        if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)
+    ]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def _profile(rng, user, now):
+    gender = rng.choices(['Male', 'Female', 'Other'], [48, 48, 4])[0]
+    opposite = {'Male': 'Female', 'Female': 'Male'}.get(gender, 'Both')
+    approved = rng.random() < 0.75
+    age_days = int(365.25 * min(21 + rng.expovariate(1 / 12), 75))
+    return LifestyleProfile(
+        user=user,
+        preferred_name=user.username.replace(SYNTHETIC_PREFIX, 'Member '),
+        gender=gender,
+        gender_preference=opposite if rng.random() < 0.85 else 'Both',
+        date_of_birth=now.date() - timedelta(days=age_days),
+        primary_location=_weighted(rng, CITIES),
+        personal_statement=' '.join(rng.sample(SENTENCES, 2)),
+        lifestyle_preference=rng.choice(LIFESTYLE_PREFERENCE_CHOICES)[0],
+        current_engagement=rng.choice(RELATIONSHIP_CHOICES)[0],
+        physique=rng.choice(BODY_TYPE_CHOICES)[0],
+        family_considerations=rng.choice(CHILDREN_CHOICES)[0],
+        lifestyle_habits=rng.choice(SMOKER_CHOICES)[0],
+        stature=rng.choice(HEIGHT_CHOICES[1:])[0],
+        financial_capacity=rng.choices([c[0] for c in NET_WORTH_CHOICES], NET_WORTH_WEIGHTS)[0],
+        personal_philosophy=' '.join(rng.choices(SENTENCES, k=4)),
+        seeking_qualities=' '.join(rng.choices(SENTENCES, k=2)),
+        preferred_engagements=rng.sample(ENGAGEMENTS, rng.randint(1, 3)),
+        appreciates_qualities=rng.sample(QUALITIES, rng.randint(1, 3)),
+        consideration_period=rng.choice(PERIOD_CHOICES)[0],
+        engagement_tier=_weighted(rng, TIERS),
+        portfolio_suspended=rng.random() < 0.02,
+        curator_approved=approved,
+        under_review=not approved,
+        public_portfolio=rng.random() < 0.85,
+        # Activity is heavily skewed towards the last few days
+        last_active=now - timedelta(hours=rng.expovariate(1 / 72)),
+        view_count=int(rng.paretovariate(1.5) * 5),
+        portfolio_created=now - timedelta(days=rng.randint(1, 900)),
+        last_updated=now - timedelta(days=rng.randint(0, 60)),
+    )
+
+
+def generate(count, seed=0, batch_size=1000, log=None):
+    """
+    Create ``count`` synthetic members with portfolios, conversations,
+    gallery requests and experiences. Returns the number of rows per model.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(SYNTHETIC_PASSWORD)
+    start = User.objects.filter(username__startswith=SYNTHETIC_PREFIX).count()
+    totals = dict.fromkeys(['users', 'introductions', 'messages', 'gallery_requests', 'experiences'], 0)
+
+    user_ids = list(User.objects.filter(username__startswith=SYNTHETIC_PREFIX).values_list('id', flat=True))
+    with explicit_timestamps(LifestyleProfile, CuratedIntroduction, DiscreetMessage,
+                             ExclusiveExperience, GalleryAccessRequest):
+        for offset in range(0, count, batch_size):
+            size = min(batch_size, count - offset)
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(
+                        username=f'{SYNTHETIC_PREFIX}{start + offset + i:07d}',
+                        email=f'{SYNTHETIC_PREFIX}{start + offset + i:07d}@example.com',
+                        password=password,
+                        date_joined=now - timedelta(days=rng.randint(1, 900)),
+                    )
+                    for i in range(size)
+                ])
+                profiles = LifestyleProfile.objects.bulk_create([_profile(rng, user, now) for user in users])
+                cards.sync(profile.pk for profile in profiles)
+                user_ids.extend(user.pk for user in users)
+
+                totals['users'] += len(users)
+                for key, created in _generate_activity(rng, now, users, user_ids).items():
+                    totals[key] += created
+            if log:
+                log(f'  {offset + size}/{count} members')
+    places.link_profiles(LifestyleProfile.objects.filter(user__username__startswith=SYNTHETIC_PREFIX))
+    return totals
+
+
+def _generate_activity(rng, now, users, user_ids):
+    """Conversations, gallery requests and experiences for one batch of new users"""
+    intros, pairs = [], []
+    for user in users:
+        for _ in range(_geometric(rng, 2, 20)):
+            other = rng.choice(user_ids)
+            if other != user.pk:
+                started = now - timedelta(days=rng.expovariate(1 / 30))
+                intros.append(CuratedIntroduction(introduction_initiated=started, last_interaction=started))
+                pairs.append((user.pk, other))
+    CuratedIntroduction.objects.bulk_create(intros)
+
+    through = CuratedIntroduction.participants.through
+    through.objects.bulk_create([
+        through(curatedintroduction_id=intro.pk, user_id=uid)
+        for intro, pair in zip(intros, pairs) for uid in pair
+    ])
+
+    messages = []
+    for intro, pair in zip(intros, pairs):
+        sent = intro.introduction_initiated
+        for _ in range(1 + _geometric(rng, 8, 200)):
+            sent += timedelta(minutes=rng.expovariate(1 / 240))
+            messages.append(DiscreetMessage(
+                introduction=intro,
+                sender_id=rng.choice(pair),
+                content=rng.choice(SENTENCES),
+                is_read=sent < now - timedelta(hours=12) or rng.random() < 0.5,
+                exchanged_at=min(sent, now),
+            ))
+    DiscreetMessage.objects.bulk_create(messages)
+
+    # Point each introduction at its newest message
+    latest = {}
+    for message in messages:
+        latest[message.introduction_id] = message
+    for intro in intros:
+        intro.last_exchange = latest.get(intro.pk)
+        intro.last_interaction = intro.last_exchange.exchanged_at if intro.last_exchange else intro.last_interaction
+    CuratedIntroduction.objects.bulk_update(intros, ['last_exchange', 'last_interaction'])
+
+    requests = {}
+    for user in users:
+        for _ in range(_geometric(rng, 1.5, 15)):
+            owner = rng.choice(user_ids)
+            if owner != user.pk:
+                requests[(user.pk, owner)] = GalleryAccessRequest(
+                    requester_id=user.pk,
+                    gallery_owner_id=owner,
+                    access_status=rng.choices(
+                        ['pending_review', 'access_granted', 'access_declined'], [50, 35, 15])[0],
+                    requested_at=now - timedelta(days=rng.expovariate(1 / 20)),
+                )
+    GalleryAccessRequest.objects.bulk_create(requests.values(), ignore_conflicts=True)
+
+    experiences = []
+    for user in users:
+        # Most members never host; hosts list a handful, mostly in the past
+        if rng.random() < 0.1:
+            for _ in range(1 + _geometric(rng, 3, 30)):
+                day = now.date() + timedelta(days=rng.randint(-720, 90))
+                hour = rng.randint(17, 21)
+                experiences.append(ExclusiveExperience(
+                    host=user,
+                    experience_title=f'{rng.choice(ENGAGEMENTS).replace("_", " ").title()} evening',
+                    venue=rng.choice(VENUES),
+                    experience_date=day,
+                    commencement=time(hour),
+                    conclusion=time(hour + 2),
+                    experience_description=' '.join(rng.sample(SENTENCES, 3)),
+                    consideration=rng.choice([None, 250, 500, 1000, 2500]),
+                    consideration_type=rng.choice(['hosted_experience', 'seeking_participant']),
+                    is_active=day >= now.date(),
+                    listed_at=timezone.make_aware(datetime.combine(day - timedelta(days=rng.randint(1, 30)), time(12))),
+                ))
+    ExclusiveExperience.objects.bulk_create(experiences)
+
+    return {
+        'introductions': len(intros),
+        'messages': len(messages),
+        'gallery_requests': len(requests),
+        'experiences': len(experiences),
+    }
+
+
+def clear():
+    """Delete every synthetic member (related rows cascade)"""
+    deleted, _ = User.objects.filter(username__startswith=SYNTHETIC_PREFIX).delete()
+    return deleted
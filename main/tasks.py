@@ -0,0 +1,58 @@
+# main/tasks.py
+"""
+Background job tasks (queued with jobs.enqueue, run by `manage.py runworker`).
+
+Periodic maintenance (rollups, digests, expiry, partitions, archiving) isn't
+here: it runs from cron through its management command.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from . import accounts, cards, exports, jobs
+from .jobs import task
+from .mail import delivery_connection, deserialize
+from .models import LifestyleProfile
+
+THUMBNAIL_SIZE = (400, 400)
+
+
+@task(max_attempts=8)
+def send_email(message):
+    """Deliver a message queued by QueuedEmailBackend"""
+    delivery_connection().send_messages([deserialize(message)])
+
+
+@task()
+def make_portfolio_thumbnail(profile_id):
+    """Card-sized JPEG of the portfolio image"""
+    profile = LifestyleProfile.objects.filter(pk=profile_id).first()
+    if profile is None or not profile.portfolio_image:
+        return
+    with profile.portfolio_image.open('rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.thumbnail(THUMBNAIL_SIZE)
+        output = BytesIO()
+        image.convert('RGB').save(output, 'JPEG', quality=82, optimize=True, progressive=True)
+
+    name = os.path.splitext(os.path.basename(profile.portfolio_image.name))[0] + '.jpg'
+    if profile.portfolio_thumbnail:
+        profile.portfolio_thumbnail.delete(save=False)
+    profile.portfolio_thumbnail.save(name, ContentFile(output.getvalue()), save=False)
+    # Only touch the thumbnail column; the member may be editing the rest
+    LifestyleProfile.objects.filter(pk=profile_id).update(portfolio_thumbnail=profile.portfolio_thumbnail.name)
+    cards.sync([profile_id])
+
+
+@task(max_attempts=10)
+def purge_account(deletion_id):
+    """Purge a closed account's data; continues in a fresh job when its time runs out"""
+    if not accounts.purge(deletion_id):
+        jobs.enqueue(purge_account, priority=jobs.PRIORITY_LOW, deletion_id=deletion_id)
+
+
+@task(max_attempts=3)
+def build_data_export(export_id):
+    exports.build(export_id)
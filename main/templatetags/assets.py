@@ -0,0 +1,97 @@
+# main/templatetags/assets.py
+"""Template tags for the static asset pipeline (inlined critical CSS, self-hosted fonts)."""
+import functools
+import posixpath
+import re
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+FONTS_STYLESHEET = 'css/fonts.css'
+
+# Used until `manage.py fetch_fonts` has written the self-hosted copies;
+# production builds run it from collectstatic
+GOOGLE_FONTS_URL = (
+    'https://fonts.googleapis.com/css2?family=Cinzel:wght@400;600'
+    '&family=Space+Grotesk:wght@300;400;600&display=swap'
+)
+
+_FONT_URL_RE = re.compile(r'url\(\s*[\'"]?([^\'")]+\.woff2)[\'"]?\s*\)')
+
+
+def _read_source(path):
+    """Read a static file from the app/project static dirs"""
+    found = finders.find(path)
+    if not found:
+        return None
+    with open(found, encoding='utf-8') as fh:
+        return fh.read()
+
+
+def _read_built(path):
+    """Read a static file, preferring the minified copy from the collected build"""
+    if not settings.DEBUG and staticfiles_storage.exists(path):
+        with staticfiles_storage.open(path) as fh:
+            return fh.read().decode('utf-8')
+    return _read_source(path)
+
+
+_read_built_cached = functools.lru_cache(maxsize=32)(_read_built)
+
+
+def read_static(path):
+    """Static file contents; cached per process outside DEBUG"""
+    if settings.DEBUG:
+        return _read_built(path)
+    return _read_built_cached(path)
+
+
+_fonts = None
+
+
+def self_hosted_fonts():
+    """
+    woff2 files referenced by the self-hosted font stylesheet, relative to
+    STATIC_ROOT, or None before `manage.py fetch_fonts` has run. Only a hit
+    is cached, so fonts fetched while the process runs are picked up.
+    """
+    global _fonts
+    if _fonts is None:
+        css = _read_source(FONTS_STYLESHEET)
+        if css is None:
+            return None
+        base = posixpath.dirname(FONTS_STYLESHEET)
+        _fonts = [posixpath.normpath(posixpath.join(base, url)) for url in _FONT_URL_RE.findall(css)]
+    return _fonts
+
+
+@register.simple_tag
+def inline_static(path):
+    """Inline a static file (e.g. a critical CSS block) into the page"""
+    return mark_safe(read_static(path) or '')
+
+
+@register.simple_tag
+def font_links():
+    """Preload + stylesheet links for self-hosted fonts, falling back to Google Fonts"""
+    fonts = self_hosted_fonts()
+    if fonts is None:
+        return format_html(
+            '<link rel="preconnect" href="https://fonts.googleapis.com">\n'
+            '    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>\n'
+            '    <link href="{}" rel="stylesheet">',
+            GOOGLE_FONTS_URL,
+        )
+    preloads = format_html_join(
+        '\n    ',
+        '<link rel="preload" href="{}" as="font" type="font/woff2" crossorigin>',
+        ((static(font),) for font in fonts),
+    )
+    return format_html('{}\n    <link rel="stylesheet" href="{}">', preloads, static(FONTS_STYLESHEET))
@@ -1,3 +1,1034 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from datetime import time, timedelta
+from functools import partial
+from importlib import import_module
+from io import BytesIO, StringIO
+from time import sleep
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import LiveServerTestCase, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import accounts, archive, async_views, cards, engagements, events, exports, interests, jobs, loadtest, notifications, places, presence, ratelimit
+from .models import (
+    AccountDeletion, CuratedIntroduction, DataExport, DiscreetMessage, ExclusiveExperience, Interest, Job, LifestyleProfile, MessageArchive, Notification,
+    Place, PlaceName, PortfolioCard, ProfileEvent, ProfileEventDaily,
+)
+from .pagination import keyset_page
+from .recommendations import build, recommended_ids
+from .routers import PrimaryReplicaRouter, read_from_replicas
+from .storage import minify_css
+from .templatetags import assets
+from .synthetic import SYNTHETIC_PASSWORD
+
+
+def create_member(username, using='default', **profile_fields):
+    """User + approved public portfolio on one database"""
+    user = User.objects.db_manager(using).create_user(username, f'{username}@example.com', 'pw-Elite-2025')
+    LifestyleProfile.objects.using(using).create(
+        user=user, curator_approved=True, public_portfolio=True, **profile_fields
+    )
+    return user
+
+
+class StaticAssetTests(SimpleTestCase):
+    def test_minifier_keeps_strings_and_functions_intact(self):
+        self.assertEqual(
+            minify_css('/* header */\na > b ,  c {\n  color: red ;\n  margin: 0  auto;\n}\n'),
+            'a>b,c{color:red;margin:0 auto}',
+        )
+        # A space before a colon is a descendant combinator in a selector
+        self.assertEqual(minify_css('nav :hover { top: 0 }'), 'nav :hover{top:0}')
+        self.assertEqual(
+            minify_css('a::before { content: "/* kept */  ; { }"; }'),
+            'a::before{content:"/* kept */  ; { }"}',
+        )
+        self.assertEqual(minify_css("q { quotes: '\\'' ' x ' ; }"), "q{quotes:'\\'' ' x '}")
+        # Spaces around calc() operators are significant
+        self.assertEqual(
+            minify_css('div { width: calc( 100%  -  (2 * 10px) ); }'),
+            'div{width:calc( 100% - (2 * 10px) )}',
+        )
+        self.assertEqual(
+            minify_css('i { background: url("a b;c.png") , url(data:image/png;base64,AA==); }'),
+            'i{background:url("a b;c.png"),url(data:image/png;base64,AA==)}',
+        )
+
+    def test_collectstatic_writes_minified_fingerprinted_and_compressed_css(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root, STATICFILES_STORAGE='main.storage.MinifiedCompressedManifestStaticFilesStorage',
+        ):
+            call_command('collectstatic', interactive=False, verbosity=0, skip_fonts=True)
+            with open(os.path.join(root, 'staticfiles.json')) as fh:
+                hashed = json.load(fh)['paths']['css/styles.css']
+            self.assertNotEqual(hashed, 'css/styles.css')
+            with open(os.path.join(root, hashed), encoding='utf-8') as fh:
+                css = fh.read()
+            self.assertNotIn('/*', css)
+            self.assertNotIn('\n  ', css)
+            for suffix in ('.gz', '.br'):
+                self.assertTrue(os.path.exists(os.path.join(root, hashed + suffix)), suffix)
+
+    @patch('main.management.commands.collectstatic.self_hosted_fonts', return_value=None)
+    def test_production_collectstatic_fails_without_fonts(self, _):
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root, STATICFILES_STORAGE='main.storage.MinifiedCompressedManifestStaticFilesStorage',
+        ), patch('main.management.commands.fetch_fonts.Command.handle', return_value='') as fetch_fonts:
+            with self.assertRaisesMessage(CommandError, 'Self-hosted fonts are missing'):
+                call_command('collectstatic', interactive=False, verbosity=0)
+            fetch_fonts.assert_called_once()
+            self.assertEqual(os.listdir(root), [])
+
+    def test_fonts_fetched_after_startup_are_used(self):
+        css = "@font-face { src: url(../fonts/cinzel-latin.woff2) format('woff2'); }"
+        with patch.object(assets, '_fonts', None), patch.object(assets, '_read_source', side_effect=[None, css]):
+            self.assertIn('fonts.googleapis.com', assets.font_links())
+            self.assertIn('rel="preload" href="/static/fonts/cinzel-latin.woff2"', assets.font_links())
+
+
+# Two separate SQLite databases (test_replica is defined in settings/test.py):
+# rows created only on 'default' are invisible to reads routed to
+# 'test_replica', which makes the routing observable.
+@override_settings(DATABASE_REPLICAS=['test_replica'])
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', 'test_replica'}
+
+    def setUp(self):
+        self.alice = create_member('alice')
+        self.bob = create_member('bob')
+
+    def test_writes_go_to_primary_and_reads_follow_context(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_write(LifestyleProfile), 'default')
+        self.assertEqual(router.db_for_read(LifestyleProfile), 'default')
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(LifestyleProfile), 'test_replica')
+
+    def test_portfolio_reads_are_served_by_replica(self):
+        # alice only exists on the primary, so a replica read can't find her
+        response = self.client.get(reverse('view_portfolio', args=['alice']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_counter_does_not_pin(self):
+        create_member('carol', using='test_replica')
+        response = self.client.get(reverse('view_portfolio', args=['carol']))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_write_pins_reads_to_primary(self):
+        self.client.force_login(self.bob)
+        response = self.client.get(reverse('save_connection', args=[self.alice.pk]))
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        self.assertEqual(response.cookies[settings.REPLICA_PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        # Pinned: bob sees primary-only data
+        response = self.client.get(reverse('view_portfolio', args=['alice']))
+        self.assertEqual(response.status_code, 200)
+
+        # Once the pin expires, reads go back to the replica
+        del self.client.cookies[settings.REPLICA_PIN_COOKIE]
+        response = self.client.get(reverse('view_portfolio', args=['alice']))
+        self.assertEqual(response.status_code, 404)
+
+
+class PerformanceMetricsTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user('ops', 'ops@example.com', 'pw-Elite-2025', is_staff=True)
+
+    def scrape(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('performance_metrics'))
+        self.client.logout()
+        return response.content.decode()
+
+    def count(self, text, series):
+        for line in text.splitlines():
+            if line.startswith(series + ' '):
+                return float(line.split()[-1])
+        return 0
+
+    def test_requests_are_observed_per_view_and_method(self):
+        series = 'http_request_duration_seconds_count{view="register",method="GET"}'
+        before = self.count(self.scrape(), series)
+        self.client.get(reverse('register'))
+        text = self.scrape()
+        self.assertEqual(self.count(text, series), before + 1)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn('http_request_duration_seconds_bucket{view="register",method="GET",le="+Inf"}', text)
+        self.assertIn('db_queries_per_request_count{view="register"}', text)
+
+    def test_unknown_methods_share_one_label(self):
+        self.client.generic('BREW', reverse('register'))
+        self.client.generic('PROPFIND', reverse('register'))
+        text = self.scrape()
+        self.assertIn('{view="register",method="other"}', text)
+        self.assertNotIn('method="BREW"', text)
+        self.assertNotIn('method="PROPFIND"', text)
+
+    def test_server_timing_header_only_in_debug(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('register')))
+        with override_settings(DEBUG=True):
+            response = self.client.get(reverse('register'))
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"')
+
+    @override_settings(METRICS_BEARER_TOKEN='scrape-token')
+    def test_endpoint_needs_staff_or_bearer_token(self):
+        url = reverse('performance_metrics')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.client.force_login(create_member('alice'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.logout()
+
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE http_request_duration_seconds histogram', response.content.decode())
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class ExperienceFeedTests(TestCase):
+    def setUp(self):
+        self.host = create_member('host')
+        self.client.force_login(self.host)
+        today = timezone.localdate()
+        for offset in (-3, 1, 1, 2, 5):
+            ExclusiveExperience.objects.create(
+                host=self.host, experience_title=f'Day {offset}', venue='Nobu',
+                experience_date=today + timedelta(days=offset),
+                commencement=time(19), conclusion=time(21),
+                experience_description='Dinner', consideration_type='hosted_experience',
+            )
+
+    def test_feed_pages_upcoming_experiences_in_order(self):
+        seen, url = [], reverse('exclusive_experiences')
+        with patch('main.views.keyset_page', partial(keyset_page, page_size=2)):
+            while url:
+                page = self.client.get(url).context['experiences']
+                seen.extend(e.experience_title for e in page)
+                url = f'?after={page.next_cursor}' if page.has_next else None
+        self.assertEqual(seen, ['Day 1', 'Day 1', 'Day 2', 'Day 5'])
+
+    def test_calendar_counts_per_day(self):
+        day = timezone.localdate() + timedelta(days=1)
+        response = self.client.get(reverse('experience_calendar_month', args=[day.year, day.month]))
+        counts = {d['date']: d['count'] for week in response.context['weeks'] for d in week}
+        self.assertEqual(counts[day], 2)
+
+    def test_calendar_rejects_out_of_range_months(self):
+        for year, month in [(0, 1), (99999, 1), (2025, 0), (2025, 13)]:
+            response = self.client.get(reverse('experience_calendar_month', args=[year, month]))
+            self.assertEqual(response.status_code, 404, (year, month))
+        response = self.client.get(reverse('experience_calendar_month', args=[2100, 12]))
+        self.assertIsNone(response.context['next_month'])
+
+    def test_deactivate_past_experiences(self):
+        call_command('deactivate_past_experiences', batch_size=1, stdout=StringIO())
+        self.assertEqual(
+            list(ExclusiveExperience.objects.filter(is_active=False).values_list('experience_title', flat=True)),
+            ['Day -3'],
+        )
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        self.viewer = create_member('viewer', gender='Male', gender_preference='Female',
+                                    lifestyle_preference='luxury_experiences', preferred_engagements=['travel'])
+        self.close = create_member('close', gender='Female', gender_preference='Male',
+                                   lifestyle_preference='luxury_experiences', preferred_engagements=['travel'])
+        self.distant = create_member('distant', gender='Female', gender_preference='Both',
+                                     lifestyle_preference='mutual_benefit', preferred_engagements=['galas'])
+        # Not interested in men, so never recommended to the viewer
+        create_member('elsewhere', gender='Female', gender_preference='Female')
+
+    def ranking(self, user):
+        return [LifestyleProfile.objects.get(pk=pk).user.username for pk in recommended_ids(user.lifestyle_profile)]
+
+    def test_dashboard_reads_precomputed_ranking(self):
+        build()
+        self.assertEqual(self.ranking(self.viewer), ['close', 'distant'])
+        self.client.force_login(self.viewer)
+        response = self.client.get(reverse('lifestyle_dashboard'))
+        self.assertTrue(response.context['recommended'])
+        self.assertEqual([p.user.username for p in response.context['portfolios']], ['close', 'distant'])
+
+    def test_incremental_build_merges_changed_profiles(self):
+        build()
+        LifestyleProfile.objects.filter(user=self.distant).update(
+            lifestyle_preference='luxury_experiences', preferred_engagements=['travel'], financial_capacity='Over $5M',
+            last_updated=timezone.now(),
+        )
+        LifestyleProfile.objects.filter(user=self.close).update(portfolio_suspended=True, last_updated=timezone.now())
+        self.assertEqual(build(), (2, 1))
+        self.assertEqual(self.ranking(self.viewer), ['distant'])
+
+
+class ProfileEventTests(TestCase):
+    def setUp(self):
+        self.owner = create_member('owner')
+        self.fan = create_member('fan')
+        self.addCleanup(events.flush)
+
+    def test_views_are_buffered_then_bulk_inserted(self):
+        self.client.force_login(self.fan)
+        for _ in range(3):
+            self.client.get(reverse('view_portfolio', args=['owner']))
+        self.assertEqual(ProfileEvent.objects.count(), 0)
+        self.assertEqual(events.flush(), 3)
+        self.assertEqual(ProfileEvent.objects.count(), 3)
+
+    def test_rollup_leaves_events_flushed_after_the_count(self):
+        profile = self.owner.lifestyle_profile
+        old = timezone.now() - timedelta(days=5)
+        ProfileEvent.objects.create(profile=profile, actor=self.fan, kind='view', occurred_at=old)
+        real_aggregate, late = QuerySet.aggregate, [old]
+
+        def aggregate_then_flush(queryset, *args, **kwargs):
+            # A flush lands in the day being rolled up right after its max id is read
+            result = real_aggregate(queryset, *args, **kwargs)
+            while late:
+                ProfileEvent.objects.create(profile=profile, actor=self.fan, kind='view', occurred_at=late.pop())
+            return result
+
+        with patch.object(QuerySet, 'aggregate', aggregate_then_flush):
+            self.assertEqual(events.rollup(), 1)
+        self.assertEqual(ProfileEvent.objects.count(), 1)
+        self.assertEqual(events.rollup(), 1)
+        self.assertEqual(ProfileEventDaily.objects.get().count, 2)
+
+    def test_who_viewed_me_merges_raw_events_and_rollups(self):
+        profile = self.owner.lifestyle_profile
+        now = timezone.now()
+        ProfileEvent.objects.bulk_create([
+            ProfileEvent(profile=profile, actor=self.fan, kind='view', occurred_at=now - timedelta(days=days))
+            for days in (0, 5, 5, 6)
+        ])
+        self.assertEqual(events.rollup(), 3)
+        self.assertEqual(
+            sorted(ProfileEventDaily.objects.values_list('count', flat=True)), [1, 2],
+        )
+
+        self.client.force_login(self.owner)
+        data = self.client.get(reverse('who_viewed_me')).json()
+        self.assertEqual(data['total'], 4)
+        self.assertEqual(data['actors'], [
+            {'username': 'fan', 'count': 4, 'last_seen': timezone.localdate(now).isoformat()},
+        ])
+
+
+class ProfileEventFlushTests(TransactionTestCase):
+    def setUp(self):
+        self.profile = create_member('owner').lifestyle_profile
+        self.fan = create_member('fan')
+        self.addCleanup(events.flush)
+
+    @override_settings(PROFILE_EVENT_FLUSHER=True, PROFILE_EVENT_BUFFER_SIZE=3, PROFILE_EVENT_FLUSH_SECONDS=60)
+    def test_flusher_thread_writes_a_full_buffer(self):
+        self.addCleanup(events._wake.set)  # lets the thread see the flusher is off again and exit
+        for _ in range(3):
+            events.record(self.profile.pk, 'view', self.fan.pk)
+        for _ in range(200):
+            if ProfileEvent.objects.count() == 3:
+                break
+            sleep(0.05)
+        self.assertEqual(ProfileEvent.objects.count(), 3)
+
+    def test_events_for_deleted_profiles_are_dropped(self):
+        events.record(self.profile.pk, 'view', self.fan.pk)
+        events.record(self.profile.pk + 1000, 'view', self.fan.pk)
+        events.record(self.profile.pk, 'interest', self.fan.pk + 1000)
+        with self.assertLogs('main.events', 'WARNING'):
+            self.assertEqual(events.flush(), 1)
+        self.assertEqual(list(ProfileEvent.objects.values_list('kind', flat=True)), ['view'])
+
+
+class PublicPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_are_cached_and_revalidated(self):
+        first = self.client.get(reverse('about'))
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Cookie', first['Vary'])
+        self.assertIn('public', first['Cache-Control'])
+
+        with patch('django.views.generic.base.TemplateView.get') as render_view:
+            second = self.client.get(reverse('about'), HTTP_IF_NONE_MATCH=first['ETag'])
+            render_view.assert_not_called()
+        self.assertEqual(second.status_code, 304)
+
+    def test_members_get_a_private_fresh_page(self):
+        self.client.get(reverse('about'))
+        self.client.force_login(create_member('member'))
+        response = self.client.get(reverse('about'))
+        self.assertNotIn('ETag', response)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('Cookie', response['Vary'])
+
+
+class RegistrationTests(TestCase):
+    def register(self, username, email):
+        return self.client.post(reverse('register'), {
+            'username': username, 'email': email,
+            'password1': 'pw-Elite-2025', 'password2': 'pw-Elite-2025',
+        })
+
+    def test_signup_creates_user_and_profile(self):
+        self.assertRedirects(self.register('newcomer', 'new@example.com'), reverse('login'))
+        self.assertTrue(LifestyleProfile.objects.filter(user__username='newcomer').exists())
+
+    def test_duplicate_email_is_reported_from_unique_index(self):
+        self.register('first', 'Same@Example.com')
+        response = self.register('second', 'same@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('email', response.context['form'].errors)
+        self.assertFalse(User.objects.filter(username='second').exists())
+
+    def test_dashboard_skips_get_or_create_once_profile_is_known(self):
+        self.client.force_login(create_member('regular'))
+        self.client.get(reverse('lifestyle_dashboard'))
+        with patch.object(LifestyleProfile.objects, 'get_or_create') as get_or_create:
+            response = self.client.get(reverse('lifestyle_dashboard'))
+            get_or_create.assert_not_called()
+        self.assertEqual(response.context['user_profile'].user.username, 'regular')
+
+
+@jobs.task(name='tests.flaky', max_attempts=2)
+def flaky_task(fail):
+    if fail:
+        raise RuntimeError('boom')
+
+
+@override_settings(
+    EMAIL_BACKEND='main.mail.QueuedEmailBackend',
+    JOB_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class BackgroundJobTests(TestCase):
+    def test_password_reset_mail_is_queued_then_sent_by_worker(self):
+        create_member('forgetful')
+        self.client.post(reverse('password_reset'), {'email': 'forgetful@example.com'})
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.get().task, 'main.tasks.send_email')
+
+        with self.assertLogs('main.jobs', 'INFO'):
+            call_command('runworker', once=True)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['forgetful@example.com'])
+        self.assertEqual(Job.objects.get().status, 'done')
+
+    def test_failures_retry_with_backoff_then_give_up(self):
+        job = jobs.enqueue(flaky_task, fail=True)
+        with self.assertLogs('main.jobs', 'WARNING'):
+            self.assertFalse(jobs.run(jobs.claim('test')[0]))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertEqual(jobs.claim('test'), [])  # not due yet
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('main.jobs', 'WARNING'):
+            jobs.run(jobs.claim('test')[0])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertIn('boom', job.last_error)
+
+    def test_higher_priority_runs_first(self):
+        low = jobs.enqueue(flaky_task, priority=jobs.PRIORITY_LOW, fail=False)
+        high = jobs.enqueue(flaky_task, priority=jobs.PRIORITY_HIGH, fail=False)
+        self.assertEqual([j.pk for j in jobs.claim('test', limit=2)], [high.pk, low.pk])
+
+
+@override_settings(JOB_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class NotificationDigestTests(TestCase):
+    def setUp(self):
+        self.recipient = create_member('recipient', preferred_name='Rae')
+        self.admirers = [create_member(f'admirer{i}') for i in range(3)]
+        self.addCleanup(events.flush)  # save_connection buffers interest events
+
+    def test_events_are_coalesced_into_one_digest(self):
+        for admirer in self.admirers:
+            self.client.force_login(admirer)
+            self.client.get(reverse('save_connection', args=[self.recipient.pk]))
+        notifications.notify(self.recipient.pk, 'message', self.admirers[0].pk)
+
+        self.assertEqual(notifications.send_digests(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        body = mail.outbox[0].body
+        self.assertIn('Interest Expressed: 3', body)
+        self.assertIn('New Message: 1 (admirer0)', body)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_frequency_is_respected(self):
+        LifestyleProfile.objects.filter(user=self.recipient).update(
+            digest_frequency='daily', last_digest_at=timezone.now() - timedelta(hours=2))
+        notifications.notify(self.recipient.pk, 'interest', self.admirers[0].pk)
+        self.assertEqual(notifications.send_digests(), 0)
+        self.assertEqual(notifications.send_digests(now=timezone.now() + timedelta(days=1)), 1)
+
+    def test_opted_out_members_get_nothing(self):
+        self.client.force_login(self.recipient)
+        self.client.post(reverse('discretion_settings'), {'digest_frequency': 'never'})
+        notifications.notify(self.recipient.pk, 'interest', self.admirers[0].pk)
+        self.assertEqual(notifications.send_digests(), 0)
+        self.assertFalse(Notification.objects.exists())
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_sliding_window_counts_previous_window(self):
+        for _ in range(10):
+            self.assertEqual(ratelimit.hit('t', 'a', 10, 60, now=60.0), 0)
+        self.assertEqual(ratelimit.hit('t', 'a', 10, 60, now=61.0), 59)
+        # Halfway through the next window half of the 11 earlier hits still count
+        self.assertEqual(ratelimit.hit('t', 'a', 10, 60, now=150.0), 0)
+        for _ in range(4):
+            ratelimit.hit('t', 'a', 10, 60, now=150.0)
+        self.assertGreater(ratelimit.hit('t', 'a', 10, 60, now=150.0), 0)
+
+    @override_settings(RATELIMIT_RATES={'view_portfolio': '2/m'})
+    def test_portfolio_scraping_gets_429(self):
+        create_member('popular')
+        url = reverse('view_portfolio', args=['popular'])
+        with patch('main.views.events.record'):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(self.client.get(url).status_code, 200)
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(LifestyleProfile.objects.get(user__username='popular').view_count, 2)
+
+    def test_login_attempts_are_limited_per_ip(self):
+        for _ in range(10):
+            self.client.post(reverse('login'), {'username': 'x', 'password': 'wrong'})
+        self.assertEqual(self.client.post(reverse('login'), {'username': 'x', 'password': 'wrong'}).status_code, 429)
+        self.assertEqual(self.client.get(reverse('login')).status_code, 200)
+
+
+class MemberApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(events.flush)
+        self.viewer = create_member('viewer')
+        for name in ('ana', 'bea', 'cleo'):
+            create_member(name, primary_location='London')
+        self.client.force_login(self.viewer)
+
+    def test_search_pages_with_cursor_and_sparse_fields(self):
+        url = reverse('api_search')
+        first = self.client.get(url, {'fields': 'username', 'limit': 2}).json()
+        self.assertEqual(first['results'], [{'username': 'cleo'}, {'username': 'bea'}])
+        second = self.client.get(url, {'fields': 'username', 'limit': 2, 'after': first['next']}).json()
+        self.assertEqual(second, {'results': [{'username': 'ana'}], 'next': None})
+        self.assertEqual(self.client.get(url, {'fields': 'password'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'after': 'junk'}).status_code, 400)
+
+    def test_portfolio_etag_follows_last_updated(self):
+        url = reverse('api_portfolio', args=['ana'])
+        response = self.client.get(url, {'fields': 'username,primary_location'})
+        self.assertEqual(response.json(), {'username': 'ana', 'primary_location': 'London'})
+        tag = response['ETag']
+        cached = self.client.get(url, {'fields': 'username,primary_location'}, HTTP_IF_NONE_MATCH=tag)
+        self.assertEqual(cached.status_code, 304)
+        # Revalidating isn't another view
+        self.assertEqual(LifestyleProfile.objects.get(user__username='ana').view_count, 1)
+
+        profile = LifestyleProfile.objects.get(user__username='ana')
+        profile.primary_location = 'Paris'
+        profile.save()
+        fresh = self.client.get(url, {'fields': 'username,primary_location'}, HTTP_IF_NONE_MATCH=tag)
+        self.assertEqual(fresh.json()['primary_location'], 'Paris')
+
+    def test_saved_connections_and_conversations(self):
+        ana, bea = User.objects.get(username='ana'), User.objects.get(username='bea')
+        LifestyleProfile.objects.filter(user=self.viewer).update(saved_connections=[ana.pk, bea.pk])
+        saved = self.client.get(reverse('api_saved_connections'), {'fields': 'username'}).json()
+        self.assertEqual([row['username'] for row in saved['results']], ['bea', 'ana'])
+
+        introduction = CuratedIntroduction.objects.create()
+        introduction.participants.add(self.viewer, ana)
+        DiscreetMessage.objects.create(introduction=introduction, sender=ana, content='Hello')
+        conversations = self.client.get(reverse('api_conversations'), {'fields': 'with,unread'}).json()
+        self.assertEqual(conversations['results'], [{'with': 'ana', 'unread': 1}])
+        self.assertEqual(
+            self.client.get(reverse('api_conversation_messages', args=[introduction.pk])).json()['results'][0]['content'],
+            'Hello',
+        )
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('api_feed')).status_code, 401)
+
+
+
+class EngagementExpiryTests(TestCase):
+    def test_lapsed_paid_tiers_are_downgraded_in_chunks(self):
+        now = timezone.now()
+        for i in range(3):
+            create_member(f'lapsed{i}', engagement_tier='premium', engagement_expires_at=now - timedelta(days=i + 1))
+        current = create_member('current', engagement_tier='exclusive', engagement_expires_at=now + timedelta(days=5))
+        self.assertFalse(LifestyleProfile.objects.get(user__username='lapsed0').has_exclusive_access())
+        self.assertTrue(current.lifestyle_profile.has_exclusive_access())
+
+        self.assertEqual(engagements.expire(now=now, dry_run=True), 3)
+        self.assertEqual(engagements.expire(now=now, batch_size=2), 3)
+        self.assertFalse(LifestyleProfile.objects.filter(engagement_tier='premium').exists())
+        self.assertEqual(LifestyleProfile.objects.get(user=current).engagement_tier, 'exclusive')
+        self.assertEqual(Notification.objects.filter(kind='tier_expired').count(), 3)
+        self.assertEqual(engagements.expire(now=now), 0)
+
+
+class MessageArchiveTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob = create_member('alice'), create_member('bob')
+        self.introduction = CuratedIntroduction.objects.create()
+        self.introduction.participants.add(self.alice, self.bob)
+        self.now = timezone.now()
+        old = self.now - timedelta(days=settings.MESSAGE_ARCHIVE_AFTER_DAYS + 62)
+        for i, (sender, content) in enumerate([(self.alice, 'Dinner?'), (self.bob, 'Gladly')]):
+            message = DiscreetMessage.objects.create(introduction=self.introduction, sender=sender, content=content)
+            DiscreetMessage.objects.filter(pk=message.pk).update(exchanged_at=old + timedelta(minutes=i))
+        self.recent = DiscreetMessage.objects.create(introduction=self.introduction, sender=self.alice, content='Hi')
+        CuratedIntroduction.objects.filter(pk=self.introduction.pk).update(last_exchange=message)
+
+    def test_old_months_move_to_cold_storage(self):
+        self.assertEqual(archive.archive(now=self.now), 2)
+        self.assertEqual(list(DiscreetMessage.objects.values_list('content', flat=True)), ['Hi'])
+        self.assertEqual(MessageArchive.objects.get().message_count, 2)
+        self.assertIsNone(CuratedIntroduction.objects.get().last_exchange)
+        self.assertEqual([m['content'] for m in archive.archived_messages(self.introduction.pk)], ['Dinner?', 'Gladly'])
+        self.assertEqual(archive.archive(now=self.now), 0)
+
+    def test_archive_is_readable_through_the_api(self):
+        archive.archive(now=self.now)
+        self.client.force_login(self.bob)
+        url = reverse('api_conversation_archive', args=[self.introduction.pk])
+        response = self.client.get(url, {'fields': 'sender,content'})
+        self.assertEqual(response.json()['results'], [
+            {'sender': 'alice', 'content': 'Dinner?'}, {'sender': 'bob', 'content': 'Gladly'},
+        ])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'], data={'fields': 'sender,content'}).status_code, 304)
+
+@override_settings(ACCOUNT_PURGE_PAUSE_SECONDS=0)
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.leaving, self.staying = create_member('leaving'), create_member('staying')
+        introduction = CuratedIntroduction.objects.create()
+        introduction.participants.add(self.leaving, self.staying)
+        for i in range(5):
+            DiscreetMessage.objects.create(introduction=introduction, sender=self.leaving, content=f'note {i}')
+        DiscreetMessage.objects.create(introduction=introduction, sender=self.staying, content='reply')
+
+    def test_account_is_hidden_at_once_and_purged_in_batches(self):
+        deletion = accounts.request_deletion(self.leaving)
+        self.assertFalse(User.objects.get(pk=self.leaving.pk).is_active)
+        self.assertTrue(LifestyleProfile.objects.get(user=self.leaving).portfolio_suspended)
+
+        self.assertFalse(accounts.purge(deletion.pk, batch_size=2, seconds=0))
+        self.assertTrue(accounts.purge(deletion.pk, batch_size=2))
+        deletion.refresh_from_db()
+        self.assertEqual((deletion.status, deletion.progress['messages']), ('done', 5))
+        self.assertFalse(User.objects.filter(pk=self.leaving.pk).exists())
+        self.assertEqual(list(DiscreetMessage.objects.values_list('content', flat=True)), ['reply'])
+
+    def test_view_requires_password_and_queues_purge(self):
+        self.client.force_login(self.leaving)
+        response = self.client.post(reverse('delete_account'), {'password': 'wrong'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(User.objects.get(pk=self.leaving.pk).is_active)
+
+        response = self.client.post(reverse('delete_account'), {'password': 'pw-Elite-2025'})
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+        self.assertEqual(Job.objects.get().task, 'main.tasks.purge_account')
+        with self.assertLogs('main.jobs', 'INFO'):
+            call_command('runworker', once=True)
+        self.assertEqual(AccountDeletion.objects.get().status, 'done')
+        self.assertFalse(User.objects.filter(username='leaving').exists())
+
+
+class PresenceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.viewer, self.active, self.idle = create_member('viewer'), create_member('active'), create_member('idle')
+
+    def test_heartbeats_expire_with_the_window(self):
+        now = 1_000_000 * 60
+        presence.heartbeat(self.active.pk, now=now)
+        presence.heartbeat(self.idle.pk, now=now - settings.PRESENCE_WINDOW_MINUTES * 60)
+        self.assertEqual(presence.online([self.active.pk, self.idle.pk, 10_000], now=now), {self.active.pk})
+        later = now + settings.PRESENCE_WINDOW_MINUTES * 60
+        self.assertEqual(presence.online([self.active.pk, self.idle.pk], now=later), set())
+
+    def test_heartbeats_refresh_last_active_once_per_window(self):
+        now = timezone.now().timestamp()
+        presence.heartbeat(self.active.pk, now=now - 60)
+        presence.heartbeat(self.active.pk, now=now)  # within the window: no write
+        card = PortfolioCard.objects.get(user=self.active)
+        self.assertEqual(card.last_active.timestamp(), now - 60)
+        self.assertEqual(LifestyleProfile.objects.get(user=self.active).last_active, card.last_active)
+        with self.assertNumQueries(0):
+            presence.heartbeat(self.active.pk, now=now)
+
+    def test_search_filters_to_members_online_now(self):
+        self.client.force_login(self.active)
+        self.client.get(reverse('discretion_settings'))  # any request is a heartbeat
+        self.client.force_login(self.viewer)
+        response = self.client.get(reverse('curated_search'), {'online': '1'})
+        self.assertEqual([p.user for p in response.context['portfolios']], [self.active])
+        self.assertEqual(response.context['online_ids'], {self.active.pk})
+        self.assertContains(response, 'fa-circle')
+
+
+class PlaceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        places.load_gazetteer()
+        self.viewer = create_member('viewer')
+        self.londoner = create_member('londoner', primary_location='london ')
+        self.new_yorker = create_member('newyorker', primary_location='New York, NY')
+        self.local = create_member('local', primary_location='Smallville')
+        # Members who typed their location before places existed
+        link_places = import_module('main.migrations.0016_link_places').link_places
+        link_places(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(places.link_profiles(), 0)
+
+    def test_typed_locations_link_to_normalized_places(self):
+        london = Place.objects.get(name='London, UK')
+        self.assertEqual(LifestyleProfile.objects.get(user=self.londoner).place, london)
+        self.assertEqual(places.resolve('  LONDON,  England'), london.pk)
+        self.assertEqual(places.resolve('São Paulo'), places.resolve('sao paulo'))
+        self.assertEqual(LifestyleProfile.objects.get(user=self.local).place.name, 'Smallville')
+        self.assertEqual(places.load_gazetteer()[0], 0)
+
+    def test_location_saved_concurrently_resolves_to_one_place(self):
+        gotham = Place.objects.create(name='Gotham')
+        PlaceName.objects.create(place=gotham, name='gotham')
+        # Another save created it between this one's lookup and insert
+        with patch.object(PlaceName.objects, 'filter', return_value=PlaceName.objects.none()):
+            self.assertEqual(places.resolve('Gotham'), gotham.pk)
+        self.assertEqual(Place.objects.filter(name='Gotham').count(), 1)
+
+    def test_autocomplete_ranks_by_population(self):
+        self.client.force_login(self.viewer)
+        response = self.client.get(reverse('api_places'), {'q': 'Lo'})
+        self.assertEqual([p['name'] for p in response.json()['results']][:2], ['London, UK', 'Los Angeles, CA'])
+        self.assertEqual(self.client.get(reverse('api_places'), {'q': 'l'}).json()['results'], [])
+
+    def test_search_filters_by_place(self):
+        self.client.force_login(self.viewer)
+        new_york = LifestyleProfile.objects.get(user=self.new_yorker).place_id
+        response = self.client.get(reverse('curated_search'), {'place': new_york})
+        self.assertEqual([p.user for p in response.context['portfolios']], [self.new_yorker])
+        response = self.client.get(reverse('curated_search'), {'location': 'NYC'})
+        self.assertEqual([p.user for p in response.context['portfolios']], [self.new_yorker])
+        response = self.client.get(reverse('api_search'), {'location': 'lond', 'fields': 'username,place'})
+        self.assertEqual(response.json()['results'], [{'username': 'londoner', 'place': Place.objects.get(name='London, UK').pk}])
+        # Punctuation only normalizes to '', which must not match every place
+        self.assertEqual(list(self.client.get(reverse('curated_search'), {'location': ',,'}).context['portfolios']), [])
+        self.assertEqual(self.client.get(reverse('api_search'), {'location': 'l'}).json()['results'], [])
+
+
+class DataExportTests(TestCase):
+    def setUp(self):
+        media, self.archives = tempfile.TemporaryDirectory(), tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.addCleanup(self.archives.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name, DATA_EXPORT_ROOT=self.archives.name))
+        self.member, other = create_member('exporter'), create_member('other')
+        introduction = CuratedIntroduction.objects.create()
+        introduction.participants.add(self.member, other)
+        for sender in (self.member, other, self.member):
+            DiscreetMessage.objects.create(introduction=introduction, sender=sender, content=f'from {sender}')
+        profile = LifestyleProfile.objects.get(user=self.member)
+        profile.portfolio_image.save('me.jpg', ContentFile(b'\xff\xd8jpeg bytes'))
+        self.client.force_login(self.member)
+
+    def read(self, data):
+        with zipfile.ZipFile(BytesIO(data)) as archive_file:
+            return {name: archive_file.read(name) for name in archive_file.namelist()}
+
+    def test_small_account_streams_zip(self):
+        response = self.client.post(reverse('data_export'))
+        self.assertTrue(response.streaming)
+        files = self.read(b''.join(response.streaming_content))
+        messages = [json.loads(line) for line in files['messages.ndjson'].splitlines()]
+        self.assertEqual([m['sender__username'] for m in messages], ['exporter', 'other', 'exporter'])
+        self.assertEqual(json.loads(files['profile.json'])['account']['username'], 'exporter')
+        self.assertEqual(files['media/portfolios/me.jpg'], b'\xff\xd8jpeg bytes')
+
+    @override_settings(EXPORT_INLINE_MAX_ROWS=0)
+    def test_large_account_is_built_in_background(self):
+        response = self.client.post(reverse('data_export'))
+        self.assertRedirects(response, reverse('data_export'))
+        with self.assertLogs('main.jobs', 'INFO'):
+            call_command('runworker', once=True)
+        export = DataExport.objects.get()
+        self.assertEqual(export.status, 'ready')
+        self.assertTrue(export.file.path.startswith(self.archives.name))
+        self.assertTrue(Notification.objects.filter(recipient=self.member, kind='export_ready').exists())
+
+        response = self.client.get(reverse('download_data_export', args=[export.pk]))
+        self.assertIn('messages.ndjson', self.read(b''.join(response.streaming_content)))
+        self.client.force_login(User.objects.get(username='other'))
+        self.assertEqual(self.client.get(reverse('download_data_export', args=[export.pk])).status_code, 404)
+
+
+# Worker-thread queries use their own connections, which only see committed rows
+class PortfolioCardTests(TestCase):
+    def test_cards_follow_discoverability_and_edits(self):
+        member = create_member('carded', preferred_name='Ava', personal_statement='x' * 500)
+        card = PortfolioCard.objects.get(user=member)
+        self.assertEqual((card.username, card.preferred_name, len(card.statement)), ('carded', 'Ava', 200))
+
+        profile = member.lifestyle_profile
+        profile.preferred_name = 'Avery'
+        profile.save()
+        member.username = 'renamed'
+        member.save()
+        card.refresh_from_db()
+        self.assertEqual((card.username, card.preferred_name), ('renamed', 'Avery'))
+
+        hidden = create_member('hidden', portfolio_suspended=True)
+        self.assertFalse(PortfolioCard.objects.filter(user=hidden).exists())
+        accounts.request_deletion(member)
+        self.assertFalse(PortfolioCard.objects.exists())
+
+    def test_bulk_updates_and_rebuild(self):
+        now = timezone.now()
+        member = create_member('lapsing', engagement_tier='premium', engagement_expires_at=now - timedelta(days=1))
+        engagements.expire(now=now)
+        self.assertEqual(PortfolioCard.objects.get(user=member).engagement_tier, 'standard')
+
+        # update() skips the signals, so both cards go stale until a rebuild
+        LifestyleProfile.objects.filter(user=member).update(preferred_name='Stale')
+        withdrawn = create_member('withdrawn')
+        LifestyleProfile.objects.filter(user=withdrawn).update(curator_approved=False)
+        self.assertEqual(PortfolioCard.objects.count(), 2)
+        self.assertEqual(cards.rebuild(), 1)
+        self.assertEqual(list(PortfolioCard.objects.values_list('preferred_name', flat=True)), ['Stale'])
+
+
+class InterestMatchTests(TestCase):
+    def setUp(self):
+        self.addCleanup(events.flush)  # save_connection buffers interest events
+        self.alice = create_member('alice')
+        self.bob = create_member('bob')
+
+    def test_reciprocal_interest_creates_one_introduction(self):
+        self.assertIsNone(interests.express(self.alice.pk, self.bob.pk))
+        self.assertIsNone(interests.express(self.alice.pk, self.bob.pk))
+        self.assertFalse(interests.matches(self.alice.pk).exists())
+
+        self.client.force_login(self.bob)
+        self.client.get(reverse('save_connection', args=[self.alice.pk]))
+        introduction = CuratedIntroduction.objects.get()
+        self.assertEqual(set(introduction.participants.values_list('username', flat=True)), {'alice', 'bob'})
+        self.assertEqual(set(Interest.objects.values_list('introduction', flat=True)), {introduction.pk})
+        self.assertEqual(
+            sorted(Notification.objects.filter(kind='match').values_list('recipient__username', flat=True)),
+            ['alice', 'bob'],
+        )
+        self.assertEqual(list(interests.matches(self.alice.pk).values_list('to_user', flat=True)), [self.bob.pk])
+
+        self.client.get(reverse('restrict_connection', args=[self.alice.pk]))
+        self.assertFalse(interests.matches(self.alice.pk).exists())
+        self.assertTrue(CuratedIntroduction.objects.exists())
+
+    def test_matches_are_keyset_paged(self):
+        for i in range(3):
+            other = create_member(f'admirer{i}')
+            interests.express(other.pk, self.alice.pk)
+            interests.express(self.alice.pk, other.pk)
+        self.client.force_login(self.alice)
+        url = reverse('api_matches')
+        first = self.client.get(url, {'fields': 'username', 'limit': 2}).json()
+        self.assertEqual([row['username'] for row in first['results']], ['admirer2', 'admirer1'])
+        second = self.client.get(url, {'fields': 'username', 'limit': 2, 'after': first['next']}).json()
+        self.assertEqual(second, {'results': [{'username': 'admirer0'}], 'next': None})
+        response = self.client.get(reverse('mutual_matches'))
+        self.assertContains(response, 'admirer0')
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_cold_start_phases_and_imports_are_reported(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'startup.json')
+            call_command('profile_startup', entry='wsgi', repeat=1, top=3, output=path, stdout=out)
+            with open(path) as fh:
+                wsgi = json.load(fh)['entries']['wsgi']
+        self.assertGreater(wsgi['phases_ms']['total'], wsgi['phases_ms']['setup'])
+        self.assertIn('django', [row['package'] for row in wsgi['packages']])
+        self.assertIn('wsgi:', out.getvalue())
+
+
+class SettingsSelectionTests(SimpleTestCase):
+    def settings_module(self, **env):
+        environ = {key: value for key, value in os.environ.items() if key not in ('RENDER', 'DJANGO_ENV')}
+        environ.update(env, DJANGO_SETTINGS_MODULE='adultarrangements.settings')
+        result = subprocess.run(
+            [sys.executable, '-c', 'from django.conf import settings; print(settings.SECURE_SSL_REDIRECT)'],
+            cwd=settings.BASE_DIR, env=environ, capture_output=True, text=True, check=True,
+        )
+        return result.stdout.strip()
+
+    def test_prod_only_on_render_or_when_asked(self):
+        self.assertEqual(self.settings_module(DATABASE_URL='sqlite:////tmp/unused.sqlite3'), 'False')
+        self.assertEqual(self.settings_module(RENDER='true'), 'True')
+        self.assertEqual(self.settings_module(DJANGO_ENV='prod'), 'True')
+        self.assertEqual(self.settings_module(RENDER='true', DJANGO_ENV='dev'), 'False')
+
+
+class ViewBenchmarkTests(TestCase):
+    databases = '__all__'  # queries are captured on every configured database
+
+    def test_benchmark_runs_every_route_on_a_tiny_dataset(self):
+        call_command('generate_synthetic_data', 20, stdout=StringIO())
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            call_command('benchmark_views', iterations=1, warmup=0, output=path, stdout=out, stderr=StringIO())
+            with open(path) as fh:
+                report = json.load(fh)
+        routes = report['routes']
+        self.assertEqual(routes['experience_calendar_month']['status'], {'200': 1})
+        self.assertEqual(routes['lifestyle_dashboard']['status'], {'200': 1})
+        self.assertIn('api_conversation_messages', routes)
+        # Nothing to download on a fresh dataset, so that route is reported, not dropped silently
+        self.assertIn('download_data_export', report['skipped'])
+        self.assertIn('Skipped download_data_export', out.getvalue())
+        self.assertFalse([name for name, route in routes.items() if '429' in route['status']])
+
+    def test_rate_limited_routes_are_measured_not_throttled(self):
+        call_command('generate_synthetic_data', 20, stdout=StringIO())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.json')
+            call_command('benchmark_views', iterations=25, warmup=0, output=path, stdout=StringIO(),
+                         routes='save_connection,restrict_connection,send_message')
+            with open(path) as fh:
+                routes = json.load(fh)['routes']
+        self.assertEqual(len(routes), 3)
+        for name, route in routes.items():
+            self.assertNotIn('429', route['status'], name)
+
+
+class AsyncMemberViewTests(TransactionTestCase):
+    def setUp(self):
+        self.addCleanup(events.flush)
+        self.viewer = create_member('viewer')
+        for i in range(14):
+            create_member(f'member{i:02}', primary_location='Monaco',
+                          last_active=timezone.now() - timedelta(minutes=i))
+        places.link_profiles()
+
+    def get(self, view, path, user, *args):
+        request = RequestFactory().get(path)
+        request.user = user
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return async_to_sync(view)(request, *args), request
+
+    def test_dashboard_pages_feed(self):
+        response, request = self.get(async_views.lifestyle_dashboard, '/lifestyle-dashboard/?page=2', self.viewer)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'member13')
+        self.assertNotContains(response, 'member01')
+        self.assertTrue(request.session[async_views.PROFILE_SESSION_FLAG])
+
+    def test_search_past_last_page_shows_last_page(self):
+        response, _ = self.get(async_views.curated_search, '/curated-search/?location=Monaco&page=9', self.viewer)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'member13')
+        self.assertNotContains(response, 'member00')
+
+    def test_online_search_is_the_feed_of_online_members(self):
+        cache.clear()
+        # Last active 13 minutes ago, before this visit refreshed it
+        presence.heartbeat(User.objects.get(username='member13').pk)
+        presence.heartbeat(User.objects.get(username='member02').pk)
+        response, _ = self.get(async_views.curated_search, '/curated-search/?location=Monaco&online=1', self.viewer)
+        self.assertContains(response, 'member13')
+        self.assertContains(response, 'member02')
+        self.assertNotContains(response, 'member00')
+
+    def test_portfolio_counts_view(self):
+        response, _ = self.get(async_views.view_portfolio, '/portfolio/member03/', AnonymousUser(), 'member03')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(LifestyleProfile.objects.get(user__username='member03').view_count, 1)
+
+    def test_anonymous_dashboard_redirects_to_login(self):
+        response, _ = self.get(async_views.lifestyle_dashboard, '/lifestyle-dashboard/', AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(RATELIMIT_ENABLED=False, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoadTestTests(LiveServerTestCase):
+    def setUp(self):
+        self.addCleanup(events.flush)
+        for name in ('synth_0000001', 'synth_0000002', 'synth_0000003', 'synth_0000004'):
+            member = create_member(name, primary_location='London')
+            member.set_password(SYNTHETIC_PASSWORD)
+            member.save()
+
+    def test_journeys_are_reported_per_route_and_gated(self):
+        targets = list(PortfolioCard.objects.values_list('user_id', 'username'))
+        # One user: the live server's threads share a single in-memory SQLite connection
+        stats, elapsed = loadtest.run(
+            self.live_server_url, ['synth_0000001'], SYNTHETIC_PASSWORD, targets, users=1, duration=1, ramp_up=0,
+        )
+        results = loadtest.report(stats, elapsed)
+        self.assertEqual(results['routes']['login']['status'], {'302': 1})
+        for route in ('lifestyle_dashboard', 'curated_search', 'view_portfolio', 'api_conversations'):
+            self.assertEqual(results['routes'][route]['errors'], 0, route)
+        dashboard = results['routes']['lifestyle_dashboard']
+        self.assertEqual(sum(dashboard['histogram'].values()), dashboard['requests'])
+
+        slower = json.loads(json.dumps(results))
+        slower['routes']['lifestyle_dashboard']['p95_ms'] = dashboard['p95_ms'] * 2 + 10
+        self.assertEqual(loadtest.regressions(results, results, 20), [])
+        self.assertEqual(
+            [route for route, _, _ in loadtest.regressions(slower, results, 20)], ['lifestyle_dashboard'],
+        )
+        del slower['routes']['api_conversations']
+        self.assertIn(
+            ('api_conversations', results['routes']['api_conversations']['p95_ms'], None),
+            loadtest.regressions(slower, results, 20),
+        )
+
+    def test_failed_sign_in_and_lost_sessions_are_errors(self):
+        stats, elapsed = loadtest.run(
+            self.live_server_url, ['synth_0000001'], 'wrong-password', [], users=1, duration=1, ramp_up=0,
+        )
+        login = loadtest.report(stats, elapsed)['routes']['login']
+        self.assertEqual((login['status'], login['errors']), ({'200_unexpected': 1}, 1))
+
+        user = loadtest.VirtualUser('synth_0000001', SYNTHETIC_PASSWORD, [], None, loadtest.Stats(), None, 0)
+        self.assertEqual(user.outcome(302, [('location', '/lifestyle-dashboard/')], None), 302)
+        self.assertEqual(user.outcome(302, [('location', '/login/?next=/curated-search/')], None), 'login_redirect')
+        self.assertEqual(user.outcome(301, [('location', 'https://testserver/curated-search/')], None),
+                         'https_redirect')
+        self.assertTrue(loadtest.is_error('login_redirect'))
@@ -1,6 +1,10 @@
 # main/urls.py
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# Under ASGI the busiest member pages run their async variants
+member_views = async_views if settings.ASYNC_MEMBER_VIEWS else views
 
 urlpatterns = [
     # ===== PUBLIC AUTH PAGES (in main app) =====
@@ -9,28 +13,55 @@ urlpatterns = [
     
     # ===== MEMBER PAGES =====
     # Core portfolio pages
-    path('lifestyle-dashboard/', views.lifestyle_dashboard, name='lifestyle_dashboard'),
-    path('curated-search/', views.curated_search, name='curated_search'),
-    path('portfolio/<str:username>/', views.view_portfolio, name='view_portfolio'),
+    path('lifestyle-dashboard/', member_views.lifestyle_dashboard, name='lifestyle_dashboard'),
+    path('curated-search/', member_views.curated_search, name='curated_search'),
+    path('portfolio/<str:username>/', member_views.view_portfolio, name='view_portfolio'),
     path('refine-portfolio/', views.edit_portfolio, name='edit_portfolio'),
     path('engagement-management/', views.engagement_management, name='engagement_management'),
     
     # Add this alias for 'profile' to fix the error
-    path('profile/', views.lifestyle_dashboard, name='profile'),
+    path('profile/', member_views.lifestyle_dashboard, name='profile'),
     
     # Additional pages
     path('portfolio-pending/', views.portfolio_pending, name='portfolio_pending'),
     path('curated-introductions/', views.curated_introductions, name='curated_introductions'),
     path('saved-connections/', views.saved_connections, name='saved_connections'),
+    path('mutual-matches/', views.mutual_matches, name='mutual_matches'),
+    path('who-viewed-me/', views.who_viewed_me, name='who_viewed_me'),
     
     # Action URLs
     path('save-connection/<int:user_id>/', views.save_connection, name='save_connection'),
     path('restrict-connection/<int:user_id>/', views.restrict_connection, name='restrict_connection'),
     path('send-message/<int:user_id>/', views.send_message, name='send_message'),
     
+    # Exclusive experiences
+    path('experiences/', views.exclusive_experiences, name='exclusive_experiences'),
+    path('experiences/host/', views.host_experience, name='host_experience'),
+    path('experiences/calendar/', views.experience_calendar, name='experience_calendar'),
+    path('experiences/calendar/<int:year>/<int:month>/', views.experience_calendar, name='experience_calendar_month'),
+    
     # Additional views
     path('lifestyle-preferences/', views.lifestyle_preferences, name='lifestyle_preferences'),
     path('discretion-settings/', views.discretion_settings, name='discretion_settings'),
+    path('delete-account/', views.delete_account, name='delete_account'),
+    path('export-data/', views.data_export, name='data_export'),
+    path('export-data/<int:export_id>/download/', views.download_data_export, name='download_data_export'),
     path('gallery-management/', views.gallery_management, name='gallery_management'),
     path('curator-dashboard/', views.curator_dashboard, name='curator_dashboard'),
+    
+    # JSON API
+    path('api/v1/feed/', api.feed, name='api_feed'),
+    path('api/v1/search/', api.search, name='api_search'),
+    path('api/v1/places/', api.place_suggestions, name='api_places'),
+    path('api/v1/portfolios/<str:username>/', api.portfolio, name='api_portfolio'),
+    path('api/v1/saved-connections/', api.saved_connections, name='api_saved_connections'),
+    path('api/v1/matches/', api.matches, name='api_matches'),
+    path('api/v1/conversations/', api.conversations, name='api_conversations'),
+    path('api/v1/conversations/<int:introduction_id>/messages/', api.conversation_messages,
+         name='api_conversation_messages'),
+    path('api/v1/conversations/<int:introduction_id>/archive/', api.conversation_archive,
+         name='api_conversation_archive'),
+    
+    # Operations
+    path('metrics/', views.performance_metrics, name='performance_metrics'),
 ]
@@ -1,11 +1,39 @@
 # main/views.py - CLEAN VERSION (NO CIRCULAR IMPORTS)
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
+from django.conf import settings
 from django.core.paginator import Paginator
-from .models import LifestyleProfile
-from .forms import CustomRegistrationForm, PortfolioForm
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+import calendar
+from datetime import date
+from .models import LifestyleProfile, ExclusiveExperience, DataExport, PortfolioCard
+from .forms import (
+    CustomRegistrationForm, PortfolioForm, ExclusiveExperienceForm, DiscretionSettingsForm, DeleteAccountForm,
+)
+from .pagination import InvalidCursor, keyset_page
+from .ratelimit import ratelimit
+from .recommendations import recommended_ids
+from .routers import replica_reads, untracked_writes
+from . import accounts, events, exports, interests, jobs, metrics, notifications, places, presence, tasks
+
+# Case-insensitive unique index on auth_user.email (migration 0005)
+EMAIL_UNIQUE_INDEX = 'auth_user_email_ci_uniq'
+
+# Session key set once the member's LifestyleProfile is known to exist
+PROFILE_SESSION_FLAG = 'has_lifestyle_profile'
+
+# Upcoming experiences feed order; matches the experience_upcoming_idx index
+EXPERIENCE_ORDERING = ('experience_date', 'commencement', 'id')
+
+# Years the experience calendar pages through; outside them it's a 404
+CALENDAR_YEARS = range(1900, 2101)
 
 # ===== PUBLIC VIEWS =====
 def register_view(request):
@@ -13,13 +41,22 @@ def register_view(request):
     if request.method == 'POST':
         form = CustomRegistrationForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            
-            # Automatically create a lifestyle profile for the new user
-            LifestyleProfile.objects.create(user=user)
-            
-            messages.success(request, 'Portfolio created successfully! Please login.')
-            return redirect('login')
+            try:
+                # User and lifestyle profile exist together or not at all
+                with transaction.atomic():
+                    user = form.save()
+                    LifestyleProfile.objects.create(user=user)
+            except IntegrityError as exc:
+                if EMAIL_UNIQUE_INDEX in str(exc):
+                    form.add_error('email', form.DUPLICATE_EMAIL_ERROR)
+                elif 'username' in str(exc):
+                    # Lost a race with a concurrent signup between validation and insert
+                    form.add_error('username', User._meta.get_field('username').error_messages['unique'])
+                else:
+                    raise
+            else:
+                messages.success(request, 'Portfolio created successfully! Please login.')
+                return redirect('login')
     else:
         form = CustomRegistrationForm()
     
@@ -31,30 +68,41 @@ def register_view(request):
 
 # ===== MEMBER VIEWS =====
 @login_required
+@replica_reads
 def lifestyle_dashboard(request):
     """Member dashboard - main homepage after login - SHOWS OTHER PROFILES IN GRID"""
-    # Get or create user profile
-    profile, created = LifestyleProfile.objects.get_or_create(user=request.user)
-    
-    if created:
-        messages.info(request, 'Welcome! Please complete your portfolio for better matches.')
-    
-    # Get all approved portfolios (exclude current user)
-    portfolios_list = LifestyleProfile.objects.filter(
-        curator_approved=True,
-        public_portfolio=True,
-        portfolio_suspended=False
-    ).exclude(user=request.user).order_by('-last_active')
+    # Once a profile is known to exist this session, a plain read is enough
+    profile = None
+    if request.session.get(PROFILE_SESSION_FLAG):
+        profile = LifestyleProfile.objects.filter(user=request.user).first()
+    if profile is None:
+        profile, created = LifestyleProfile.objects.get_or_create(user=request.user)
+        request.session[PROFILE_SESSION_FLAG] = True
+        
+        if created:
+            messages.info(request, 'Welcome! Please complete your portfolio for better matches.')
     
-    # Pagination - 12 per page (like screenshot shows)
-    paginator = Paginator(portfolios_list, 12)
-    page_number = request.GET.get('page', 1)
-    portfolios = paginator.get_page(page_number)
+    # Precomputed compatibility ranking (build_recommendations); members
+    # without one yet see the most recently active portfolios
+    recommended = recommended_ids(profile)
+    if recommended:
+        portfolios = Paginator(recommended, 12).get_page(request.GET.get('page', 1))
+        page = PortfolioCard.objects.in_bulk(portfolios.object_list)
+        portfolios.object_list = [page[pk] for pk in portfolios.object_list if pk in page]
+    else:
+        portfolios_list = PortfolioCard.objects.exclude(user=request.user).order_by('-last_active')
+        
+        # Pagination - 12 per page (like screenshot shows)
+        paginator = Paginator(portfolios_list, 12)
+        page_number = request.GET.get('page', 1)
+        portfolios = paginator.get_page(page_number)
     
     context = {
         'title': 'Lifestyle Portfolio Dashboard | Elite Connections',
         'description': 'Your exclusive lifestyle connections dashboard',
         'portfolios': portfolios,
+        'online_ids': presence.online(portfolio.user_id for portfolio in portfolios),
+        'recommended': bool(recommended),
         'user_profile': profile,
     }
     return render(request, 'main/lifestyle_dashboard.html', context)
@@ -74,6 +122,8 @@ def edit_portfolio(request):
             portfolio.under_review = True
             portfolio.curator_approved = False
             portfolio.save()
+            if 'portfolio_image' in form.changed_data and portfolio.portfolio_image:
+                jobs.enqueue(tasks.make_portfolio_thumbnail, profile_id=portfolio.pk)
             messages.success(request, 'Portfolio submitted for curator review!')
             return redirect('lifestyle_dashboard')
     else:
@@ -87,6 +137,8 @@ def edit_portfolio(request):
     }
     return render(request, 'main/edit_portfolio.html', context)
 
+@ratelimit('view_portfolio', '60/m')
+@replica_reads
 def view_portfolio(request, username):
     """View individual portfolio"""
     user = get_object_or_404(User, username=username)
@@ -97,9 +149,13 @@ def view_portfolio(request, username):
         messages.error(request, 'This portfolio is not available.')
         return redirect('lifestyle_dashboard')
     
-    # Increment view count
+    # Increment view count atomically on the primary (the row may come from a replica);
+    # a counter bump shouldn't pin the viewer's reads to the primary
+    with untracked_writes():
+        LifestyleProfile.objects.filter(pk=profile.pk).update(view_count=F('view_count') + 1)
     profile.view_count += 1
-    profile.save()
+    if request.user != user:
+        events.record(profile.pk, 'view', request.user.pk)
     
     context = {
         'title': f'{profile.preferred_name or user.username} | Lifestyle Portfolio',
@@ -110,20 +166,22 @@ def view_portfolio(request, username):
     return render(request, 'main/view_portfolio.html', context)
 
 @login_required
+@replica_reads
 def curated_search(request):
     """Search for compatible portfolios with filters"""
-    portfolios_list = LifestyleProfile.objects.filter(
-        curator_approved=True,
-        public_portfolio=True,
-        portfolio_suspended=False
-    ).exclude(user=request.user)
+    portfolios_list = PortfolioCard.objects.exclude(user=request.user)
     
     # Apply filters
     location = request.GET.get('location', '')
+    place = request.GET.get('place', '')
     status = request.GET.get('status', '')
+    online_now = request.GET.get('online') == '1'
     
-    if location:
-        portfolios_list = portfolios_list.filter(primary_location__icontains=location)
+    # An autocomplete pick filters on the place id, typed text on matching places
+    if place.isdigit():
+        portfolios_list = portfolios_list.filter(place_id=int(place))
+    elif location:
+        portfolios_list = portfolios_list.filter(place__in=places.matching(location))
     
     if status == 'premium':
         portfolios_list = portfolios_list.filter(engagement_tier='premium')
@@ -131,6 +189,8 @@ def curated_search(request):
         portfolios_list = portfolios_list.filter(engagement_tier='exclusive')
     
     portfolios_list = portfolios_list.order_by('-last_active')
+    if online_now:
+        portfolios_list = presence.online_rows(portfolios_list)
     
     # Pagination
     paginator = Paginator(portfolios_list, 12)
@@ -141,8 +201,11 @@ def curated_search(request):
         'title': 'Curated Search | Find Compatible Lifestyles',
         'description': 'Search for sophisticated individuals based on lifestyle compatibility.',
         'portfolios': portfolios,
+        'online_ids': presence.online(portfolio.user_id for portfolio in portfolios),
         'location': location,
+        'place': place,
         'status': status,
+        'online_now': online_now,
     }
     return render(request, 'main/curated_search.html', context)
 
@@ -185,6 +248,22 @@ def curated_introductions(request):
         'description': 'Manage your discreet exchanges with compatible individuals.',
     })
 
+@login_required
+@replica_reads
+def mutual_matches(request):
+    """Members whose interest is mutual, newest match first"""
+    matched = interests.matches(request.user.pk).select_related('to_user__lifestyle_profile')
+    try:
+        matches = keyset_page(matched, interests.MATCH_ORDERING, request.GET.get('after'), page_size=20)
+    except InvalidCursor:
+        return redirect('mutual_matches')
+    
+    return render(request, 'main/mutual_matches.html', {
+        'title': 'Mutual Matches | Your Network',
+        'description': 'Members who share your interest.',
+        'matches': matches,
+    })
+
 @login_required
 def saved_connections(request):
     """Favorites/saved connections"""
@@ -203,6 +282,7 @@ def saved_connections(request):
     })
 
 @login_required
+@ratelimit('connection_action', '30/m')
 def save_connection(request, user_id):
     """Save a user to connections"""
     try:
@@ -217,7 +297,17 @@ def save_connection(request, user_id):
         if user_id not in profile.saved_connections:
             profile.saved_connections.append(user_id)
             profile.save()
-            messages.success(request, f'Added {user_to_save.username} to saved connections.')
+            if hasattr(user_to_save, 'lifestyle_profile'):
+                events.record(user_to_save.lifestyle_profile.pk, 'interest', request.user.pk)
+            # A reciprocated interest notifies both members of the match instead
+            match = None
+            if user_to_save.pk != request.user.pk:
+                match = interests.express(request.user.pk, user_to_save.pk)
+            if match:
+                messages.success(request, f'You and {user_to_save.username} are interested in each other.')
+            else:
+                notifications.notify(user_to_save.pk, 'interest', request.user.pk)
+                messages.success(request, f'Added {user_to_save.username} to saved connections.')
         else:
             messages.info(request, f'{user_to_save.username} is already in your saved connections.')
     
@@ -227,6 +317,7 @@ def save_connection(request, user_id):
     return redirect('lifestyle_dashboard')
 
 @login_required
+@ratelimit('connection_action', '30/m')
 def restrict_connection(request, user_id):
     """Restrict/block a connection"""
     try:
@@ -241,6 +332,7 @@ def restrict_connection(request, user_id):
         if user_id not in profile.restricted_connections:
             profile.restricted_connections.append(user_id)
             profile.save()
+            interests.withdraw(request.user.pk, user_id)
             messages.success(request, f'Restricted connection with {user_to_restrict.username}.')
         else:
             messages.info(request, f'Connection with {user_to_restrict.username} is already restricted.')
@@ -251,6 +343,7 @@ def restrict_connection(request, user_id):
     return redirect('lifestyle_dashboard')
 
 @login_required
+@ratelimit('send_message', '20/m')
 def send_message(request, user_id):
     """Send a message to another user"""
     try:
@@ -273,11 +366,68 @@ def lifestyle_preferences(request):
 @login_required
 def discretion_settings(request):
     """Privacy and discretion settings"""
+    profile, _ = LifestyleProfile.objects.get_or_create(user=request.user)
+    if request.method == 'POST':
+        form = DiscretionSettingsForm(request.POST, instance=profile)
+        if form.is_valid():
+            form.save()
+            messages.success(request, 'Your discretion settings have been saved.')
+            return redirect('discretion_settings')
+    else:
+        form = DiscretionSettingsForm(instance=profile)
+    
     return render(request, 'main/discretion_settings.html', {
         'title': 'Discretion Settings | Privacy',
         'description': 'Manage your privacy and discretion preferences.',
+        'form': form,
+    })
+
+@login_required
+def delete_account(request):
+    """Close the account now; its data is purged by a background job"""
+    form = DeleteAccountForm(request.user, request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        with transaction.atomic():
+            deletion = accounts.request_deletion(request.user)
+            jobs.enqueue(tasks.purge_account, priority=jobs.PRIORITY_LOW, deletion_id=deletion.pk)
+        logout(request)
+        messages.success(request, 'Your account has been closed and your data is being deleted.')
+        return redirect('home')
+    
+    return render(request, 'main/delete_account.html', {
+        'title': 'Delete Account | Privacy',
+        'description': 'Permanently close your account and delete your data.',
+        'form': form,
+    })
+
+@login_required
+@ratelimit('data_export', '5/h', methods=['POST'])
+def data_export(request):
+    """Download a copy of your data: streamed now, or built in the background for large accounts"""
+    if request.method == 'POST':
+        if exports.row_count(request.user) <= settings.EXPORT_INLINE_MAX_ROWS:
+            response = StreamingHttpResponse(exports.stream(request.user), content_type='application/zip')
+            response['Content-Disposition'] = f'attachment; filename="{exports.filename(request.user)}"'
+            return response
+        with transaction.atomic():
+            export = exports.request_export(request.user)
+            if export.status == 'pending':
+                jobs.enqueue(tasks.build_data_export, priority=jobs.PRIORITY_LOW, export_id=export.pk)
+        messages.info(request, 'Your export is being prepared. It will be listed here when it is ready.')
+        return redirect('data_export')
+    
+    return render(request, 'main/data_export.html', {
+        'title': 'Export Your Data | Privacy',
+        'description': 'Download a copy of your portfolio, messages and photos.',
+        'exports': DataExport.objects.filter(user=request.user).order_by('-requested_at')[:5],
     })
 
+@login_required
+def download_data_export(request, export_id):
+    """A finished background export"""
+    export = get_object_or_404(DataExport, pk=export_id, user=request.user, status='ready')
+    return FileResponse(export.file.open('rb'), as_attachment=True, filename=exports.filename(request.user))
+
 @login_required
 def gallery_management(request):
     """Photo gallery management"""
@@ -304,3 +454,118 @@ def curator_dashboard(request):
         'description': 'Review and manage member portfolios.',
         'pending_portfolios': pending_portfolios,
     })
+
+@login_required
+@replica_reads
+def who_viewed_me(request):
+    """JSON: recent viewers of (or interest in) the member's portfolio"""
+    kind = request.GET.get('kind', 'view')
+    if kind not in ('view', 'interest'):
+        return JsonResponse({'error': 'kind must be view or interest'}, status=400)
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 365)
+    except ValueError:
+        days = 30
+    
+    profile = get_object_or_404(LifestyleProfile, user=request.user)
+    summary = events.activity(profile, kind=kind, days=days)
+    usernames = User.objects.in_bulk([actor for actor, _ in summary['actors']])
+    
+    return JsonResponse({
+        'kind': kind,
+        'days': days,
+        'total': summary['total'],
+        'per_day': [{'day': day, 'count': count} for day, count in summary['per_day']],
+        'actors': [
+            {'username': usernames[actor].username, 'count': info['count'], 'last_seen': info['last_seen']}
+            for actor, info in summary['actors'] if actor in usernames
+        ],
+    })
+
+# ===== EXCLUSIVE EXPERIENCES =====
+@login_required
+@replica_reads
+def exclusive_experiences(request):
+    """Upcoming active experiences, keyset-paginated by date and start time"""
+    upcoming = ExclusiveExperience.objects.filter(
+        is_active=True,
+        experience_date__gte=timezone.localdate(),
+    ).select_related('host')
+    
+    try:
+        experiences = keyset_page(upcoming, EXPERIENCE_ORDERING, request.GET.get('after'), page_size=20)
+    except InvalidCursor:
+        return redirect('exclusive_experiences')
+    
+    return render(request, 'main/exclusive_experiences.html', {
+        'title': 'Exclusive Experiences | Elite Lifestyle Connections',
+        'description': 'Discover upcoming exclusive experiences hosted by members.',
+        'experiences': experiences,
+    })
+
+@login_required
+@replica_reads
+def experience_calendar(request, year=None, month=None):
+    """Month view: number of active experiences per day from one grouped query"""
+    today = timezone.localdate()
+    if year is None:
+        year, month = today.year, today.month
+    if year not in CALENDAR_YEARS or not 1 <= month <= 12:
+        raise Http404('Invalid month')
+    
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    counts = dict(
+        ExclusiveExperience.objects.filter(is_active=True, experience_date__range=(first_day, last_day))
+        .values_list('experience_date')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    
+    weeks = [
+        [{'date': day, 'in_month': day.month == month, 'count': counts.get(day, 0)} for day in week]
+        for week in calendar.Calendar(firstweekday=calendar.MONDAY).monthdatescalendar(year, month)
+    ]
+    previous_month = (first_day.replace(day=1) - date.resolution).replace(day=1)
+    next_month = last_day + date.resolution
+    
+    return render(request, 'main/experience_calendar.html', {
+        'title': f'{first_day:%B %Y} | Experience Calendar',
+        'description': 'Browse exclusive experiences by date.',
+        'month': first_day,
+        'weeks': weeks,
+        'previous_month': previous_month if previous_month.year in CALENDAR_YEARS else None,
+        'next_month': next_month if next_month.year in CALENDAR_YEARS else None,
+    })
+
+@login_required
+def host_experience(request):
+    """List a new exclusive experience"""
+    if request.method == 'POST':
+        form = ExclusiveExperienceForm(request.POST)
+        if form.is_valid():
+            experience = form.save(commit=False)
+            experience.host = request.user
+            experience.save()
+            messages.success(request, 'Your experience has been listed.')
+            return redirect('exclusive_experiences')
+    else:
+        form = ExclusiveExperienceForm()
+    
+    return render(request, 'main/host_experience.html', {
+        'title': 'Host an Experience | Elite Lifestyle Connections',
+        'description': 'Invite members to an exclusive experience.',
+        'form': form,
+        'hosted_experiences': request.user.hosted_experiences.order_by('-experience_date')[:10],
+    })
+
+# ===== OPERATIONS =====
+def performance_metrics(request):
+    """Prometheus metrics - staff session or METRICS_BEARER_TOKEN only"""
+    token = settings.METRICS_BEARER_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    has_token = bool(token) and constant_time_compare(authorization, f'Bearer {token}')
+    if not has_token and not request.user.is_staff:
+        return HttpResponseForbidden('Staff only.')
+
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')